@@ -0,0 +1,97 @@
+"""
+core/checkpoint.py - In-memory GameState snapshots for instant rollback.
+
+A Checkpoint holds the state's save data (GameState.to_dict()) in frozen
+form: dicts and lists become tuples, so nothing in a checkpoint can change
+after it is taken and any number of restores can be made from it. Leaf
+values (strings, numbers) are never copied, and a field that is unchanged
+since the previous checkpoint reuses that checkpoint's frozen copy, so a
+chain of checkpoints only costs memory for what actually changed.
+
+The big containers (inventory, journal, quests, effects) stamp themselves
+with next_version() whenever they change. A checkpoint keeps the stamps it
+saw, and a field whose stamp hasn't moved is reused as is: it isn't
+converted, frozen or compared at all, so taking a checkpoint costs time
+only for what changed too.
+
+Use GameState.checkpoint() / GameState.restore() rather than this directly.
+"""
+
+from itertools import count
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, Optional, Set
+
+_versions = count(1)
+
+
+def next_version() -> int:
+    """A version number never handed out before, by any object."""
+    return next(_versions)
+
+
+class _FrozenDict(tuple):
+    """(key, value) pairs of a frozen dict, so thaw() knows to rebuild one."""
+
+    __slots__ = ()
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Fresh mutable copy of a frozen value."""
+    if isinstance(value, _FrozenDict):
+        return {k: thaw(v) for k, v in value}
+    if isinstance(value, tuple):
+        return [thaw(v) for v in value]
+    return value
+
+
+class Checkpoint:
+    __slots__ = ("fields", "versions")
+
+    def __init__(
+        self, fields: Mapping[str, Any], versions: Optional[Dict[str, Hashable]] = None
+    ):
+        self.fields = fields
+        self.versions = versions or {}
+
+    def unchanged(self, versions: Dict[str, Hashable]) -> Set[str]:
+        """Fields whose version is still the one this checkpoint saw."""
+        return {
+            key
+            for key, version in versions.items()
+            if key in self.fields and self.versions.get(key) == version
+        }
+
+    @classmethod
+    def capture(
+        cls,
+        data: dict,
+        previous: Optional["Checkpoint"] = None,
+        versions: Optional[Dict[str, Hashable]] = None,
+    ):
+        """
+        Freeze save data, sharing unchanged fields with previous. Fields that
+        previous.unchanged(versions) names may be left out of data; they are
+        taken from previous.
+        """
+        shared = previous.fields if previous is not None else {}
+        fields = {}
+        if previous is not None and versions:
+            for key in previous.unchanged(versions):
+                fields[key] = shared[key]
+        for key, value in data.items():
+            frozen = freeze(value)
+            old = shared.get(key, frozen)
+            fields[key] = old if old == frozen else frozen
+        return cls(MappingProxyType(fields), versions)
+
+    def thaw(self) -> dict:
+        """The checkpoint as save data the caller is free to mutate."""
+        return {key: thaw(value) for key, value in self.fields.items()}
@@ -1,15 +1,29 @@
 import time
 import random
-from typing import List
+from bisect import bisect_right
+from itertools import groupby
+from typing import Callable, Dict, List, Optional, Tuple
 from core.display import clear, print_color, write_slow, press_any_key
 from core.utils import (
     menu_choice,
-    add_xp,
+    announce_xp,
+    gain_xp,
     _read_char_timeout,
     _restore_terminal,
     _setup_terminal,
 )
+from core.effects import (
+    EFFECTS,
+    ActiveEffects,
+    as_effects,
+    get_damage_mod,
+    get_defense_bonus,
+    get_dodge_mod,
+    tick_effects,
+)
+from core.inventory import Transaction
 from data.enemies import ENEMIES
+from data.items import ITEMS
 from data.skills import SPELLS, TECHNIQUES
 import select as _select
 import threading
@@ -19,280 +33,169 @@ import sys
 # region Enemy
 
 
-class Enemy:
-    def __init__(self, enemy_name: str):
-        if enemy_name not in ENEMIES:
-            raise ValueError(f"Unknown enemy: {enemy_name}")
-        data = ENEMIES[enemy_name]
-        self.name = enemy_name
+class EnemyPrototype:
+    """
+    Everything about an enemy type that never changes during a fight, read
+    out of ENEMIES once. Every Enemy of that type points at the same one.
+    """
+
+    __slots__ = (
+        "name",
+        "max_health",
+        "damage",
+        "defense",
+        "gold_drop",
+        "item_drops",
+        "description",
+        "difficulty",
+        "exp_drop",
+    )
+
+    def __init__(self, name: str, data: dict):
+        self.name = name
         self.max_health = data["health"]
-        self.health = data["health"]
         self.damage = data["damage"]
         self.defense = data["defense"]
         self.gold_drop = data["gold_drop"]
-        self.item_drops = data["item_drops"]
+        self.item_drops = tuple(data["item_drops"])
         self.description = data.get("description", "")
         self.difficulty = data.get("difficulty", 1.0)
         self.exp_drop = data.get("exp_drop", (0, 0))
-        self.status_effects = []
 
-    def is_alive(self) -> bool:
-        return self.health > 0
 
-    def take_damage(self, amount: int) -> int:
-        actual = max(1, amount - self.defense)
-        self.health -= actual
-        return actual
+PROTOTYPES: Dict[str, EnemyPrototype] = {
+    name: EnemyPrototype(name, data) for name, data in ENEMIES.items()
+}
 
-    def get_loot(self) -> dict:
-        gold = random.randint(*self.gold_drop)
-        items = [name for name, chance in self.item_drops if random.random() < chance]
-        xp = random.randint(*self.exp_drop)
-        return {"gold": gold, "items": items, "xp": xp}
 
+def get_prototype(enemy_name: str) -> EnemyPrototype:
+    proto = PROTOTYPES.get(enemy_name)
+    if proto is None:
+        raise ValueError(f"Unknown enemy: {enemy_name}")
+    return proto
 
-# endregion
 
+class Enemy:
+    """
+    One enemy in a fight. Only health and status effects are its own; the
+    rest is read from its prototype.
+    """
 
-# region Effects
-
-
-EFFECTS = {
-    "damage_buff": {
-        "category": "buff",
-        "target": "player",
-        "tick": False,
-        "stat": "damage",
-        "apply_type": "percent",
-        "value": 1.5,
-        "description": "Increases damage output",
-    },
-    "defense_buff": {
-        "category": "buff",
-        "target": "player",
-        "tick": False,
-        "stat": "defense",
-        "apply_type": "flat",
-        "value": 10,
-        "description": "Increases damage resistance",
-    },
-    "dodge_chance": {
-        "category": "buff",
-        "target": "player",
-        "tick": False,
-        "stat": "dodge",
-        "apply_type": "percent",
-        "value": 0.5,
-        "description": "Chance to completely avoid an attack",
-    },
-    "regen": {
-        "category": "buff",
-        "target": "player",
-        "tick": True,
-        "stat": "health",
-        "apply_type": "flat",
-        "value": 5,
-        "description": "Restores health each turn",
-    },
-    "mana_regen": {
-        "category": "buff",
-        "target": "player",
-        "tick": True,
-        "stat": "mana",
-        "apply_type": "flat",
-        "value": 5,
-        "description": "Restores mana each turn",
-    },
-    "weakness": {
-        "category": "debuff",
-        "target": "player",
-        "tick": False,
-        "stat": "damage",
-        "apply_type": "percent",
-        "value": 0.6,
-        "description": "Reduces damage output significantly",
-    },
-    "slow": {
-        "category": "debuff",
-        "target": "player",
-        "tick": False,
-        "stat": "dodge",
-        "apply_type": "percent",
-        "value": 0.0,
-        "description": "Cannot dodge attacks",
-    },
-    "vulnerable": {
-        "category": "debuff",
-        "target": "player",
-        "tick": False,
-        "stat": "defense",
-        "apply_type": "flat",
-        "value": -10,
-        "description": "Defense is reduced",
-    },
-    "burn": {
-        "category": "dot",
-        "target": "player",
-        "tick": True,
-        "stat": "health",
-        "apply_type": "flat",
-        "value": -4,
-        "description": "Takes fire damage each turn",
-    },
-    "bleed": {
-        "category": "dot",
-        "target": "player",
-        "tick": True,
-        "stat": "health",
-        "apply_type": "flat",
-        "value": -3,
-        "description": "Loses health from bleeding each turn",
-    },
-    "stun": {
-        "category": "debuff",
-        "target": "both",
-        "tick": False,
-        "stat": None,
-        "apply_type": None,
-        "value": None,
-        "description": "Skips next turn",
-    },
-    "poison": {
-        "category": "dot",
-        "target": "enemy",
-        "tick": True,
-        "stat": "health",
-        "apply_type": "flat",
-        "value": -5,
-        "description": "Takes poison damage each turn",
-    },
-    "armor_break": {
-        "category": "debuff",
-        "target": "enemy",
-        "tick": False,
-        "stat": "defense",
-        "apply_type": "flat",
-        "value": -8,
-        "description": "Enemy defense is reduced",
-    },
-    "expose": {
-        "category": "debuff",
-        "target": "enemy",
-        "tick": False,
-        "stat": "defense",
-        "apply_type": "percent",
-        "value": 0.5,
-        "description": "Enemy is exposed, taking increased damage",
-    },
-}
+    __slots__ = ("prototype", "health", "status_effects")
 
+    def __init__(self, enemy_name: str):
+        self.prototype = get_prototype(enemy_name)
+        self.health = self.prototype.max_health
+        self.status_effects = ActiveEffects()
+
+    @classmethod
+    def from_prototype(cls, proto: EnemyPrototype) -> "Enemy":
+        enemy = cls.__new__(cls)
+        enemy.prototype = proto
+        enemy.health = proto.max_health
+        enemy.status_effects = ActiveEffects()
+        return enemy
+
+    # Read-only, shared by every enemy of this type
+    name = property(lambda self: self.prototype.name)
+    max_health = property(lambda self: self.prototype.max_health)
+    damage = property(lambda self: self.prototype.damage)
+    defense = property(lambda self: self.prototype.defense)
+    gold_drop = property(lambda self: self.prototype.gold_drop)
+    item_drops = property(lambda self: self.prototype.item_drops)
+    description = property(lambda self: self.prototype.description)
+    difficulty = property(lambda self: self.prototype.difficulty)
+    exp_drop = property(lambda self: self.prototype.exp_drop)
 
-def get_damage_mod(active_effects: list) -> float:
-    mod = 1.0
-    for eff in active_effects:
-        defn = EFFECTS.get(eff["type"], {})
-        if defn.get("stat") == "damage" and defn.get("apply_type") == "percent":
-            mod *= eff.get("value", defn["value"])
-    return mod
-
-
-def get_defense_bonus(active_effects: list) -> int:
-    bonus = 0
-    for eff in active_effects:
-        defn = EFFECTS.get(eff["type"], {})
-        if defn.get("stat") == "defense" and defn.get("apply_type") == "flat":
-            bonus += eff.get("value", defn["value"])
-    return bonus
-
-
-def get_dodge_mod(active_effects: list) -> float:
-    mod = 1.0
-    base = 0.0
-    for eff in active_effects:
-        defn = EFFECTS.get(eff["type"], {})
-        if defn.get("stat") == "dodge" and defn.get("apply_type") == "percent":
-            if defn["category"] == "buff":
-                base += eff.get("value", defn["value"])
-            else:
-                mod *= eff.get("value", defn["value"])
-    return base * mod
+    def is_alive(self) -> bool:
+        return self.health > 0
 
+    def current_defense(self) -> int:
+        """Defense after armor_break, expose and the like."""
+        effects = self.status_effects
+        defense = (self.prototype.defense + effects.defense_bonus) * effects.defense_mod
+        return max(0, int(defense))
 
-def is_stunned(active_effects: list) -> bool:
-    return any(eff["type"] == "stun" for eff in active_effects)
+    def take_damage(self, amount: int) -> int:
+        actual = max(1, amount - self.current_defense())
+        self.health -= actual
+        return actual
 
+    def get_loot(self, rng=random) -> dict:
+        """Roll this enemy's drops. Pass a seeded random.Random to replay them."""
+        proto = self.prototype
+        gold = rng.randint(*proto.gold_drop)
+        # Each drop is its own roll; a table of every combination would grow
+        # as 2^drops
+        items = [name for name, chance in proto.item_drops if rng.random() < chance]
+        xp = rng.randint(*proto.exp_drop)
+        return {"gold": gold, "items": items, "xp": xp}
 
-def apply_effect(
-    target_effects: list, effect_type: str, duration: int, value=None
-) -> None:
-    defn = EFFECTS.get(effect_type)
-    if not defn:
-        return
-    actual_value = value if value is not None else defn["value"]
-    for eff in target_effects:
-        if eff["type"] == effect_type:
-            eff["duration"] = max(eff["duration"], duration)
-            eff["value"] = actual_value
-            return
-    target_effects.append(
-        {"type": effect_type, "duration": duration, "value": actual_value}
-    )
 
+def spawn_wave(template, n: int) -> List[Enemy]:
+    """
+    n fresh enemies of one type. template is an enemy name, a prototype or
+    an existing Enemy (whose type is copied, not its current health).
+    """
+    if isinstance(template, Enemy):
+        proto = template.prototype
+    elif isinstance(template, EnemyPrototype):
+        proto = template
+    else:
+        proto = get_prototype(template)
+    spawn = Enemy.from_prototype
+    return [spawn(proto) for _ in range(n)]
 
-def tick_effects(active_effects: list, state=None) -> tuple:
-    expired, remaining = [], []
-    hp_delta = mana_delta = stamina_delta = 0
-
-    for eff in active_effects:
-        defn = EFFECTS.get(eff["type"], {})
-        if defn.get("tick"):
-            val = eff.get("value", defn.get("value", 0))
-            stat = defn.get("stat")
-            if stat == "health":
-                hp_delta += val
-            elif stat == "mana":
-                mana_delta += val
-            elif stat == "stamina":
-                stamina_delta += val
-        eff["duration"] -= 1
-        if eff["duration"] <= 0:
-            expired.append(eff["type"])
-        else:
-            remaining.append(eff)
 
-    active_effects[:] = remaining
+# endregion
 
-    if state:
-        if hp_delta:
-            state.health = max(0, min(state.max_health, state.health + hp_delta))
-        if mana_delta and state.max_mana > 0:
-            state.mana = max(0, min(state.max_mana, state.mana + mana_delta))
-        if stamina_delta and state.max_stamina > 0:
-            state.stamina = max(
-                0, min(state.max_stamina, state.stamina + stamina_delta)
-            )
 
-    return expired, hp_delta, mana_delta, stamina_delta
+# region Skills
 
 
-# endregion
+def _skill_source(class_name: str) -> dict:
+    if class_name == "Paladin":
+        return {**SPELLS, **TECHNIQUES}
+    if class_name in ("Warlock", "Cleric"):
+        return SPELLS
+    return TECHNIQUES
+
+
+def _build_skill_index() -> Dict[str, Tuple[List[int], List[Tuple[str, dict]]]]:
+    # class -> (unlock levels, (name, data)) both sorted by unlock level, so
+    # "what does level N have" is a bisect into the levels list
+    index = {}
+    classes = {d["class"] for d in SPELLS.values()} | {
+        d["class"] for d in TECHNIQUES.values()
+    }
+    for class_name in classes:
+        skills = sorted(
+            (
+                (name, data)
+                for name, data in _skill_source(class_name).items()
+                if data["class"] == class_name
+            ),
+            key=lambda s: s[1].get("unlock_level", 1),
+        )
+        levels = [data.get("unlock_level", 1) for _, data in skills]
+        index[class_name] = (levels, skills)
+    return index
 
 
-# region Skills
+_SKILL_INDEX = _build_skill_index()
 
 
 def get_available_skills(class_name: str, level: int = 1) -> dict:
-    if class_name == "Paladin":
-        source = {**SPELLS, **TECHNIQUES}
-    elif class_name in ("Warlock", "Cleric"):
-        source = SPELLS
-    else:
-        source = TECHNIQUES
-    return {
-        name: data
-        for name, data in source.items()
-        if data["class"] == class_name and data.get("unlock_level", 1) <= level
-    }
+    levels, skills = _SKILL_INDEX.get(class_name, ([], []))
+    return dict(skills[: bisect_right(levels, level)])
+
+
+def get_skills_unlocked_between(
+    class_name: str, old_level: int, new_level: int
+) -> List[Tuple[str, dict]]:
+    """Skills that unlock after old_level, up to and including new_level."""
+    levels, skills = _SKILL_INDEX.get(class_name, ([], []))
+    return skills[bisect_right(levels, old_level) : bisect_right(levels, new_level)]
 
 
 def _skill_qte(sequence: list, time_limit: float) -> int:
@@ -423,15 +326,16 @@ def _skill_qte(sequence: list, time_limit: float) -> int:
     return hits
 
 
-def skill_menu(state, enemies: list) -> dict:
-    if not state.player_class:
-        return {"type": "cancelled"}
-
-    skills = get_available_skills(state.player_class.name, state.level)
+def skill_menu(engine: "CombatEngine") -> Optional[dict]:
+    """
+    Let the player pick a skill and a target and play its QTE. Returns the
+    skill action for the engine, or None if the player backed out.
+    """
+    skills = engine.available_skills()
     if not skills:
         print_color("No skills available.", 200, 200, 200)
         time.sleep(1)
-        return {"type": "cancelled"}
+        return None
 
     clear()
     print_color("=== Skills ===", 100, 200, 255)
@@ -448,148 +352,24 @@ def skill_menu(state, enemies: list) -> dict:
 
     choice = menu_choice(options)
     if choice == len(options):
-        return {"type": "cancelled"}
+        return None
 
     skill_name = skill_names[choice - 1]
     skill = skills[skill_name]
 
-    if "mana_cost" in skill:
-        if state.mana < skill["mana_cost"]:
-            print_color("Not enough mana!", 255, 100, 100)
-            time.sleep(1)
-            return {"type": "cancelled"}
-        state.mana -= skill["mana_cost"]
-    elif "stamina_cost" in skill:
-        if state.stamina < skill["stamina_cost"]:
-            print_color("Not enough stamina!", 255, 100, 100)
-            time.sleep(1)
-            return {"type": "cancelled"}
-        state.stamina -= skill["stamina_cost"]
+    problem = engine.skill_problem(skill_name)
+    if problem:
+        print_color(problem, 255, 100, 100)
+        time.sleep(1)
+        return None
 
     target = None
     if skill["target"] == "single":
-        alive = [e for e in enemies if e.is_alive()]
-        if len(alive) > 1:
-            clear()
-            print("Choose target:")
-            target = alive[menu_choice([e.name for e in alive]) - 1]
-        else:
-            target = alive[0]
+        clear()
+        target = _pick_target(engine.enemies, engine.grouped)
 
     hits = _skill_qte(skill["sequence"], skill["sequence_time"])
-    ratio = hits / len(skill["sequence"])
-
-    clear()
-    print_color(f"=== {skill_name} ===", 100, 200, 255)
-    print()
-
-    if hits == 0:
-        print_color("No inputs hit! Skill fizzled.", 255, 100, 100)
-        time.sleep(2)
-        return {"type": "fizzle", "skill": skill_name}
-
-    if hits == len(skill["sequence"]):
-        print_color("PERFECT!", 50, 255, 50)
-    else:
-        print_color(
-            f"Partial: {hits}/{len(skill['sequence'])} inputs ({int(ratio * 100)}%)",
-            255,
-            200,
-            50,
-        )
-    print()
-
-    result = {"type": "skill", "skill": skill_name, "hits": hits}
-
-    if "damage" in skill and skill["damage"] > 0:
-        final_dmg = int(
-            int(skill["damage"] * ratio) * get_damage_mod(state.active_effects)
-        )
-        targets = (
-            [e for e in enemies if e.is_alive()]
-            if skill["target"] == "enemies"
-            else ([target] if target else [])
-        )
-        for e in targets:
-            actual = e.take_damage(final_dmg)
-            print_color(f"{e.name} takes {actual} damage!", 255, 200, 50)
-            if not e.is_alive():
-                print_color(f"{e.name} defeated!", 50, 255, 50)
-        result["damage"] = final_dmg
-
-    if "heal" in skill:
-        heal_amt = int(skill["heal"] * ratio)
-        old_hp = state.health
-        state.health = min(state.max_health, state.health + heal_amt)
-        print_color(f"Restored {state.health - old_hp} health!", 50, 255, 50)
-        result["heal"] = state.health - old_hp
-
-    if "effect" in skill and hits > 0:
-        eff = skill["effect"].copy()
-        scaled_duration = max(1, int(eff.get("duration", 1) * ratio))
-
-        if "damage_buff" in eff:
-            state.active_effects.append(
-                {
-                    "type": "damage_buff",
-                    "value": eff["damage_buff"],
-                    "duration": scaled_duration,
-                }
-            )
-            print_color(
-                f"Damage buffed x{eff['damage_buff']} for {scaled_duration} turns!",
-                200,
-                150,
-                255,
-            )
-        elif "defense_buff" in eff:
-            state.active_effects.append(
-                {
-                    "type": "defense_buff",
-                    "value": eff["defense_buff"],
-                    "duration": scaled_duration,
-                }
-            )
-            print_color(
-                f"+{eff['defense_buff']} defense for {scaled_duration} turns!",
-                100,
-                200,
-                255,
-            )
-        elif "dodge_chance" in eff:
-            state.active_effects.append(
-                {
-                    "type": "dodge_chance",
-                    "value": eff["dodge_chance"],
-                    "duration": scaled_duration,
-                }
-            )
-            print_color(
-                f"{int(eff['dodge_chance']*100)}% dodge for {scaled_duration} turns!",
-                50,
-                255,
-                200,
-            )
-        elif "poison" in eff and target:
-            target.status_effects.append(
-                {"type": "poison", "value": -eff["poison"], "duration": scaled_duration}
-            )
-            print_color(
-                f"{target.name} is poisoned! ({eff['poison']} dmg/turn for {scaled_duration} turns)",
-                100,
-                255,
-                100,
-            )
-        elif "stun" in eff and target:
-            target.status_effects.append(
-                {"type": "stun", "value": 1, "duration": scaled_duration}
-            )
-            print_color(
-                f"{target.name} is stunned for {scaled_duration} turn(s)!", 200, 200, 50
-            )
-
-    time.sleep(2)
-    return result
+    return {"type": "skill", "skill": skill_name, "target": target, "hits": hits}
 
 
 # endregion
@@ -664,10 +444,483 @@ def qte_defense(difficulty: float = 1.0) -> str:
 # endregion
 
 
+# region Engine
+
+# Fights with at least this many enemies group identical ones into stacks
+LARGE_BATTLE_SIZE = 6
+
+
+def group_enemies(enemies: List[Enemy]) -> List[List[Enemy]]:
+    """Enemies split into stacks of the same type, in order of appearance."""
+    stacks: Dict[EnemyPrototype, List[Enemy]] = {}
+    for enemy in enemies:
+        stacks.setdefault(enemy.prototype, []).append(enemy)
+    return list(stacks.values())
+
+
+class CombatEngine:
+    """
+    The rules of one fight, with no terminal I/O: no printing, no sleeping,
+    no reading keys. The player's choices come in as action dicts and
+    everything that happens goes out as event dicts, so the terminal UI
+    (combat() below) is just one driver and a bot or simulator can be
+    another.
+
+    Actions, passed to act():
+        {"type": "attack", "target": enemy}
+        {"type": "skill", "skill": name, "target": enemy or None, "hits": n}
+        {"type": "flee"}
+
+    Anything that needs a skill check from the player is decided by the
+    driver: "hits" is how many inputs of the skill's sequence landed, and
+    enemy_phase() asks defend(enemy) for "perfect", "block" or "miss".
+
+    Every event is {"type": ..., ...}. They are returned from the call that
+    caused them and, if on_event is set, handed to it the moment they
+    happen, so a driver can show "X attacks!" before running the QTE.
+    Pass a seeded random.Random as rng to replay a fight exactly.
+
+    In a grouped fight (by default, one with LARGE_BATTLE_SIZE enemies or
+    more) identical enemies act as one stack: one defend() and one event
+    per outcome per stack per turn, however many are in it, so a turn
+    costs the same input and output for 3 rats or 30. Dodge is still
+    rolled for each attack, and a perfect parry counters the front enemy
+    while the rest of the stack's attacks land as blocks, so a stack hits
+    as hard as its enemies would one by one. Events about a whole stack
+    name its first enemy and carry "count"; events without one are about
+    a single enemy.
+    """
+
+    def __init__(
+        self,
+        state,
+        enemies: List[Enemy],
+        rng=random,
+        on_event=None,
+        grouped: Optional[bool] = None,
+    ):
+        self.state = state
+        self.enemies = enemies
+        if grouped is None:
+            grouped = len(enemies) >= LARGE_BATTLE_SIZE
+        self.grouped = grouped
+        self.rng = rng
+        self.on_event = on_event
+        self.turn = 1
+        # None while the fight is on, then "won", "lost" or "fled"
+        self.outcome: Optional[str] = None
+        # Counter attacks hit for half of the player's last attack
+        self.last_total_damage = 5
+        self._events: List[dict] = []
+
+        if not isinstance(getattr(state, "active_effects", None), ActiveEffects):
+            state.active_effects = ActiveEffects(getattr(state, "active_effects", ()))
+
+    def _emit(self, event_type: str, **data) -> None:
+        event = {"type": event_type, **data}
+        self._events.append(event)
+        if self.on_event:
+            self.on_event(event)
+
+    def _take_events(self) -> List[dict]:
+        events, self._events = self._events, []
+        return events
+
+    @property
+    def over(self) -> bool:
+        return self.outcome is not None
+
+    def alive_enemies(self) -> List[Enemy]:
+        return [e for e in self.enemies if e.is_alive()]
+
+    def stacks(self) -> List[List[Enemy]]:
+        """Living enemies grouped by type (see group_enemies)."""
+        return group_enemies(self.alive_enemies())
+
+    def _batches(self, enemies: List[Enemy]) -> List[List[Enemy]]:
+        # What gets one event: a stack when grouped, else each enemy
+        if self.grouped:
+            return group_enemies(enemies)
+        return [[e] for e in enemies]
+
+    def _check_outcome(self) -> None:
+        if self.outcome:
+            return
+        if self.state.health <= 0:
+            self.outcome = "lost"
+            self._emit("defeat")
+        elif not any(e.is_alive() for e in self.enemies):
+            self.outcome = "won"
+            self._emit("victory")
+
+    def available_skills(self) -> dict:
+        state = self.state
+        if not state.player_class:
+            return {}
+        return get_available_skills(state.player_class.name, state.level)
+
+    def skill_problem(self, skill_name: str) -> Optional[str]:
+        """Why the player can't use this skill right now, or None."""
+        skill = self.available_skills().get(skill_name)
+        if skill is None:
+            return "You don't know that skill!"
+        if self.state.mana < skill.get("mana_cost", 0):
+            return "Not enough mana!"
+        if self.state.stamina < skill.get("stamina_cost", 0):
+            return "Not enough stamina!"
+        return None
+
+    def act(self, action: dict) -> List[dict]:
+        """Resolve the player's action for this turn."""
+        if self.over:
+            raise ValueError("The fight is already over")
+        kind = action["type"]
+        if kind == "attack":
+            self._attack(action["target"])
+        elif kind == "skill":
+            self._use_skill(action["skill"], action.get("target"), action["hits"])
+        elif kind == "flee":
+            self._flee()
+        else:
+            raise ValueError(f"Unknown action: {kind}")
+        self._check_outcome()
+        return self._take_events()
+
+    def _attack(self, target: Enemy) -> None:
+        state = self.state
+        weapon_damage = 0
+        if state.equipped_weapon:
+            raw = ITEMS.get(state.equipped_weapon, {}).get("damage", 0)
+            weapon_damage = self.rng.randint(*raw) if isinstance(raw, tuple) else raw
+
+        class_mod = state.player_class.damage_mod if state.player_class else 1.0
+        total_damage = int(
+            (5 + weapon_damage + state.level)
+            * class_mod
+            * get_damage_mod(state.active_effects)
+        )
+        self.last_total_damage = total_damage
+
+        actual = target.take_damage(total_damage)
+        self._emit("attack", target=target, damage=actual)
+        if not target.is_alive():
+            self._emit("defeated", enemy=target)
+
+    def _use_skill(self, skill_name: str, target: Optional[Enemy], hits: int) -> None:
+        problem = self.skill_problem(skill_name)
+        if problem:
+            raise ValueError(problem)
+        state = self.state
+        skill = self.available_skills()[skill_name]
+
+        # Paid whether or not the inputs land
+        state.mana -= skill.get("mana_cost", 0)
+        state.stamina -= skill.get("stamina_cost", 0)
+
+        steps = len(skill["sequence"])
+        hits = max(0, min(hits, steps))
+        if hits == 0:
+            self._emit("fizzle", skill=skill_name)
+            return
+        ratio = hits / steps
+        self._emit("skill", skill=skill_name, hits=hits, steps=steps)
+
+        if "damage" in skill and skill["damage"] > 0:
+            final_dmg = int(
+                int(skill["damage"] * ratio) * get_damage_mod(state.active_effects)
+            )
+            targets = (
+                self.alive_enemies()
+                if skill["target"] == "enemies"
+                else ([target] if target else [])
+            )
+            for batch in self._batches(targets):
+                total = sum(e.take_damage(final_dmg) for e in batch)
+                fallen = [e for e in batch if not e.is_alive()]
+                if len(batch) == 1:
+                    self._emit("skill_damage", target=batch[0], damage=total)
+                    if fallen:
+                        self._emit("defeated", enemy=batch[0])
+                    continue
+                self._emit(
+                    "skill_damage", target=batch[0], damage=total, count=len(batch)
+                )
+                if fallen:
+                    self._emit("defeated", enemy=fallen[0], count=len(fallen))
+            if final_dmg:
+                self.last_total_damage = final_dmg
+
+        if "heal" in skill:
+            heal_amt = int(skill["heal"] * ratio)
+            old_hp = state.health
+            state.health = min(state.max_health, state.health + heal_amt)
+            self._emit("heal", amount=state.health - old_hp)
+
+        if "effect" in skill:
+            self._apply_skill_effect(skill, target, ratio)
+
+    def _apply_skill_effect(
+        self, skill: dict, target: Optional[Enemy], ratio: float
+    ) -> None:
+        eff = skill["effect"]
+        duration = max(1, int(eff.get("duration", 1) * ratio))
+        for effect_type, value in eff.items():
+            defn = EFFECTS.get(effect_type)
+            if defn is None:
+                continue
+            # Skills give sizes ("poison": 5); effects that hurt are negative
+            if isinstance(defn["value"], (int, float)) and defn["value"] < 0:
+                value = -abs(value)
+
+            if defn["target"] == "player":
+                self.state.active_effects.append(
+                    {"type": effect_type, "value": value, "duration": duration}
+                )
+                self._emit(
+                    "effect_applied",
+                    target=None,
+                    effect=effect_type,
+                    value=value,
+                    duration=duration,
+                )
+                continue
+
+            if skill["target"] == "enemies":
+                recipients = self.alive_enemies()
+            else:
+                recipients = [target] if target else []
+            for batch in self._batches(recipients):
+                for who in batch:
+                    who.status_effects.append(
+                        {"type": effect_type, "value": value, "duration": duration}
+                    )
+                extra = {"count": len(batch)} if len(batch) > 1 else {}
+                self._emit(
+                    "effect_applied",
+                    target=batch[0],
+                    effect=effect_type,
+                    value=value,
+                    duration=duration,
+                    **extra,
+                )
+
+    def _flee(self) -> None:
+        if self.rng.random() < 0.5:
+            self.outcome = "fled"
+            self._emit("flee", success=True)
+        else:
+            self._emit("flee", success=False)
+
+    def enemy_phase(self, defend: Callable[[Enemy], str]) -> List[dict]:
+        """
+        Tick the player's effects, then let every living enemy take its
+        turn. defend(enemy) is asked for the outcome of each attack the
+        player doesn't dodge.
+        """
+        if self.over:
+            raise ValueError("The fight is already over")
+        state = self.state
+
+        expired, hp_delta, _, _ = tick_effects(state.active_effects, state)
+        for name in expired:
+            self._emit("effect_expired", target=None, effect=name)
+        if hp_delta:
+            self._emit("effect_tick", target=None, hp=hp_delta)
+
+        if self.grouped:
+            for stack in self.stacks():
+                if state.health <= 0:
+                    break
+                self._stack_turn(stack, defend)
+        else:
+            for enemy in self.enemies:
+                if state.health <= 0:
+                    break
+                if enemy.is_alive():
+                    self._enemy_turn(enemy, defend)
+
+        self._check_outcome()
+        # A finished fight keeps the turn it ended on
+        if not self.over:
+            self.turn += 1
+        return self._take_events()
+
+    def _enemy_turn(self, enemy: Enemy, defend: Callable[[Enemy], str]) -> None:
+        state = self.state
+        effects = enemy.status_effects
+        enemy_stunned = effects.stunned
+
+        # Same rules as the player's effects: ticks apply, then expiry
+        _, hp_delta_e, _, _ = effects.tick()
+        enemy.health += hp_delta_e
+
+        if hp_delta_e < 0:
+            self._emit("effect_tick", target=enemy, hp=hp_delta_e)
+            if not enemy.is_alive():
+                self._emit("succumbed", enemy=enemy)
+                return
+
+        if enemy_stunned:
+            self._emit("stunned", enemy=enemy)
+            return
+
+        self._emit("enemy_attack", enemy=enemy)
+
+        dodge = get_dodge_mod(state.active_effects)
+        if dodge > 0 and self.rng.random() < dodge:
+            self._emit("dodge", enemy=enemy)
+            return
+
+        result = defend(enemy)
+        if result == "perfect":
+            counter_dmg = enemy.take_damage(self.last_total_damage // 2)
+            self._emit("parry", enemy=enemy, damage=counter_dmg)
+            if not enemy.is_alive():
+                self._emit("defeated", enemy=enemy)
+
+        elif result == "block":
+            damage = self._blocked_damage(enemy)
+            state.health -= damage
+            self._emit("block", enemy=enemy, damage=damage)
+
+        else:
+            damage = self._hit_damage(enemy)
+            state.health -= damage
+            self._emit("hit", enemy=enemy, damage=damage)
+
+    def _blocked_damage(self, enemy: Enemy) -> int:
+        return max(1, enemy.damage // 2 - get_defense_bonus(self.state.active_effects))
+
+    def _hit_damage(self, enemy: Enemy) -> int:
+        state = self.state
+        damage = enemy.damage
+        if state.equipped_armor:
+            defense = ITEMS.get(state.equipped_armor, {}).get(
+                "defense", 0
+            ) + get_defense_bonus(state.active_effects)
+            damage = max(1, damage - defense)
+        return damage
+
+    def _stack_turn(self, stack: List[Enemy], defend: Callable[[Enemy], str]) -> None:
+        """A stack of identical enemies takes its turn as one."""
+        state = self.state
+        lead = stack[0]
+
+        # Effects are still each enemy's own; only the reporting is combined
+        attackers: List[Enemy] = []
+        poisoned = poison_hp = succumbed = stunned = 0
+        for enemy in stack:
+            effects = enemy.status_effects
+            enemy_stunned = effects.stunned
+            _, hp_delta_e, _, _ = effects.tick()
+            enemy.health += hp_delta_e
+            if hp_delta_e < 0:
+                poisoned += 1
+                poison_hp += hp_delta_e
+            if not enemy.is_alive():
+                succumbed += 1
+            elif enemy_stunned:
+                stunned += 1
+            else:
+                attackers.append(enemy)
+
+        if poisoned:
+            self._emit("effect_tick", target=lead, hp=poison_hp, count=poisoned)
+        if succumbed:
+            self._emit("succumbed", enemy=lead, count=succumbed)
+        if stunned:
+            self._emit("stunned", enemy=lead, count=stunned)
+        if not attackers:
+            return
+
+        total = len(attackers)
+        self._emit("enemy_attack", enemy=attackers[0], count=total)
+
+        # Every attack gets its own dodge roll, as it would one by one
+        dodge = get_dodge_mod(state.active_effects)
+        if dodge > 0:
+            landing, dodged = [], []
+            for enemy in attackers:
+                (dodged if self.rng.random() < dodge else landing).append(enemy)
+            if dodged:
+                self._emit("dodge", enemy=dodged[0], count=len(dodged), total=total)
+            if not landing:
+                return
+            attackers = landing
+        lead, count = attackers[0], len(attackers)
+
+        # One QTE for the rest of the stack. A perfect parry counters the
+        # front enemy; the others' attacks are still blocked.
+        result = defend(lead)
+        if result == "perfect":
+            counter_dmg = lead.take_damage(self.last_total_damage // 2)
+            self._emit("parry", enemy=lead, damage=counter_dmg, count=count)
+            if not lead.is_alive():
+                self._emit("defeated", enemy=lead)
+            if count > 1:
+                damage = self._blocked_damage(lead) * (count - 1)
+                state.health -= damage
+                self._emit("block", enemy=lead, damage=damage, count=count - 1)
+
+        elif result == "block":
+            damage = self._blocked_damage(lead) * count
+            state.health -= damage
+            self._emit("block", enemy=lead, damage=damage, count=count)
+
+        else:
+            damage = self._hit_damage(lead) * count
+            state.health -= damage
+            self._emit("hit", enemy=lead, damage=damage, count=count)
+
+    def finish(self) -> List[dict]:
+        """Award loot and XP for a won fight, and the small post-fight regen."""
+        if self.outcome != "won":
+            return []
+        state = self.state
+
+        total_gold, total_items, total_xp = 0, [], 0
+        for enemy in self.enemies:
+            loot = enemy.get_loot(self.rng)
+            total_gold += loot["gold"]
+            total_items.extend(loot["items"])
+            total_xp += loot["xp"]
+
+        loot = Transaction(state).add_gold(total_gold)
+        for item_name in total_items:
+            loot.add_item(item_name, 1)
+        # The driver decides when to save
+        if loot.commit(save=False):
+            self._emit("loot", gold=total_gold, items=total_items)
+        else:
+            # Nothing was granted, so report why rather than a gain
+            self._emit("loot_failed", problems=list(loot.problems))
+
+        if total_xp > 0:
+            old_level = gain_xp(state, total_xp)
+            self._emit("xp", amount=total_xp, old_level=old_level)
+
+        mana = stamina = 0
+        if state.max_mana > 0:
+            mana = int(state.max_mana * 0.05)
+            state.mana = min(state.max_mana, state.mana + mana)
+        if state.max_stamina > 0:
+            stamina = int(state.max_stamina * 0.05)
+            state.stamina = min(state.max_stamina, state.stamina + stamina)
+        self._emit("regen", mana=mana, stamina=stamina)
+        return self._take_events()
+
+
+# endregion
+
+
 # region Combat
 
 
-def _show_combat_status(state, enemies: list, turn: int) -> None:
+def _label(enemy: Enemy, count: int = 1) -> str:
+    return enemy.name if count == 1 else f"{count}x {enemy.name}"
+
+
+def _show_combat_status(state, enemies: list, turn: int, grouped: bool) -> None:
     print_color(f"=== Turn {turn} ===", 200, 200, 255)
     print()
     print_color(f"Your HP: {state.health}/{state.max_health}", 50, 255, 50)
@@ -677,37 +930,29 @@ def _show_combat_status(state, enemies: list, turn: int) -> None:
     if state.max_stamina > 0:
         print_color(f"Stamina: {state.stamina}/{state.max_stamina}", 255, 140, 0)
 
-    if hasattr(state, "active_effects") and state.active_effects:
+    effects = getattr(state, "active_effects", None)
+    if effects:
+        effects = as_effects(effects)
         eff_strs = []
-        dmg_mod = get_damage_mod(state.active_effects)
-        def_bon = get_defense_bonus(state.active_effects)
-        dodge = get_dodge_mod(state.active_effects)
-        if dmg_mod > 1.0:
-            turns = next(
-                e["duration"]
-                for e in state.active_effects
-                if e["type"] == "damage_buff"
-            )
-            eff_strs.append(f"DMG x{dmg_mod} ({turns}t)")
-        if def_bon > 0:
-            turns = next(
-                e["duration"]
-                for e in state.active_effects
-                if e["type"] == "defense_buff"
-            )
-            eff_strs.append(f"+{def_bon} DEF ({turns}t)")
-        if dodge > 0:
-            turns = next(
-                e["duration"]
-                for e in state.active_effects
-                if e["type"] == "dodge_chance"
-            )
-            eff_strs.append(f"{int(dodge*100)}% Dodge ({turns}t)")
+        if effects.damage_mod > 1.0:
+            turns = effects.duration_of("damage_buff")
+            eff_strs.append(f"DMG x{effects.damage_mod} ({turns}t)")
+        if effects.defense_bonus > 0:
+            turns = effects.duration_of("defense_buff")
+            eff_strs.append(f"+{effects.defense_bonus} DEF ({turns}t)")
+        if effects.dodge > 0:
+            turns = effects.duration_of("dodge_chance")
+            eff_strs.append(f"{int(effects.dodge*100)}% Dodge ({turns}t)")
         if eff_strs:
             print_color("Buffs: " + " | ".join(eff_strs), 200, 150, 255)
 
     print()
 
+    if grouped:
+        _show_enemy_stacks(enemies)
+        print()
+        return
+
     for i, enemy in enumerate(enemies):
         if enemy.is_alive():
             status_str = ""
@@ -718,6 +963,10 @@ def _show_combat_status(state, enemies: list, turn: int) -> None:
                         tags.append(f"Poisoned({eff['duration']}t)")
                     elif eff["type"] == "stun":
                         tags.append("Stunned")
+                    elif eff["type"] == "armor_break":
+                        tags.append(f"Armor Broken({eff['duration']}t)")
+                    elif eff["type"] == "expose":
+                        tags.append(f"Exposed({eff['duration']}t)")
                 status_str = "  [" + ", ".join(tags) + "]"
             print_color(
                 f"{i+1}. {enemy.name} - HP: {enemy.health}/{enemy.max_health}{status_str}",
@@ -728,8 +977,48 @@ def _show_combat_status(state, enemies: list, turn: int) -> None:
     print()
 
 
-def _pick_target(enemies: list) -> Enemy:
+_STACK_TAGS = {
+    "poison": "Poisoned",
+    "stun": "Stunned",
+    "armor_break": "Armor Broken",
+    "expose": "Exposed",
+}
+
+
+def _show_enemy_stacks(enemies: list) -> None:
+    """One line per stack of identical enemies, for large battles."""
+    for i, stack in enumerate(group_enemies([e for e in enemies if e.is_alive()])):
+        lead = stack[0]
+        health = sum(e.health for e in stack)
+        tagged: Dict[str, int] = {}
+        for enemy in stack:
+            for eff_type in dict.fromkeys(eff["type"] for eff in enemy.status_effects):
+                if eff_type in _STACK_TAGS:
+                    tagged[eff_type] = tagged.get(eff_type, 0) + 1
+        status_str = ""
+        if tagged:
+            status_str = "  [" + ", ".join(
+                f"{_STACK_TAGS[t]} x{n}" for t, n in tagged.items()
+            ) + "]"
+        print_color(
+            f"{i+1}. {_label(lead, len(stack))} - HP: {health}/{lead.max_health * len(stack)}{status_str}",
+            255,
+            100,
+            100,
+        )
+
+
+def _pick_target(enemies: list, grouped: bool = False) -> Enemy:
     alive = [e for e in enemies if e.is_alive()]
+    if grouped:
+        # Pick a stack; attacks go to its most wounded enemy to finish it off
+        stacks = group_enemies(alive)
+        stack = stacks[0]
+        if len(stacks) > 1:
+            print()
+            print("Choose target:")
+            stack = stacks[menu_choice([_label(s[0], len(s)) for s in stacks]) - 1]
+        return min(stack, key=lambda e: e.health)
     if len(alive) == 1:
         return alive[0]
     print()
@@ -737,20 +1026,189 @@ def _pick_target(enemies: list) -> Enemy:
     return alive[menu_choice([e.name for e in alive]) - 1]
 
 
-def combat(state, enemies: List[Enemy]) -> bool:
-    from data.items import ITEMS
+def _show_effect_applied(event: dict) -> None:
+    effect, value, turns = event["effect"], event["value"], event["duration"]
+    count = event.get("count", 1)
+    if event.get("target"):
+        who = _label(event["target"], count)
+        is_are, its = ("is", "'s") if count == 1 else ("are", "'")
+    if effect == "damage_buff":
+        print_color(f"Damage buffed x{value} for {turns} turns!", 200, 150, 255)
+    elif effect == "defense_buff":
+        print_color(f"+{value} defense for {turns} turns!", 100, 200, 255)
+    elif effect == "dodge_chance":
+        print_color(f"{int(value*100)}% dodge for {turns} turns!", 50, 255, 200)
+    elif effect == "poison":
+        print_color(
+            f"{who} {is_are} poisoned! ({abs(value)} dmg/turn for {turns} turns)",
+            100,
+            255,
+            100,
+        )
+    elif effect == "stun":
+        print_color(
+            f"{who} {is_are} stunned for {turns} turn(s)!", 200, 200, 50
+        )
+    elif effect == "armor_break":
+        print_color(
+            f"{who}{its} armor cracks! (-{abs(value)} defense for {turns} turns)",
+            255,
+            160,
+            60,
+        )
+    elif effect == "expose":
+        print_color(
+            f"{who} {is_are} exposed! (defense x{value} for {turns} turns)",
+            255,
+            160,
+            60,
+        )
+
+
+def _show_event(state, event: dict) -> None:
+    """Draw one engine event in the terminal, at the pace the fight is played."""
+    kind = event["type"]
+    enemy = event.get("enemy") or event.get("target")
+    # Large battles report a whole stack at once
+    count = event.get("count", 1)
+    if enemy:
+        who = _label(enemy, count)
+
+    if kind == "attack":
+        print()
+        print_color(
+            f"You attack {enemy.name} for {event['damage']} damage!", 255, 200, 50
+        )
+    elif kind == "defeated":
+        print_color(f"{who} defeated!", 50, 255, 50)
+
+    elif kind in ("skill", "fizzle"):
+        clear()
+        print_color(f"=== {event['skill']} ===", 100, 200, 255)
+        print()
+        if kind == "fizzle":
+            print_color("No inputs hit! Skill fizzled.", 255, 100, 100)
+            return
+        hits, steps = event["hits"], event["steps"]
+        if hits == steps:
+            print_color("PERFECT!", 50, 255, 50)
+        else:
+            print_color(
+                f"Partial: {hits}/{steps} inputs ({int(hits / steps * 100)}%)",
+                255,
+                200,
+                50,
+            )
+        print()
+    elif kind == "skill_damage":
+        takes = "takes" if count == 1 else "take"
+        print_color(f"{who} {takes} {event['damage']} damage!", 255, 200, 50)
+    elif kind == "heal":
+        print_color(f"Restored {event['amount']} health!", 50, 255, 50)
+    elif kind == "effect_applied":
+        _show_effect_applied(event)
+
+    elif kind == "flee":
+        if event["success"]:
+            print_color("You fled from combat!", 200, 200, 50)
+        else:
+            print_color("Couldn't escape!", 255, 100, 100)
+
+    elif kind == "effect_expired":
+        name = event["effect"]
+        print_color(f"{name.replace('_', ' ').title()} wore off.", 150, 150, 150)
+    elif kind == "effect_tick" and enemy:
+        takes = "takes" if count == 1 else "take"
+        print_color(f"{who} {takes} {abs(event['hp'])} poison damage!", 100, 255, 100)
+    elif kind == "effect_tick":
+        hp_delta = event["hp"]
+        label = "regen" if hp_delta > 0 else "damage"
+        print_color(
+            f"Effect {label}: {abs(hp_delta)} HP",
+            150,
+            255 if hp_delta > 0 else 100,
+            150,
+        )
+
+    elif kind == "succumbed":
+        print_color(f"{who} succumbed to poison!", 50, 255, 50)
+        time.sleep(1)
+    elif kind == "stunned":
+        if count == 1:
+            print_color(f"{who} is stunned and skips their turn!", 200, 200, 50)
+        else:
+            print_color(f"{who} are stunned and skip their turn!", 200, 200, 50)
+        time.sleep(1)
+    elif kind == "enemy_attack":
+        clear()
+        attacks = "attacks" if count == 1 else "attack"
+        print_color(f"{who} {attacks}!", 255, 100, 100)
+        time.sleep(1)
+    elif kind == "dodge":
+        total = event.get("total", count)
+        if total == 1:
+            print_color("You dodge the attack!", 50, 255, 200)
+        elif count == total:
+            print_color(f"You dodge all {count} attacks!", 50, 255, 200)
+        else:
+            print_color(f"You dodge {count} of {total} attacks!", 50, 255, 200)
+        time.sleep(2)
+    elif kind == "parry":
+        if count == 1:
+            print_color("PERFECT PARRY! No damage taken!", 50, 255, 50)
+        else:
+            print_color(f"PERFECT PARRY against the first {enemy.name}!", 50, 255, 50)
+        print_color("Counter attack!", 255, 200, 50)
+        print_color(f"You counter for {event['damage']} damage!", 255, 200, 50)
+        time.sleep(2)
+    elif kind == "block":
+        blocked = "Blocked!" if count == 1 else f"Blocked {count} attacks!"
+        print_color(f"{blocked} Took {event['damage']} damage.", 255, 200, 50)
+        time.sleep(2)
+    elif kind == "hit":
+        hit = "HIT!" if count == 1 else f"HIT by {count} attacks!"
+        print_color(f"{hit} Took {event['damage']} damage!", 255, 50, 50)
+        time.sleep(2)
 
-    if not hasattr(state, "active_effects"):
-        state.active_effects = []
+    elif kind == "loot":
+        if event["gold"] > 0:
+            print_color(f"Gained {event['gold']} gold!", 255, 200, 50)
+        for item_name in event["items"]:
+            print_color(f"Found: {item_name}", 200, 255, 200)
+    elif kind == "loot_failed":
+        for problem in event["problems"]:
+            print_color(problem, 255, 50, 50)
+    elif kind == "xp":
+        announce_xp(state, event["amount"], event["old_level"])
+    elif kind == "regen":
+        if event["mana"]:
+            print_color(f"Mana restored: +{event['mana']}", 255, 0, 255)
+        if event["stamina"]:
+            print_color(f"Stamina restored: +{event['stamina']}", 255, 140, 0)
+
+
+def _defend(enemy: Enemy) -> str:
+    return qte_defense(difficulty=enemy.difficulty)
+
+
+def _fight(state, enemies: List[Enemy]) -> CombatEngine:
+    """One attempt at a fight, played to the end. Returns the finished engine."""
+    engine = CombatEngine(
+        state, enemies, on_event=lambda event: _show_event(state, event)
+    )
 
     clear()
     print_color("=== COMBAT START ===", 255, 50, 50)
 
+    if engine.grouped:
+        names = [_label(s[0], len(s)) for s in group_enemies(enemies)]
+    else:
+        names = [e.name for e in enemies]
     if len(enemies) == 1:
         write_slow(f"A {enemies[0].name} appears!", 50, 255, 100, 100)
     else:
         write_slow(
-            f"You're surrounded by: {', '.join(e.name for e in enemies)}!",
+            f"You're surrounded by: {', '.join(names)}!",
             50,
             255,
             100,
@@ -759,16 +1217,11 @@ def combat(state, enemies: List[Enemy]) -> bool:
 
     time.sleep(2)
 
-    has_skills = bool(
-        state.player_class
-        and get_available_skills(state.player_class.name, state.level)
-    )
-    turn = 1
-    last_total_damage = 5
+    has_skills = bool(engine.available_skills())
 
-    while state.health > 0 and any(e.is_alive() for e in enemies):
+    while not engine.over:
         clear()
-        _show_combat_status(state, enemies, turn)
+        _show_combat_status(state, enemies, engine.turn, engine.grouped)
 
         menu_opts = ["Attack"]
         if has_skills:
@@ -778,145 +1231,52 @@ def combat(state, enemies: List[Enemy]) -> bool:
         action = menu_opts[menu_choice(menu_opts) - 1]
 
         if action == "Attack":
-            target = _pick_target(enemies)
-            weapon_damage = 0
-            if state.equipped_weapon:
-                raw = ITEMS.get(state.equipped_weapon, {}).get("damage", 0)
-                weapon_damage = random.randint(*raw) if isinstance(raw, tuple) else raw
-
-            class_mod = state.player_class.damage_mod if state.player_class else 1.0
-            total_damage = int(
-                (5 + weapon_damage + state.level)
-                * class_mod
-                * get_damage_mod(state.active_effects)
-            )
-            last_total_damage = total_damage
-
-            actual = target.take_damage(total_damage)
-            print()
-            print_color(f"You attack {target.name} for {actual} damage!", 255, 200, 50)
-            if not target.is_alive():
-                print_color(f"{target.name} defeated!", 50, 255, 50)
-            time.sleep(2)
-
+            target = _pick_target(enemies, engine.grouped)
+            engine.act({"type": "attack", "target": target})
         elif action == "Skills":
-            result = skill_menu(state, [e for e in enemies if e.is_alive()])
-            if result["type"] == "cancelled":
+            chosen = skill_menu(engine)
+            if chosen is None:
                 continue
-            if result.get("damage"):
-                last_total_damage = result["damage"]
-
+            engine.act(chosen)
         elif action == "Items":
             print_color("Item usage not yet implemented!", 255, 200, 50)
             time.sleep(1)
             continue
-
         elif action == "Flee":
-            if random.random() < 0.5:
-                print_color("You fled from combat!", 200, 200, 50)
-                time.sleep(2)
-                return False
-            print_color("Couldn't escape!", 255, 100, 100)
-            time.sleep(2)
-
-        if not any(e.is_alive() for e in enemies):
-            break
-
-        expired, hp_delta, _, _ = tick_effects(state.active_effects, state)
-        for name in expired:
-            print_color(f"{name.replace('_', ' ').title()} wore off.", 150, 150, 150)
-        if hp_delta != 0:
-            label = "regen" if hp_delta > 0 else "damage"
-            print_color(
-                f"Effect {label}: {abs(hp_delta)} HP",
-                150,
-                255 if hp_delta > 0 else 100,
-                150,
-            )
-
-        for enemy in enemies:
-            if not enemy.is_alive():
-                continue
-
-            enemy_stunned = is_stunned(enemy.status_effects)
-
-            remaining = []
-            hp_delta_e = 0
-            for eff in enemy.status_effects:
-                if eff["type"] == "poison":
-                    hp_delta_e += eff["value"]
-                eff["duration"] -= 1
-                if eff["duration"] > 0:
-                    remaining.append(eff)
-            enemy.status_effects = remaining
-            enemy.health += hp_delta_e
-
-            if hp_delta_e < 0:
-                print_color(
-                    f"{enemy.name} takes {abs(hp_delta_e)} poison damage!",
-                    100,
-                    255,
-                    100,
-                )
-                if not enemy.is_alive():
-                    print_color(f"{enemy.name} succumbed to poison!", 50, 255, 50)
-                    time.sleep(1)
-                    continue
-
-            if enemy_stunned:
-                print_color(
-                    f"{enemy.name} is stunned and skips their turn!", 200, 200, 50
-                )
-                time.sleep(1)
-                continue
-
-            clear()
-            print_color(f"{enemy.name} attacks!", 255, 100, 100)
-            time.sleep(1)
-
-            dodge = get_dodge_mod(state.active_effects)
-            if dodge > 0 and random.random() < dodge:
-                print_color("You dodge the attack!", 50, 255, 200)
-                time.sleep(2)
-                continue
-
-            result = qte_defense(difficulty=enemy.difficulty)
+            engine.act({"type": "flee"})
+        time.sleep(2)
 
-            if result == "perfect":
-                print_color("PERFECT PARRY! No damage taken!", 50, 255, 50)
-                print_color("Counter attack!", 255, 200, 50)
-                counter_dmg = enemy.take_damage(last_total_damage // 2)
-                print_color(f"You counter for {counter_dmg} damage!", 255, 200, 50)
-                if not enemy.is_alive():
-                    print_color(f"{enemy.name} defeated!", 50, 255, 50)
+        if not engine.over:
+            engine.enemy_phase(_defend)
 
-            elif result == "block":
-                damage = max(
-                    1, enemy.damage // 2 - get_defense_bonus(state.active_effects)
-                )
-                state.health -= damage
-                print_color(f"Blocked! Took {damage} damage.", 255, 200, 50)
+    return engine
 
-            else:
-                damage = enemy.damage
-                if state.equipped_armor:
-                    defense = ITEMS.get(state.equipped_armor, {}).get(
-                        "defense", 0
-                    ) + get_defense_bonus(state.active_effects)
-                    damage = max(1, damage - defense)
-                state.health -= damage
-                print_color(f"HIT! Took {damage} damage!", 255, 50, 50)
 
-            time.sleep(2)
-
-            if state.health <= 0:
-                clear()
-                print_color("=== DEFEAT ===", 255, 50, 50)
-                write_slow("You have been defeated...", 50, 255, 100, 100)
-                time.sleep(3)
-                return False
+def combat(state, enemies: List[Enemy]) -> bool:
+    """Play a fight in the terminal. True if the player won."""
+    # Lets a lost fight be retried from scratch without reloading the save
+    before_fight = state.checkpoint()
 
-        turn += 1
+    engine = _fight(state, enemies)
+    while engine.outcome == "lost":
+        clear()
+        print_color("=== DEFEAT ===", 255, 50, 50)
+        write_slow("You have been defeated...", 50, 255, 100, 100)
+        time.sleep(3)
+        print()
+        if menu_choice(["Retry fight", "Give up"]) != 1:
+            return False
+        state.restore(before_fight)
+        # Fresh enemies in the same order, one spawn_wave per run of a type
+        enemies = [
+            fresh
+            for proto, run in groupby(enemies, key=lambda e: e.prototype)
+            for fresh in spawn_wave(proto, len(list(run)))
+        ]
+        engine = _fight(state, enemies)
+
+    if engine.outcome == "fled":
+        return False
 
     clear()
     print_color("=== VICTORY ===", 50, 255, 50)
@@ -924,32 +1284,7 @@ def combat(state, enemies: List[Enemy]) -> bool:
     print()
     time.sleep(2)
 
-    total_gold, total_items, total_xp = 0, [], 0
-    for enemy in enemies:
-        loot = enemy.get_loot()
-        total_gold += loot["gold"]
-        total_items.extend(loot["items"])
-        total_xp += loot["xp"]
-
-    if total_gold > 0:
-        state.gold += total_gold
-        print_color(f"Gained {total_gold} gold!", 255, 200, 50)
-
-    for item_name in total_items:
-        state.inventory.add_item(item_name, 1)
-        print_color(f"Found: {item_name}", 200, 255, 200)
-
-    if total_xp > 0:
-        add_xp(state, total_xp)
-
-    if state.max_mana > 0:
-        regen = int(state.max_mana * 0.05)
-        state.mana = min(state.max_mana, state.mana + regen)
-        print_color(f"Mana restored: +{regen}", 255, 0, 255)
-    if state.max_stamina > 0:
-        regen = int(state.max_stamina * 0.05)
-        state.stamina = min(state.max_stamina, state.stamina + regen)
-        print_color(f"Stamina restored: +{regen}", 255, 140, 0)
+    engine.finish()
 
     print()
     state.save()
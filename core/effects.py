@@ -0,0 +1,391 @@
+"""
+core/effects.py - Status effect definitions and the container that holds
+the effects on a combatant.
+
+An effect in play is a dict, {"type": ..., "duration": turns, "value": ...},
+which is also how it is saved. ActiveEffects holds a combatant's effects
+and keeps running totals of what they add up to (damage multiplier,
+defense bonus and multiplier, dodge chance, stun), updated as effects are
+added and as they expire, so reading a modifier never has to walk the
+effects. The player and every enemy each have one.
+
+Expiry is a queue keyed on the turn each effect runs out, so a turn
+passing only touches the effects that tick (regen, poison) and the ones
+that expire that turn, not every effect in play.
+"""
+
+from heapq import heappop, heappush
+from itertools import count
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from core.checkpoint import next_version
+
+
+EFFECTS = {
+    "damage_buff": {
+        "category": "buff",
+        "target": "player",
+        "tick": False,
+        "stat": "damage",
+        "apply_type": "percent",
+        "value": 1.5,
+        "description": "Increases damage output",
+    },
+    "defense_buff": {
+        "category": "buff",
+        "target": "player",
+        "tick": False,
+        "stat": "defense",
+        "apply_type": "flat",
+        "value": 10,
+        "description": "Increases damage resistance",
+    },
+    "dodge_chance": {
+        "category": "buff",
+        "target": "player",
+        "tick": False,
+        "stat": "dodge",
+        "apply_type": "percent",
+        "value": 0.5,
+        "description": "Chance to completely avoid an attack",
+    },
+    "regen": {
+        "category": "buff",
+        "target": "player",
+        "tick": True,
+        "stat": "health",
+        "apply_type": "flat",
+        "value": 5,
+        "description": "Restores health each turn",
+    },
+    "mana_regen": {
+        "category": "buff",
+        "target": "player",
+        "tick": True,
+        "stat": "mana",
+        "apply_type": "flat",
+        "value": 5,
+        "description": "Restores mana each turn",
+    },
+    "weakness": {
+        "category": "debuff",
+        "target": "player",
+        "tick": False,
+        "stat": "damage",
+        "apply_type": "percent",
+        "value": 0.6,
+        "description": "Reduces damage output significantly",
+    },
+    "slow": {
+        "category": "debuff",
+        "target": "player",
+        "tick": False,
+        "stat": "dodge",
+        "apply_type": "percent",
+        "value": 0.0,
+        "description": "Cannot dodge attacks",
+    },
+    "vulnerable": {
+        "category": "debuff",
+        "target": "player",
+        "tick": False,
+        "stat": "defense",
+        "apply_type": "flat",
+        "value": -10,
+        "description": "Defense is reduced",
+    },
+    "burn": {
+        "category": "dot",
+        "target": "player",
+        "tick": True,
+        "stat": "health",
+        "apply_type": "flat",
+        "value": -4,
+        "description": "Takes fire damage each turn",
+    },
+    "bleed": {
+        "category": "dot",
+        "target": "player",
+        "tick": True,
+        "stat": "health",
+        "apply_type": "flat",
+        "value": -3,
+        "description": "Loses health from bleeding each turn",
+    },
+    "stun": {
+        "category": "debuff",
+        "target": "both",
+        "tick": False,
+        "stat": None,
+        "apply_type": None,
+        "value": None,
+        "description": "Skips next turn",
+    },
+    "poison": {
+        "category": "dot",
+        "target": "enemy",
+        "tick": True,
+        "stat": "health",
+        "apply_type": "flat",
+        "value": -5,
+        "description": "Takes poison damage each turn",
+    },
+    "armor_break": {
+        "category": "debuff",
+        "target": "enemy",
+        "tick": False,
+        "stat": "defense",
+        "apply_type": "flat",
+        "value": -8,
+        "description": "Enemy defense is reduced",
+    },
+    "expose": {
+        "category": "debuff",
+        "target": "enemy",
+        "tick": False,
+        "stat": "defense",
+        "apply_type": "percent",
+        "value": 0.5,
+        "description": "Enemy is exposed, taking increased damage",
+    },
+}
+
+
+class _Entry:
+    """An effect in a container, with the container turn it expires on."""
+
+    __slots__ = ("effect", "expires", "live")
+
+    def __init__(self, effect: dict, expires: int):
+        self.effect = effect
+        self.expires = expires
+        self.live = True
+
+
+class ActiveEffects:
+    __slots__ = (
+        "_entries",
+        "_ticking",
+        "_queue",
+        "_clock",
+        "_seq",
+        "_first",
+        "damage_mod",
+        "defense_bonus",
+        "defense_mod",
+        "_dodge_base",
+        "_dodge_mod",
+        "_stuns",
+        "version",
+    )
+
+    def __init__(self, effects: Iterable[dict] = ()):
+        self._entries: List[_Entry] = []
+        # Only effects that do something every turn (regen, poison) are
+        # visited on a tick
+        self._ticking: List[_Entry] = []
+        # (expiry turn, insertion order, entry). Refreshing an effect pushes
+        # a new item and leaves the old one to be skipped when popped.
+        self._queue: List[Tuple[int, int, _Entry]] = []
+        self._clock = 0
+        self._seq = count()
+        # Bumped on every change, turns passing included (see core/checkpoint.py)
+        self.version = next_version()
+        self._reset()
+        for eff in effects:
+            self.append(eff)
+
+    def _reset(self) -> None:
+        # Type -> the first effect of that type, for durations on the HUD
+        self._first: Dict[str, _Entry] = {}
+        self.damage_mod = 1.0
+        self.defense_bonus = 0
+        self.defense_mod = 1.0
+        self._dodge_base = 0.0
+        self._dodge_mod = 1.0
+        self._stuns = 0
+
+    def _count(self, entry: _Entry) -> None:
+        """Fold one effect into the totals."""
+        eff = entry.effect
+        self._first.setdefault(eff["type"], entry)
+        defn = EFFECTS.get(eff["type"])
+        if defn is None:
+            return
+        if eff["type"] == "stun":
+            self._stuns += 1
+            return
+        stat, apply_type = defn["stat"], defn["apply_type"]
+        value = eff.get("value", defn["value"])
+        if stat == "damage" and apply_type == "percent":
+            self.damage_mod *= value
+        elif stat == "defense" and apply_type == "flat":
+            self.defense_bonus += value
+        elif stat == "defense" and apply_type == "percent":
+            self.defense_mod *= value
+        elif stat == "dodge" and apply_type == "percent":
+            if defn["category"] == "buff":
+                self._dodge_base += value
+            else:
+                self._dodge_mod *= value
+
+    def _recount(self) -> None:
+        # Multipliers can be 0 (slow), so removing one means starting over
+        self._reset()
+        for entry in self._entries:
+            self._count(entry)
+
+    def _synced(self, entry: _Entry) -> dict:
+        # Durations aren't counted down each turn; they are worked out from
+        # the expiry turn whenever someone looks
+        entry.effect["duration"] = entry.expires - self._clock
+        return entry.effect
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[dict]:
+        return (self._synced(entry) for entry in self._entries)
+
+    @property
+    def dodge(self) -> float:
+        """Chance to dodge an attack outright."""
+        return self._dodge_base * self._dodge_mod
+
+    @property
+    def stunned(self) -> bool:
+        return self._stuns > 0
+
+    def duration_of(self, effect_type: str) -> int:
+        """Turns left on the first effect of this type, 0 if there is none."""
+        entry = self._first.get(effect_type)
+        return entry.expires - self._clock if entry else 0
+
+    def _schedule(self, entry: _Entry) -> None:
+        heappush(self._queue, (entry.expires, next(self._seq), entry))
+
+    def append(self, eff: dict) -> None:
+        """Add an effect on top of any of the same type (they stack)."""
+        entry = _Entry(eff, self._clock + eff["duration"])
+        self.version = next_version()
+        self._entries.append(entry)
+        if EFFECTS.get(eff["type"], {}).get("tick"):
+            self._ticking.append(entry)
+        self._schedule(entry)
+        self._count(entry)
+
+    def apply(self, effect_type: str, duration: int, value=None) -> None:
+        """
+        Add an effect, or refresh the one already there: it keeps the longer
+        duration and takes the new value.
+        """
+        defn = EFFECTS.get(effect_type)
+        if not defn:
+            return
+        actual_value = value if value is not None else defn["value"]
+        entry = self._first.get(effect_type)
+        if entry is None:
+            self.append(
+                {"type": effect_type, "duration": duration, "value": actual_value}
+            )
+            return
+        self.version = next_version()
+        expires = max(entry.expires, self._clock + duration)
+        if expires != entry.expires:
+            entry.expires = expires
+            self._schedule(entry)
+        if entry.effect["value"] != actual_value:
+            entry.effect["value"] = actual_value
+            self._recount()
+
+    def tick(self) -> Tuple[List[str], int, int, int]:
+        """
+        One turn passes: ticking effects apply, then whatever has run its
+        course expires. Returns (expired types, hp, mana, stamina change).
+        """
+        self._clock += 1
+        self.version = next_version()
+        hp_delta = mana_delta = stamina_delta = 0
+        for entry in self._ticking:
+            eff = entry.effect
+            defn = EFFECTS[eff["type"]]
+            val = eff.get("value", defn.get("value", 0))
+            stat = defn.get("stat")
+            if stat == "health":
+                hp_delta += val
+            elif stat == "mana":
+                mana_delta += val
+            elif stat == "stamina":
+                stamina_delta += val
+
+        expired = []
+        while self._queue and self._queue[0][0] <= self._clock:
+            expires, _, entry = heappop(self._queue)
+            if entry.live and entry.expires == expires:
+                entry.live = False
+                self._synced(entry)
+                expired.append(entry.effect["type"])
+
+        if expired:
+            self._entries = [e for e in self._entries if e.live]
+            self._ticking = [e for e in self._ticking if e.live]
+            self._recount()
+        return expired, hp_delta, mana_delta, stamina_delta
+
+    def to_list(self) -> List[dict]:
+        """Copies of the effects, for saving."""
+        return [dict(eff) for eff in self]
+
+
+EffectsLike = Union[ActiveEffects, List[dict]]
+
+
+def as_effects(effects: EffectsLike) -> ActiveEffects:
+    """effects itself if it is already a container, else one built from it."""
+    if isinstance(effects, ActiveEffects):
+        return effects
+    return ActiveEffects(effects)
+
+
+def get_damage_mod(active_effects: EffectsLike) -> float:
+    return as_effects(active_effects).damage_mod
+
+
+def get_defense_bonus(active_effects: EffectsLike) -> int:
+    return as_effects(active_effects).defense_bonus
+
+
+def get_dodge_mod(active_effects: EffectsLike) -> float:
+    return as_effects(active_effects).dodge
+
+
+def is_stunned(active_effects: EffectsLike) -> bool:
+    return as_effects(active_effects).stunned
+
+
+def apply_effect(
+    target_effects: EffectsLike, effect_type: str, duration: int, value=None
+) -> None:
+    effects = as_effects(target_effects)
+    effects.apply(effect_type, duration, value)
+    if effects is not target_effects:
+        target_effects[:] = list(effects)
+
+
+def tick_effects(active_effects: EffectsLike, state=None) -> tuple:
+    effects = as_effects(active_effects)
+    expired, hp_delta, mana_delta, stamina_delta = effects.tick()
+    if effects is not active_effects:
+        active_effects[:] = list(effects)
+
+    if state:
+        if hp_delta:
+            state.health = max(0, min(state.max_health, state.health + hp_delta))
+        if mana_delta and state.max_mana > 0:
+            state.mana = max(0, min(state.max_mana, state.mana + mana_delta))
+        if stamina_delta and state.max_stamina > 0:
+            state.stamina = max(
+                0, min(state.max_stamina, state.stamina + stamina_delta)
+            )
+
+    return expired, hp_delta, mana_delta, stamina_delta
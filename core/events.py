@@ -56,7 +56,7 @@ def kimaer_rat_event(state):
 
 def alchemy_shop_rat_combat(state):
     """Combat encounter in the alchemy shop"""
-    from core.combat import combat, Enemy
+    from core.combat import combat, spawn_wave
     from quests.quests import get_active_quest
     from dialogue.kimaer.celeste import celeste_quest_complete
 
@@ -85,11 +85,7 @@ def alchemy_shop_rat_combat(state):
     press_any_key()
 
     # Combat!
-    enemies = [
-        Enemy("Giant Rat"),
-        Enemy("Giant Rat"),
-        Enemy("Giant Rat"),
-    ]
+    enemies = spawn_wave("Giant Rat", 3)
 
     play_music("core/audio/music/Seen By The Flesh Of Agony - VENTURE OST.mp3")
     won = combat(state, enemies)
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import sys
 import time
-from typing import List, TYPE_CHECKING
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+from data.catalog import CONSUMABLE_EFFECTS, STAT_LINES
 from data.items import ITEMS
 from data.map import show_map
+from core.checkpoint import next_version
 from core.display import clear, press_any_key, print_color
 
 if TYPE_CHECKING:
@@ -13,16 +16,75 @@ if TYPE_CHECKING:
 
 
 class InventoryItem:
-    def __init__(self, name: str, item_type: str, count: int = 1, value: int = 0):
-        self.name = name
-        self.item_type = item_type  # "potion", "weapon", "quest", "misc", etc.
+    """
+    One stack of an item: just its name and how many. Everything else is
+    looked up in ITEMS, so price or type changes reach existing saves.
+    """
+
+    __slots__ = ("name", "count")
+
+    def __init__(self, name: str, count: int = 1):
+        self.name = sys.intern(name)
         self.count = count
-        self.value = value
+
+    @property
+    def item_type(self) -> str:
+        # "potion", "weapon", "quest", "misc", etc.
+        return ITEMS.get(self.name, {}).get("type", "misc")
+
+    @property
+    def value(self) -> int:
+        return ITEMS.get(self.name, {}).get("value", 0)
+
+    @property
+    def description(self) -> str:
+        return ITEMS.get(self.name, {}).get("description", "No description")
 
 
 class Inventory:
+    # Types with their own heading; get_by_type("misc") also covers every
+    # type not listed here
+    KNOWN_TYPES = ("weapon", "armor", "potion", "food", "tool", "quest")
+
     def __init__(self):
-        self.items: List[InventoryItem] = []
+        # Name -> item, in the order items were first picked up
+        self._by_name: Dict[str, InventoryItem] = {}
+        # Type -> name -> item, same order. Unknown types are also filed
+        # under "misc".
+        self._by_type: Dict[str, Dict[str, InventoryItem]] = {}
+        # Bumped on every change (see core/checkpoint.py)
+        self.version = next_version()
+
+    @property
+    def items(self) -> List[InventoryItem]:
+        """Every item, in pickup order."""
+        return list(self._by_name.values())
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def __iter__(self) -> Iterator[InventoryItem]:
+        return iter(list(self._by_name.values()))
+
+    def get(self, name: str) -> Optional[InventoryItem]:
+        return self._by_name.get(name)
+
+    def _type_keys(self, item_type: str) -> Tuple[str, ...]:
+        if item_type in self.KNOWN_TYPES or item_type == "misc":
+            return (item_type,)
+        return (item_type, "misc")
+
+    def _insert(self, item: InventoryItem) -> None:
+        self.version = next_version()
+        self._by_name[item.name] = item
+        for key in self._type_keys(item.item_type):
+            self._by_type.setdefault(key, {})[item.name] = item
+
+    def _discard(self, item: InventoryItem) -> None:
+        self.version = next_version()
+        del self._by_name[item.name]
+        for key in self._type_keys(item.item_type):
+            del self._by_type[key][item.name]
 
     def add_item(self, name: str, count: int = 1) -> None:
         """Add an item to inventory using the item database"""
@@ -31,57 +93,54 @@ class Inventory:
             print_color(f"Warning: Unknown item '{name}'", 255, 100, 100)
             return
 
-        item_data = ITEMS[name]
-
-        for item in self.items:
-            if item.name == name:
-                item.count += count
-                return
+        item = self._by_name.get(name)
+        if item is not None:
+            item.count += count
+            self.version = next_version()
+            return
 
         # Item doesn't exist, add new
-        self.items.append(
-            InventoryItem(name, item_data["type"], count, item_data["value"])
-        )
+        self._insert(InventoryItem(name, count))
 
     def remove_item(self, name: str, count: int = 1) -> bool:
         """Remove count of item. Returns True if successful, False if not enough"""
-        for item in self.items:
-            if item.name == name:
-                if item.count >= count:
-                    item.count -= count
-                    if item.count == 0:
-                        self.items.remove(item)
-                    return True
-                return False
-        return False
+        item = self._by_name.get(name)
+        if item is None or item.count < count:
+            return False
+        item.count -= count
+        self.version = next_version()
+        if item.count == 0:
+            self._discard(item)
+        return True
 
     def has_item(self, name: str, count: int = 1) -> bool:
         """Check if inventory has at least count of item"""
-        for item in self.items:
-            if item.name == name and item.count >= count:
-                return True
-        return False
+        item = self._by_name.get(name)
+        return item is not None and item.count >= count
+
+    def count_of(self, name: str) -> int:
+        item = self._by_name.get(name)
+        return item.count if item is not None else 0
+
+    def _set_count(self, name: str, count: int) -> None:
+        item = self._by_name.get(name)
+        if item is None:
+            if count > 0:
+                self._insert(InventoryItem(name, count))
+        elif count > 0:
+            item.count = count
+            self.version = next_version()
+        else:
+            self._discard(item)
 
     def get_by_type(self, item_type: str) -> List[InventoryItem]:
         """Get all items of a specific type, defaulting unknowns to misc"""
-        # Define what we consider "standard" types
-        known_types = ["weapon", "armor", "potion", "food", "tool", "quest"]
-
-        if item_type == "misc":
-            # Return items explicitly labeled "misc" OR items not in our known list
-            return [
-                item
-                for item in self.items
-                if item.item_type == "misc" or item.item_type not in known_types
-            ]
-
-        # Otherwise, just return the specific type requested
-        return [item for item in self.items if item.item_type == item_type]
+        return list(self._by_type.get(item_type, {}).values())
 
     def display(self) -> None:
         """Display inventory organized by type"""
 
-        if not self.items:
+        if not self:
             print("Inventory is empty.")
             return
 
@@ -107,31 +166,95 @@ class Inventory:
     def to_dict(self) -> List[dict]:
         """Convert to dict for JSON saving"""
         return [
-            {
-                "name": item.name,
-                "item_type": item.item_type,
-                "count": item.count,
-                "value": item.value,
-            }
-            for item in self.items
+            {"name": item.name, "count": item.count}
+            for item in self._by_name.values()
         ]
 
     @staticmethod
     def from_dict(data: List[dict]) -> "Inventory":
-        """Load from dict (JSON)"""
+        """Load from dict (JSON). Older saves' item_type/value are ignored."""
         inv = Inventory()
         for item_data in data:
-            inv.items.append(
-                InventoryItem(
-                    item_data["name"],
-                    item_data["item_type"],
-                    item_data["count"],
-                    item_data["value"],
-                )
-            )
+            inv._insert(InventoryItem(item_data["name"], item_data["count"]))
         return inv
 
 
+class Transaction:
+    """
+    A batch of gold and item changes applied to a state as one unit:
+
+        tx = Transaction(state)
+        tx.spend_gold(40)
+        tx.add_item("Worm", 10)
+        if not tx.commit():
+            print(tx.problems)
+
+    commit() checks everything first (known items, enough of each item and
+    enough gold once all changes are netted out) and applies nothing if any
+    check fails. Anything going wrong mid-apply rolls back what was done.
+    """
+
+    def __init__(self, state: GameState):
+        self.state = state
+        self.gold = 0
+        self.items: Dict[str, int] = {}  # name -> net count change
+        self.problems: List[str] = []
+
+    def add_gold(self, amount: int) -> "Transaction":
+        self.gold += amount
+        return self
+
+    def spend_gold(self, amount: int) -> "Transaction":
+        self.gold -= amount
+        return self
+
+    def add_item(self, name: str, count: int = 1) -> "Transaction":
+        self.items[name] = self.items.get(name, 0) + count
+        return self
+
+    def remove_item(self, name: str, count: int = 1) -> "Transaction":
+        return self.add_item(name, -count)
+
+    def validate(self) -> List[str]:
+        """Everything that would stop this transaction from committing."""
+        inventory = self.state.inventory
+        problems = []
+        for name, change in self.items.items():
+            if name not in ITEMS:
+                problems.append(f"Unknown item '{name}'")
+            elif inventory.count_of(name) + change < 0:
+                problems.append(f"Not enough {name}")
+        if self.state.gold + self.gold < 0:
+            problems.append(
+                f"Not enough gold! You need {-self.gold} but only have"
+                f" {self.state.gold}."
+            )
+        return problems
+
+    def commit(self, save: bool = True) -> bool:
+        """Apply every change, then save once. False if nothing was applied."""
+        self.problems = self.validate()
+        if self.problems:
+            return False
+
+        inventory = self.state.inventory
+        before_gold = self.state.gold
+        before = {name: inventory.count_of(name) for name in self.items}
+        try:
+            for name, change in self.items.items():
+                inventory._set_count(name, before[name] + change)
+            self.state.gold += self.gold
+        except BaseException:
+            for name, count in before.items():
+                inventory._set_count(name, count)
+            self.state.gold = before_gold
+            raise
+
+        if save:
+            self.state.save()
+        return True
+
+
 def show_inventory_menu(state: GameState) -> None:
     """Display and interact with inventory"""
     from core.utils import (
@@ -144,7 +267,7 @@ def show_inventory_menu(state: GameState) -> None:
         print_color("=== Inventory ===", 255, 200, 100)
         print()
 
-        if not state.inventory.items:
+        if not state.inventory:
             print("Your inventory is empty.")
             print()
             press_any_key("Press any key to return...")
@@ -174,7 +297,6 @@ def show_inventory_menu(state: GameState) -> None:
                 print_color(f"{'=' * 40}", 100, 100, 100)
 
                 for item in items:
-                    item_data = ITEMS.get(item.name, {})
                     count_str = f" x{item.count}" if item.count > 1 else ""
 
                     # Check if equipped
@@ -193,10 +315,8 @@ def show_inventory_menu(state: GameState) -> None:
                     print(f"{display_index}. {item.name}{count_str}{equipped_str}")
 
                     # Show item stats if weapon/armor
-                    if item_type == "weapon" and "damage" in item_data:
-                        print(f"   Damage: {item_data['damage']}")
-                    elif item_type == "armor" and "defense" in item_data:
-                        print(f"   Defense: {item_data['defense']}")
+                    if item.name in STAT_LINES:
+                        print(f"   {STAT_LINES[item.name]}")
 
                     item_list.append(item)
                     display_index += 1
@@ -231,11 +351,9 @@ def interact_with_item(state: GameState, item: InventoryItem) -> None:
     )
 
     clear()
-    item_data = ITEMS.get(item.name, {})
-
     print_color(f"=== {item.name} ===", 255, 200, 100)
     print()
-    print(f"Description: {item_data.get('description', 'No description')}")
+    print(f"Description: {item.description}")
     print(f"Value: {item.value} gold")
 
     if item.count > 1:
@@ -279,8 +397,7 @@ def interact_with_item(state: GameState, item: InventoryItem) -> None:
 def consume_item(state: GameState, item: InventoryItem) -> None:
     """Use a consumable item"""
 
-    item_data = ITEMS.get(item.name, {})
-    effect = item_data.get("effect", {})
+    effect = CONSUMABLE_EFFECTS.get(item.name, {})
 
     # Apply effects
     if "health" in effect:
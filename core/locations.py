@@ -2,13 +2,13 @@
 core/locations.py - All location functions and shop logic.
 """
 
-from pathlib import Path
 import time
 import random
-import os
 
+from core.inventory import Transaction
 from core.minigames import fishing_minigame
 from core.state import GameState, FIGHTER, WARLOCK, ROGUE, PALADIN, CLERIC
+from core.persistence.manager import get_save_manager
 from core.utils import (
     show_hud,
     menu_choice,
@@ -21,7 +21,7 @@ from core.display import (
     set_terminal_title,
 )
 from core.constants import KIMAER_ROSLIN, KIMAER_CELESTE, KIMAER_WILSON
-from data.items import ITEMS
+from data.catalog import sell_price, sells_to
 from data.journal import unlock_journal_entry
 from quests.quests import is_quest_active, is_quest_completed
 from quests.hooks import get_location_hook
@@ -211,56 +211,100 @@ def shop(state, location_name: str, shop_type: str) -> None:
             kimaer(state)
 
 
-def buy_items(state, shop_items: dict) -> None:
-    clear()
-    print_color("=== Buy Items ===", 255, 200, 50)
-    print()
+def _ask_quantity(prompt: str, maximum: int = None):
+    """Read a quantity from the player. None if the input was invalid."""
+    print(prompt)
+    try:
+        quantity = int(input("> ").strip())
+    except ValueError:
+        print_color("Invalid input!", 255, 50, 50)
+        time.sleep(1)
+        return None
+    if quantity < 1 or (maximum is not None and quantity > maximum):
+        print_color("Invalid quantity!", 255, 50, 50)
+        time.sleep(1)
+        return None
+    return quantity
 
+
+def buy_items(state, shop_items: dict) -> None:
+    """Fill a cart, then pay for all of it in one transaction."""
     if not shop_items:
+        clear()
+        print_color("=== Buy Items ===", 255, 200, 50)
+        print()
         print("This shop has no items for sale.")
         press_any_key()
         return
 
     item_list = list(shop_items.items())
-    for i, (name, price) in enumerate(item_list, 1):
-        print(f"{i}. {name} - {price} gold")
-    print(f"{len(item_list) + 1}. Cancel")
-    print()
-    show_hud(state)
-
-    choice = menu_choice([n for n, _ in item_list] + ["Cancel"])
-    if choice == len(item_list) + 1:
-        return
+    cart = {}  # name -> quantity
 
-    item_name, price = item_list[choice - 1]
-    print(f"How many {item_name}s would you like to buy?")
-    try:
-        quantity = int(input("> ").strip())
-        if quantity < 1:
-            print_color("Invalid quantity!", 255, 50, 50)
+    while True:
+        clear()
+        print_color("=== Buy Items ===", 255, 200, 50)
+        print()
+        for i, (name, price) in enumerate(item_list, 1):
+            in_cart = f"  (x{cart[name]} in cart)" if name in cart else ""
+            print(f"{i}. {name} - {price} gold{in_cart}")
+        total_cost = sum(shop_items[name] * qty for name, qty in cart.items())
+        print()
+        if cart:
+            print_color(f"Cart total: {total_cost} gold", 255, 200, 50)
+        show_hud(state)
+
+        options = [n for n, _ in item_list]
+        if cart:
+            options += [f"Checkout ({total_cost} gold)", "Empty cart"]
+        options.append("Cancel")
+        choice = menu_choice(options)
+
+        if choice <= len(item_list):
+            item_name = item_list[choice - 1][0]
+            quantity = _ask_quantity(f"How many {item_name}s would you like to buy?")
+            if quantity is not None:
+                cart[item_name] = cart.get(item_name, 0) + quantity
+            continue
+
+        action = options[choice - 1]
+        if action == "Cancel":
+            return
+        if action == "Empty cart":
+            cart.clear()
+            continue
+
+        purchase = Transaction(state).spend_gold(total_cost)
+        for name, quantity in cart.items():
+            purchase.add_item(name, quantity)
+        if purchase.commit():
+            for name, quantity in cart.items():
+                print_color(f"Purchased {quantity}x {name}", 50, 255, 50)
+            print_color(f"Paid {total_cost} gold.", 255, 200, 50)
             time.sleep(1)
             return
-    except ValueError:
-        print_color("Invalid input!", 255, 50, 50)
-        time.sleep(1)
-        return
+        for problem in purchase.problems:
+            print_color(problem, 255, 50, 50)
+        time.sleep(2)
 
-    total_cost = price * quantity
-    if state.gold >= total_cost:
-        state.gold -= total_cost
-        state.inventory.add_item(item_name, count=quantity)
-        print_color(
-            f"Purchased {quantity}x {item_name} for {total_cost} gold!", 50, 255, 50
-        )
-        time.sleep(1)
-    else:
-        print_color(
-            f"Not enough gold! You need {total_cost} but only have {state.gold}.",
-            255,
-            50,
-            50,
-        )
+
+def _sell(state, counts: dict) -> None:
+    """Sell {name: amount} in one transaction and report it."""
+    sale = Transaction(state)
+    earned = 0
+    for name, amount in counts.items():
+        sale.remove_item(name, amount)
+        earned += sell_price(name) * amount
+    sale.add_gold(earned)
+
+    if not sale.commit():
+        for problem in sale.problems:
+            print_color(problem, 255, 50, 50)
         time.sleep(2)
+        return
+    for name, amount in counts.items():
+        print_color(f"Sold {amount}x {name}", 50, 255, 50)
+    print_color(f"Earned {earned} gold!", 255, 200, 50)
+    time.sleep(1)
 
 
 def sell_items(state, shop_type: str) -> None:
@@ -268,11 +312,7 @@ def sell_items(state, shop_type: str) -> None:
     print_color("=== Sell Items ===", 255, 200, 50)
     print()
 
-    sellable = [
-        item
-        for item in state.inventory.items
-        if ITEMS.get(item.name) and shop_type in ITEMS[item.name].get("sellable_to", [])
-    ]
+    sellable = [item for item in state.inventory if sells_to(item.name, shop_type)]
 
     if not sellable:
         print("You have nothing this shop will buy.")
@@ -280,41 +320,36 @@ def sell_items(state, shop_type: str) -> None:
         return
 
     for i, item in enumerate(sellable, 1):
-        sell_price = ITEMS[item.name]["value"] // 2
         count_str = f" x{item.count}" if item.count > 1 else ""
-        print(f"{i}. {item.name}{count_str} - {sell_price} gold each")
-    print(f"{len(sellable) + 1}. Cancel")
+        print(f"{i}. {item.name}{count_str} - {sell_price(item.name)} gold each")
     print()
     show_hud(state)
 
-    choice = menu_choice([item.name for item in sellable] + ["Cancel"])
-    if choice == len(sellable) + 1:
+    # One "sell all" entry per item type this shop buys from you
+    types = list(dict.fromkeys(item.item_type for item in sellable))
+    options = [item.name for item in sellable]
+    options += [f"Sell all {item_type} items" for item_type in types]
+    options.append("Cancel")
+
+    choice = menu_choice(options)
+    if choice == len(options):
         return
 
-    item = sellable[choice - 1]
-    sell_price = ITEMS[item.name]["value"] // 2
+    if choice > len(sellable):
+        item_type = types[choice - len(sellable) - 1]
+        _sell(
+            state,
+            {item.name: item.count for item in sellable if item.item_type == item_type},
+        )
+        return
 
+    item = sellable[choice - 1]
+    amount = 1
     if item.count > 1:
-        print(f"How many? (1-{item.count})")
-        try:
-            amount = int(input("> ").strip())
-            if amount < 1 or amount > item.count:
-                print_color("Invalid amount!", 255, 50, 50)
-                time.sleep(1)
-                return
-        except ValueError:
-            print_color("Invalid amount!", 255, 50, 50)
-            time.sleep(1)
+        amount = _ask_quantity(f"How many? (1-{item.count})", item.count)
+        if amount is None:
             return
-    else:
-        amount = 1
-
-    state.inventory.remove_item(item.name, amount)
-    state.gold += sell_price * amount
-    print_color(
-        f"Sold {amount}x {item.name} for {sell_price * amount} gold!", 50, 255, 50
-    )
-    time.sleep(1)
+    _sell(state, {item.name: amount})
 
 
 # region GameStart
@@ -452,13 +487,10 @@ def start_character_creation(state: GameState) -> None:
 
             print_color("Finalizing character creation...", 50, 255, 50)
             time.sleep(2)
-            state.save()
-
-            # Delete the old file if name changed
+            # Move the old save over if the name changed
             if old_name and old_name != state.name:
-                old_file_path = Path("saves") / f"{old_name}.json"
-                if old_file_path.exists():
-                    os.remove(old_file_path)
+                get_save_manager().rename(old_name, state.name)
+            state.save()
 
             break
 
@@ -9,6 +9,7 @@ from core.utils import (
     _restore_terminal,
     _setup_terminal,
 )
+from core.weighted import WeightedTable
 
 
 def bar_serving_minigame(round_number: int) -> int:
@@ -134,6 +135,25 @@ def bar_serving_minigame(round_number: int) -> int:
     return total_score
 
 
+# Fish a bait attracts are this many times likelier to bite
+BAIT_AFFINITY_WEIGHT = 3
+
+_fish_tables = {}
+
+
+def fish_table(bait: str) -> WeightedTable:
+    """Which fish bites on bait, weighted by affinity. Built once per bait."""
+    from data.catalog import FISH, FISH_BY_BAIT
+
+    table = _fish_tables.get(bait)
+    if table is None:
+        liked = FISH_BY_BAIT.get(bait, frozenset())
+        table = _fish_tables[bait] = WeightedTable(
+            [(name, BAIT_AFFINITY_WEIGHT if name in liked else 1) for name in FISH]
+        )
+    return table
+
+
 def fishing_minigame(state) -> None:
     """
     Fishing minigame.
@@ -146,6 +166,7 @@ def fishing_minigame(state) -> None:
     5. On catch, add fish to inventory and consume bait.
     """
     from data.items import ITEMS
+    from data.catalog import RODS
     from core.utils import menu_choice
     import random, time, threading
 
@@ -155,11 +176,7 @@ def fishing_minigame(state) -> None:
     # Fallback: if the player has any rod in inventory but hasn't equipped one,
     # just pick the first one found. You may want a proper equip flow later.
     if rod_name is None:
-        rod_items = [
-            i.name
-            for i in state.inventory.items
-            if ITEMS.get(i.name, {}).get("rod_width") is not None
-        ]
+        rod_items = [i.name for i in state.inventory.get_by_type("tool") if i.name in RODS]
         if not rod_items:
             clear()
             print_color("You don't have a fishing rod.", 255, 100, 100)
@@ -177,7 +194,7 @@ def fishing_minigame(state) -> None:
         print_color("=== FISHING ===", 50, 180, 255)
         print()
 
-        bait_items = [i for i in state.inventory.items if i.item_type == "bait"]
+        bait_items = state.inventory.get_by_type("bait")
 
         if not bait_items:
             print_color("You have no bait.", 200, 200, 200)
@@ -188,7 +205,7 @@ def fishing_minigame(state) -> None:
         print("Choose bait:")
         print()
         bait_options = [
-            f"{b.name} x{b.count}  —  {ITEMS[b.name]['description']}"
+            f"{b.name} x{b.count}  —  {b.description}"
             for b in bait_items
         ]
         bait_options.append("Leave")
@@ -198,21 +215,11 @@ def fishing_minigame(state) -> None:
             return
 
         chosen_bait = bait_items[choice - 1]
-        bait_affinity = ITEMS[chosen_bait.name].get("affinity", [])
         break
 
     # Roll a fish (affinity fish 3× more likely)
-    all_fish = {
-        name: data for name, data in ITEMS.items() if data.get("type") == "fish"
-    }
-
-    pool = []
-    for name, data in all_fish.items():
-        weight = 3 if name in bait_affinity else 1
-        pool.extend([name] * weight)
-
-    fish_name = random.choice(pool)
-    fish_data = all_fish[fish_name]
+    fish_name = fish_table(chosen_bait.name).sample()
+    fish_data = ITEMS[fish_name]
     difficulty = fish_data["difficulty"]  # 0.0–1.0
 
     clear()
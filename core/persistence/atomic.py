@@ -0,0 +1,106 @@
+"""
+core/persistence/atomic.py - Crash-safe file writes.
+
+A save is written to a temp file next to the destination, fsynced, then
+renamed over the original, so the file on disk is always either the old
+save or the new one, never half of each. The previous generation is kept as
+<file>.bak and used automatically if the primary ever fails to parse.
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, Tuple
+
+
+def backup_path(path: Path) -> Path:
+    return path.with_name(path.name + ".bak")
+
+
+def _current_umask() -> int:
+    # Only readable by setting it; put it straight back
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _current_umask()
+
+
+def _file_mode(path: Path) -> int:
+    """path's current mode, or the one a plain open() would give a new file."""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_dir(directory: Path) -> None:
+    # Makes the rename itself durable. Not supported on Windows; skip there.
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path: Path, text: str, keep_backup: bool = True) -> None:
+    """Write text to path via temp file + fsync + rename."""
+    atomic_write_bytes(path, text.encode("utf-8"), keep_backup)
+
+
+def atomic_write_bytes(path: Path, data: bytes, keep_backup: bool = True) -> None:
+    """Write bytes to path via temp file + fsync + rename."""
+    atomic_write_chunks(path, (data,), keep_backup)
+
+
+def atomic_write_chunks(
+    path: Path, chunks: Iterable[bytes], keep_backup: bool = True
+) -> None:
+    """Like atomic_write_bytes, writing chunks as they are produced."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # mkstemp makes the file private (0600); the rename would keep that
+            os.chmod(tmp_name, _file_mode(path))
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Roll the current save into .bak. If we die between these two
+        # renames, load() finds no primary and falls back to the .bak.
+        if keep_backup and path.exists():
+            os.replace(path, backup_path(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    _fsync_dir(path.parent)
+
+
+def read_with_backup(path: Path, load: Callable[[Path], dict]) -> Tuple[dict, bool]:
+    """
+    Read a save with load(path), falling back to load(<path>.bak) if the
+    primary is missing or corrupt.
+
+    Returns (data, used_backup). Raises the original error if neither file
+    can be read.
+    """
+    try:
+        return load(path), False
+    except (OSError, ValueError) as primary_error:
+        bak = backup_path(path)
+        if not bak.exists():
+            raise primary_error
+        return load(bak), True
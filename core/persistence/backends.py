@@ -0,0 +1,431 @@
+"""
+core/persistence/backends.py - Where saves actually live.
+
+Both backends take saves as pre-encoded fields (see encoding.py) plus a
+small meta dict (name, class, level, location, gold, playtime, mtime), and
+are addressed by save name:
+
+  JsonBackend    saves/<name>.json files (or compact saves/<name>.sav, see
+                 codec.py, or compressed saves/<name>.jsonz, see
+                 compression.py), written atomically with a .bak
+                 generation, optional delta journal, and saves/index.json.
+  SqliteBackend  one WAL-mode SQLite database with the meta fields as
+                 indexed columns, optionally compressing the save data.
+                 Meant for hosting many characters.
+
+write()/read()/delete()/rename()/list() are the whole interface;
+batch() groups several writes into one transaction where that means
+anything, and flush() writes out anything a backend held back.
+"""
+
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.persistence import codec, compression, journal
+from core.persistence.atomic import (
+    atomic_write_bytes,
+    atomic_write_chunks,
+    atomic_write_text,
+    backup_path,
+    read_with_backup,
+)
+from core.persistence.encoding import encode_fields, join_fields
+from core.persistence.index import (
+    META_KEY,
+    SAVE_SUFFIXES,
+    SaveIndex,
+    is_save_file,
+    with_header,
+)
+
+
+def read_save_file(path: Path) -> dict:
+    """Decode a save file in any format: JSON, binary or compressed."""
+    with open(path, "rb") as f:
+        head = f.read(16)
+        f.seek(0)
+        if compression.detect(head):
+            return compression.decode_stream(f)
+        return codec.decode_save(f.read())
+
+
+# region JSON
+
+
+class JsonBackend:
+    def __init__(
+        self,
+        saves_dir: str = "saves",
+        use_journal: bool = False,
+        binary: bool = False,
+        compression: Optional[str] = None,
+    ):
+        """compression is None, "zlib" or "lzma"; it can't be combined with binary."""
+        if binary and compression:
+            raise ValueError("Binary saves can't also be compressed")
+        self.saves_dir = Path(saves_dir)
+        self.use_journal = use_journal
+        self.binary = binary
+        self.compression = compression
+        self.index = SaveIndex(self.saves_dir)
+        self._index_checked = False
+
+    def path_for(self, name: str) -> Path:
+        """Where name is written in the configured format."""
+        if self.binary:
+            return self.saves_dir / f"{name}.sav"
+        if self.compression:
+            return self.saves_dir / f"{name}.jsonz"
+        return self.saves_dir / f"{name}.json"
+
+    def _existing_path(self, name: str) -> Path:
+        # Saves written before a format switch keep working until rewritten
+        preferred = self.path_for(name)
+        for path in [preferred] + self._other_paths(name):
+            if path.exists() or backup_path(path).exists():
+                return path
+        return preferred
+
+    def _other_paths(self, name: str) -> List[Path]:
+        preferred = self.path_for(name)
+        return [
+            self.saves_dir / f"{name}{suffix}"
+            for suffix in SAVE_SUFFIXES
+            if suffix != preferred.suffix
+        ]
+
+    def write(
+        self,
+        name: str,
+        fields: Dict[str, str],
+        meta: dict,
+        previous: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """
+        Write a save. previous is what the caller last wrote for name; in
+        journal mode only the fields that differ from it get appended.
+        """
+        path = self.path_for(name)
+        self._ensure_index()
+        if self.use_journal and previous is not None:
+            delta = {k: v for k, v in fields.items() if previous.get(k) != v}
+            size = journal.append_delta(path, join_fields(delta))
+            if size < journal.COMPACT_THRESHOLD_BYTES:
+                # index.json is rewritten whole, so appends leave it to flush()
+                self.index.update(path, meta, flush=False)
+                return
+
+        if self.binary:
+            data = json.loads(join_fields(fields))
+            atomic_write_bytes(path, codec.encode_binary(data, meta))
+        elif self.compression:
+            pieces = compression.iter_save_lines(fields, meta)
+            atomic_write_chunks(path, compression.compress(pieces, self.compression))
+        else:
+            atomic_write_text(path, with_header(join_fields(fields), meta))
+        # The snapshot now holds everything the log did
+        journal.clear_log(path)
+        self._remove_other_formats(name)
+        self.index.update(path, meta)
+
+    def _remove_other_formats(self, name: str) -> None:
+        for path in self._other_paths(name):
+            for p in (path, backup_path(path)):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+            self.index.remove(path)
+
+    def read(self, name: str, repair: bool = False) -> Tuple[dict, dict, bool]:
+        """
+        Returns (data, meta, used_backup). With repair=True a damaged primary
+        is moved aside as .corrupt so the next write doesn't roll it into .bak
+        over the good copy, and its journal as .log.stale, since the deltas
+        in it don't apply to the .bak.
+        """
+        path = self._existing_path(name)
+        if not path.exists() and not backup_path(path).exists():
+            raise FileNotFoundError("Save file not found")
+
+        # The format is detected from the file contents, not the suffix
+        data, used_backup = read_with_backup(path, read_save_file)
+        if used_backup and repair:
+            if path.exists():
+                os.replace(path, path.with_name(path.name + ".corrupt"))
+            journal.set_aside(path)
+        meta = data.pop(META_KEY, {})
+        # Apply any deltas appended since the last snapshot. They were
+        # written against the primary, so a .bak never gets them.
+        if not used_backup:
+            journal.replay(path, data)
+        return data, meta, used_backup
+
+    def delete(self, name: str) -> None:
+        self._ensure_index()
+        journal.clear_log(self.path_for(name))
+        for path in [self.path_for(name)] + self._other_paths(name):
+            for p in (path, backup_path(path)):
+                try:
+                    os.remove(p)
+                except FileNotFoundError:
+                    pass
+            self.index.remove(path)
+
+    def rename(self, old: str, new: str) -> None:
+        old_path = self._existing_path(old)
+        new_path = self.saves_dir / f"{new}{old_path.suffix}"
+        if not old_path.exists():
+            return
+        self._ensure_index()
+        self.delete(new)
+        for src, dst in (
+            (old_path, new_path),
+            (backup_path(old_path), backup_path(new_path)),
+            (journal.log_path(old_path), journal.log_path(new_path)),
+        ):
+            if src.exists():
+                os.replace(src, dst)
+        meta = self.index.entries.get(old_path.name)
+        self.index.remove(old_path)
+        if meta is not None:
+            self.index.update(new_path, dict(meta, name=new))
+
+    def names(self) -> List[str]:
+        return sorted({p.stem for p in self.saves_dir.glob("*") if is_save_file(p)})
+
+    def list(self) -> List[dict]:
+        """Save summaries, most recently saved first."""
+        self._ensure_index()
+        return [
+            dict(entry, key=Path(entry["file"]).stem)
+            for entry in self.index.sorted_entries()
+        ]
+
+    def _ensure_index(self) -> None:
+        # Build the whole index once before the first incremental update,
+        # otherwise it would only ever list saves written since.
+        if self._index_checked:
+            return
+        self._index_checked = True
+        if not self.index.exists():
+            self.index.rebuild(self._meta_from_full_read)
+        else:
+            self.index.refresh_stale(self._meta_from_full_read)
+
+    def _meta_from_full_read(self, path: Path) -> dict:
+        from core.state import GameState
+
+        return GameState.from_dict(self.read(path.stem)[0], lazy=True).save_meta()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        # Every file write is already its own atomic unit
+        yield
+
+    def flush(self) -> None:
+        self.index.flush()
+
+
+# endregion
+
+# region SQLite
+
+
+class SqliteBackend:
+    def __init__(
+        self, db_path: str = "saves/venture.db", compression: Optional[str] = None
+    ):
+        """
+        compression is None, "zlib" or "lzma". Rows written without it stay
+        readable after turning it on, and the other way round.
+        """
+        self.db_path = Path(db_path)
+        self.compression = compression
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Writes come from the save manager's timer thread as well as the
+        # main thread; the manager serialises them, this lock covers reads.
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS saves (
+                name TEXT PRIMARY KEY,
+                player_class TEXT,
+                level INTEGER,
+                location TEXT,
+                gold INTEGER,
+                playtime INTEGER,
+                mtime REAL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS saves_level ON saves(level);
+            CREATE INDEX IF NOT EXISTS saves_location ON saves(location);
+            """
+        )
+
+    def write(
+        self,
+        name: str,
+        fields: Dict[str, str],
+        meta: dict,
+        previous: Optional[Dict[str, str]] = None,
+    ) -> None:
+        with self._lock, self.batch():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO saves VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    meta.get("class"),
+                    meta.get("level"),
+                    meta.get("location"),
+                    meta.get("gold"),
+                    meta.get("playtime"),
+                    meta.get("mtime"),
+                    self._encode(fields, meta),
+                ),
+            )
+
+    def read(self, name: str, repair: bool = False) -> Tuple[dict, dict, bool]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, playtime FROM saves WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError("Save not found")
+        return self._decode(row[0]), {"playtime": row[1] or 0}, False
+
+    def _encode(self, fields: Dict[str, str], meta: dict):
+        if not self.compression:
+            return join_fields(fields)
+        pieces = compression.iter_save_lines(fields, meta)
+        return b"".join(compression.compress(pieces, self.compression))
+
+    @staticmethod
+    def _decode(stored) -> dict:
+        # Compressed rows are BLOBs, plain ones TEXT
+        if isinstance(stored, bytes):
+            data = compression.decode_stream(io.BytesIO(stored))
+            data.pop(META_KEY, None)
+            return data
+        return json.loads(stored)
+
+    def delete(self, name: str) -> None:
+        with self._lock, self.batch():
+            self._conn.execute("DELETE FROM saves WHERE name = ?", (name,))
+
+    def rename(self, old: str, new: str) -> None:
+        with self._lock, self.batch():
+            exists = self._conn.execute(
+                "SELECT 1 FROM saves WHERE name = ?", (old,)
+            ).fetchone()
+            if exists is None:
+                return
+            self._conn.execute("DELETE FROM saves WHERE name = ?", (new,))
+            self._conn.execute(
+                "UPDATE saves SET name = ? WHERE name = ?", (new, old)
+            )
+
+    def names(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM saves ORDER BY name")
+            return [r[0] for r in rows]
+
+    def list(self) -> List[dict]:
+        """Save summaries, most recently saved first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, player_class, level, location, gold, playtime, mtime"
+                " FROM saves ORDER BY mtime DESC"
+            ).fetchall()
+        return [
+            {
+                "key": r[0],
+                "name": r[0],
+                "class": r[1],
+                "level": r[2],
+                "location": r[3],
+                "gold": r[4],
+                "playtime": r[5] or 0,
+                "mtime": r[6],
+            }
+            for r in rows
+        ]
+
+    def find(self, level: int = None, location: str = None) -> List[str]:
+        """Save names by level and/or location (both indexed)."""
+        clauses, args = [], []
+        if level is not None:
+            clauses.append("level = ?")
+            args.append(level)
+        if location is not None:
+            clauses.append("location = ?")
+            args.append(location)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT name FROM saves{where}", args)
+            return [r[0] for r in rows]
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group writes into one transaction. Nested batches join the outer one."""
+        with self._lock:
+            if self._batch_depth == 0:
+                self._conn.execute("BEGIN")
+            self._batch_depth += 1
+            try:
+                yield
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._conn.execute("COMMIT")
+
+    def flush(self) -> None:
+        # Every write is already committed
+        pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# endregion
+
+
+def import_json_saves(source: JsonBackend, target, batch_size: int = 500) -> int:
+    """
+    Copy every save from a JSON backend into another backend, batch_size
+    saves per transaction. Returns how many were imported.
+    """
+    names = source.names()
+    for start in range(0, len(names), batch_size):
+        with target.batch():
+            for name in names[start : start + batch_size]:
+                data, header, _ = source.read(name)
+                meta = {
+                    "name": data.get("name", name),
+                    "class": data.get("player_class"),
+                    "level": data.get("level", 1),
+                    "location": data.get("location", "Start"),
+                    "gold": data.get("gold", 0),
+                    "playtime": header.get("playtime", 0),
+                    "mtime": header.get("mtime") or time.time(),
+                }
+                target.write(name, encode_fields(data), meta)
+    return len(names)
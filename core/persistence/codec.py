@@ -0,0 +1,140 @@
+"""
+core/persistence/codec.py - Compact binary save format.
+
+Layout: MAGIC, one schema-version byte, then a marshal payload of
+
+    (meta, strings, values, extras)
+
+  strings  every item/quest/journal id used by the save, each stored once;
+           everything below refers to them by position
+  values   GameState fields in FIELD_ORDER, so no key names are stored.
+           Inventory entries are (string id, count), like the JSON
+           format's. Quests are (string id, stage, completed).
+  extras   any field not in FIELD_ORDER (e.g. flags set by dialogue)
+
+New fields are only ever appended to FIELD_ORDER, with a SCHEMA_VERSION
+bump; an older save's values are the FIELD_ORDER prefix its schema had
+(see _FIELD_COUNTS), and whatever it kept in extras still comes back.
+
+decode_save() accepts both this and the JSON format, so loading never has
+to be told which one a file uses.
+"""
+
+import json
+import marshal
+from typing import Dict, List
+
+MAGIC = b"VSAV"
+SCHEMA_VERSION = 2
+
+FIELD_ORDER = (
+    "name",
+    "player_color",
+    "location",
+    "health",
+    "max_health",
+    "mana",
+    "max_mana",
+    "stamina",
+    "max_stamina",
+    "gold",
+    "inventory",
+    "level",
+    "xp",
+    "next_level",
+    "player_class",
+    "race",
+    "npc_met",
+    "npc_topics_asked",
+    "locations_visited",
+    "wilson_employee",
+    "wilson_room_access",
+    "equipped_weapon",
+    "equipped_armor",
+    "equipped_rod",
+    "active_quests",
+    "completed_quests",
+    "active_effects",
+    "journal_entries",
+    # Schema 2
+    "celeste_declined",
+    "rat_quest_triggered",
+    "save_version",
+)
+
+# Schema version -> how many FIELD_ORDER fields its values hold
+_FIELD_COUNTS = {1: 28, 2: len(FIELD_ORDER)}
+
+# Fields that are lists of ids
+_ID_LISTS = ("completed_quests", "journal_entries")
+
+
+def is_binary(raw: bytes) -> bool:
+    return raw[: len(MAGIC)] == MAGIC
+
+
+def encode_binary(data: dict, meta: dict) -> bytes:
+    strings: List[str] = []
+    ids: Dict[str, int] = {}
+
+    def intern(s: str) -> int:
+        if s not in ids:
+            ids[s] = len(strings)
+            strings.append(s)
+        return ids[s]
+
+    values = []
+    for field in FIELD_ORDER:
+        value = data.get(field)
+        if field == "inventory":
+            value = tuple((intern(i["name"]), i["count"]) for i in value or ())
+        elif field == "active_quests":
+            value = tuple(
+                (intern(q["quest_id"]), q["current_stage"], q["completed"])
+                for q in value or ()
+            )
+        elif field in _ID_LISTS:
+            value = tuple(intern(s) for s in value or ())
+        values.append(value)
+
+    extras = {k: v for k, v in data.items() if k not in FIELD_ORDER}
+    payload = (meta, tuple(strings), tuple(values), extras)
+    return MAGIC + bytes([SCHEMA_VERSION]) + marshal.dumps(payload)
+
+
+def decode_binary(raw: bytes) -> dict:
+    if len(raw) <= len(MAGIC):
+        raise ValueError("Truncated save")
+    version = raw[len(MAGIC)]
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"Save uses a newer format (v{version})")
+    if version not in _FIELD_COUNTS:
+        raise ValueError(f"Corrupt save: unknown format v{version}")
+    fields = FIELD_ORDER[: _FIELD_COUNTS[version]]
+    try:
+        meta, strings, values, extras = marshal.loads(raw[len(MAGIC) + 1 :])
+    except (EOFError, TypeError) as e:
+        # Callers only need to handle ValueError, as for broken JSON
+        raise ValueError(f"Corrupt save: {e}") from e
+
+    data = {"_meta": meta}
+    for field, value in zip(fields, values):
+        if field == "inventory":
+            value = [{"name": strings[i], "count": count} for i, count in value]
+        elif field == "active_quests":
+            value = [
+                {"quest_id": strings[i], "current_stage": stage, "completed": done}
+                for i, stage, done in value
+            ]
+        elif field in _ID_LISTS:
+            value = [strings[i] for i in value]
+        data[field] = value
+    data.update(extras)
+    return data
+
+
+def decode_save(raw: bytes) -> dict:
+    """Decode either format. The JSON format's header comes back as "_meta"."""
+    if is_binary(raw):
+        return decode_binary(raw)
+    return json.loads(raw.decode("utf-8"))
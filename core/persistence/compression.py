@@ -0,0 +1,113 @@
+"""
+core/persistence/compression.py - Compressed saves, encoded and decoded as
+a stream.
+
+A compressed save is the usual JSON save text laid out one field per line:
+
+    {"_meta": {"name": "Anon", ...}
+    ,"name": "Anon"
+    ,"gold": 42
+    }
+
+fed through zlib or lzma piece by piece. Neither side ever holds the whole
+text: writing compresses each line as it is produced, and reading
+decompresses a chunk at a time and parses each field line as soon as it is
+complete. Which algorithm a file uses is detected from its first bytes.
+"""
+
+import json
+import lzma
+import zlib
+from typing import BinaryIO, Dict, Iterable, Iterator, Optional
+
+from core.persistence.index import META_KEY
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# name -> (compressor factory, decompressor factory, magic bytes)
+ALGORITHMS: Dict[str, tuple] = {
+    "zlib": (
+        lambda: zlib.compressobj(6),
+        zlib.decompressobj,
+        (b"\x78\x01", b"\x78\x5e", b"\x78\x9c", b"\x78\xda"),
+    ),
+    "lzma": (
+        lambda: lzma.LZMACompressor(lzma.FORMAT_XZ),
+        lzma.LZMADecompressor,
+        (b"\xfd7zXZ\x00",),
+    ),
+}
+
+
+def detect(head: bytes) -> str:
+    """Algorithm name for a file starting with head, or "" if uncompressed."""
+    for name, (_, _, magics) in ALGORITHMS.items():
+        if head.startswith(magics):
+            return name
+    return ""
+
+
+def iter_save_lines(fields: Dict[str, str], meta: dict) -> Iterator[str]:
+    """The save text, one pre-encoded field per line (see encoding.py)."""
+    yield "{" + json.dumps(META_KEY) + ": " + json.dumps(meta)
+    for key, value in fields.items():
+        yield "\n," + json.dumps(key) + ": " + value
+    yield "\n}"
+
+
+def compress(pieces: Iterable[str], algorithm: str) -> Iterator[bytes]:
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown compression: {algorithm}")
+    compressor = ALGORITHMS[algorithm][0]()
+    for piece in pieces:
+        out = compressor.compress(piece.encode("utf-8"))
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _decompressed_lines(f: BinaryIO) -> Iterator[str]:
+    head = f.read(READ_CHUNK_SIZE)
+    algorithm = detect(head)
+    if not algorithm:
+        raise ValueError("Not a compressed save")
+    decompressor = ALGORITHMS[algorithm][1]()
+
+    pending = b""
+    chunk = head
+    while chunk:
+        try:
+            pending += decompressor.decompress(chunk)
+        except (zlib.error, lzma.LZMAError) as e:
+            raise ValueError(f"Corrupt compressed save: {e}") from e
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8")
+        chunk = f.read(READ_CHUNK_SIZE)
+    if not decompressor.eof:
+        raise ValueError("Compressed save is truncated")
+    yield pending.decode("utf-8")
+
+
+def _parse_line(line: str) -> dict:
+    # `{"key": value` on the first line, `,"key": value` after that. Encoded
+    # values never contain a raw newline, so a line is always one field.
+    return json.loads("{" + line[1:] + "}")
+
+
+def decode_stream(f: BinaryIO) -> dict:
+    """
+    Decode a compressed save from an open binary file. The header comes back
+    as "_meta", as for the other formats.
+    """
+    data = {}
+    for line in _decompressed_lines(f):
+        if line == "}":
+            return data
+        data.update(_parse_line(line))
+    raise ValueError("Compressed save is incomplete")
+
+
+def read_meta(f: BinaryIO) -> Optional[dict]:
+    """Decompress only as far as the header line."""
+    return _parse_line(next(_decompressed_lines(f))).get(META_KEY)
@@ -0,0 +1,17 @@
+"""
+core/persistence/encoding.py - Per-field JSON encoding shared by the
+manager (for dirty checks) and the backends (for writing).
+"""
+
+import json
+from typing import Dict
+
+
+def encode_fields(data: dict) -> Dict[str, str]:
+    """Encode every field to its JSON text so fields can be compared cheaply."""
+    return {key: json.dumps(value) for key, value in data.items()}
+
+
+def join_fields(fields: Dict[str, str]) -> str:
+    """Stitch pre-encoded fields back into one JSON object."""
+    return "{" + ", ".join(f"{json.dumps(k)}: {v}" for k, v in fields.items()) + "}"
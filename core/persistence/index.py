@@ -0,0 +1,160 @@
+"""
+core/persistence/index.py - saves/index.json catalog for the Load Game menu.
+
+Every save starts with a one-line metadata header:
+
+    {"_meta": {"name": "Anon", "class": "Paladin", "level": 1, ...},
+    "name": "Anon", ...}
+
+The manager updates index.json from that header each time it writes a
+snapshot, so listing saves never has to open (let alone parse) the saves
+themselves. Journal appends only update the index in memory; it reaches
+disk with the next snapshot or flush(), and entries left stale by a crash
+in between are re-read from the save (see refresh_stale). If the index goes
+missing it can be rebuilt from the headers alone. Binary saves (see
+codec.py) carry the same meta dict at the front of their payload, and
+compressed ones (see compression.py) start with the same header line.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from core.persistence import codec, journal
+from core.persistence.atomic import atomic_write_text
+
+INDEX_NAME = "index.json"
+SAVE_SUFFIXES = (".json", ".sav", ".jsonz")
+META_KEY = "_meta"
+_HEADER_PREFIX = '{"' + META_KEY + '": '
+
+
+def with_header(body: str, meta: dict) -> str:
+    """Prefix an encoded JSON object with the metadata header line."""
+    return f"{_HEADER_PREFIX}{json.dumps(meta)},\n{body[1:]}"
+
+
+def read_meta(path: Path) -> Optional[dict]:
+    """Read only the header line of a save. None if it has no header."""
+    from core.persistence import compression
+
+    try:
+        with open(path, "rb") as f:
+            head = f.read(16)
+            f.seek(0)
+            if codec.is_binary(head):
+                return codec.decode_save(f.read()).get(META_KEY)
+            if compression.detect(head):
+                return compression.read_meta(f)
+            first = f.readline().decode("utf-8").rstrip()
+    except (OSError, ValueError):
+        return None
+    if not first.startswith(_HEADER_PREFIX) or not first.endswith(","):
+        return None
+    try:
+        return json.loads(first[len(_HEADER_PREFIX) : -1])
+    except json.JSONDecodeError:
+        return None
+
+
+def is_save_file(path: Path) -> bool:
+    return path.suffix in SAVE_SUFFIXES and path.name != INDEX_NAME
+
+
+class SaveIndex:
+    def __init__(self, saves_dir: Path):
+        self.path = saves_dir / INDEX_NAME
+        self._entries: Optional[Dict[str, dict]] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, dict]:
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def update(self, save_path: Path, meta: dict, flush: bool = True) -> None:
+        """With flush=False the change waits in memory for the next write."""
+        self.entries[save_path.name] = dict(meta, file=save_path.name)
+        if flush:
+            self._write()
+        else:
+            self._dirty = True
+
+    def flush(self) -> None:
+        if self._dirty:
+            self._write()
+
+    def remove(self, save_path: Path) -> None:
+        if self.entries.pop(save_path.name, None) is not None:
+            self._write()
+
+    def sorted_entries(self) -> List[dict]:
+        """Most recently saved first."""
+        return sorted(
+            self.entries.values(), key=lambda e: e.get("mtime", 0), reverse=True
+        )
+
+    def rebuild(self, fallback: Callable[[Path], dict]) -> None:
+        """
+        Recreate the index from save headers. fallback(path) is used for
+        saves with no header, or with journal deltas newer than the header.
+        """
+        entries = {}
+        for path in sorted(self.path.parent.glob("*")):
+            if not is_save_file(path):
+                continue
+            meta = None
+            if not journal.log_path(path).exists():
+                meta = read_meta(path)
+            if meta is None:
+                try:
+                    meta = fallback(path)
+                except (OSError, ValueError):
+                    continue
+                meta["mtime"] = path.stat().st_mtime
+            entries[path.name] = dict(meta, file=path.name)
+        self._entries = entries
+        self._write()
+
+    def refresh_stale(self, fallback: Callable[[Path], dict]) -> None:
+        """
+        Re-read the entries of saves whose journal changed after index.json
+        was last written, i.e. appends that never got flushed.
+        """
+        try:
+            written = self.path.stat().st_mtime
+        except OSError:
+            return
+        for name in list(self.entries):
+            save_path = self.path.parent / name
+            try:
+                appended = journal.log_path(save_path).stat().st_mtime
+            except OSError:
+                continue
+            if appended >= written:
+                try:
+                    meta = fallback(save_path)
+                except (OSError, ValueError):
+                    continue
+                self.entries[name] = dict(meta, mtime=appended, file=name)
+                self._dirty = True
+        self.flush()
+
+    def _write(self) -> None:
+        # Rebuildable, so no .bak generation for it
+        atomic_write_text(self.path, json.dumps(self.entries), keep_backup=False)
+        self._dirty = False
+
+
+def stamp(meta: dict) -> dict:
+    """Copy of meta with the write time filled in."""
+    return dict(meta, mtime=time.time())
@@ -0,0 +1,70 @@
+"""
+core/persistence/journal.py - Append-only log of save deltas.
+
+In journal mode a save only appends the fields that changed to
+saves/<name>.log, one JSON object per line:
+
+    {"gold": 42, "location": "Kimaer"}
+
+Loading reads the snapshot (saves/<name>.json) and replays the log on top.
+Once the log passes COMPACT_THRESHOLD_BYTES the manager writes a fresh
+snapshot and the log starts over. A crash mid-append can only tear the last
+line, which replay skips, so the save is never left half-written.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+COMPACT_THRESHOLD_BYTES = 64 * 1024
+
+
+def log_path(save_path: Path) -> Path:
+    return save_path.with_suffix(".log")
+
+
+def append_delta(save_path: Path, encoded_delta: str) -> int:
+    """Append one pre-encoded delta record. Returns the log size afterwards."""
+    with open(log_path(save_path), "a", encoding="utf-8") as f:
+        f.write(encoded_delta + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def clear_log(save_path: Path) -> None:
+    """Drop the log once its contents have been folded into a snapshot."""
+    try:
+        os.remove(log_path(save_path))
+    except FileNotFoundError:
+        pass
+
+
+def set_aside(save_path: Path) -> None:
+    """
+    Move the log out of the way as <name>.log.stale. For when the snapshot
+    it was written against is gone: its deltas can't go onto another one.
+    """
+    path = log_path(save_path)
+    if path.exists():
+        os.replace(path, path.with_name(path.name + ".stale"))
+
+
+def replay(save_path: Path, data: Dict) -> Dict:
+    """Apply every complete delta in the log to data (in place) and return it."""
+    path = log_path(save_path)
+    if not path.exists():
+        return data
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                delta = json.loads(line)
+            except json.JSONDecodeError:
+                break  # torn tail from a crash mid-append; nothing valid after it
+            data.update(delta)
+    return data
@@ -0,0 +1,140 @@
+"""
+core/persistence/manager.py - Dirty-tracked, debounced write-behind saving.
+
+GameState.save() gets called on nearly every scene entry, so instead of
+rewriting the save each time we:
+  1. Encode each field and compare it to what was last written. If nothing
+     changed, there's nothing to do.
+  2. Otherwise queue the snapshot and let a background timer write it once
+     per SAVE_DEBOUNCE_SECONDS window. Later saves in the same window just
+     replace the queued snapshot.
+  3. Flush whatever is queued synchronously on exit (atexit also runs after
+     an uncaught exception or Ctrl-C), along with anything the backend held
+     back, like the JSON backend's index after journal appends.
+
+Where the save goes is up to the backend (see backends.py), picked by
+SAVE_BACKEND. With JOURNAL_SAVES on, the JSON backend only appends the
+changed fields to a log instead of rewriting the file (see journal.py).
+SAVE_FORMAT = "binary" makes it write compact .sav files (see codec.py),
+SAVE_COMPRESSION compresses saves (see compression.py); every format loads
+regardless of the settings.
+"""
+
+import atexit
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from core.persistence.backends import JsonBackend, SqliteBackend
+from core.persistence.encoding import encode_fields
+from core.persistence.index import stamp
+
+SAVE_DEBOUNCE_SECONDS = 2.0
+SAVE_BACKEND = "json"  # "json" or "sqlite"
+SAVE_DB_PATH = "saves/venture.db"  # used by the sqlite backend
+JOURNAL_SAVES = False  # json backend: append deltas to saves/<name>.log
+SAVE_FORMAT = "json"  # json backend: "json" or "binary" (saves/<name>.sav)
+SAVE_COMPRESSION = None  # None, "zlib" or "lzma"; json format and sqlite only
+
+
+class SaveManager:
+    def __init__(self, backend=None, debounce: float = SAVE_DEBOUNCE_SECONDS):
+        self.backend = backend if backend is not None else JsonBackend()
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._written: Dict[str, Dict[str, str]] = {}  # last fields stored
+        # queued, not yet written: name -> (fields, meta)
+        self._pending: Dict[str, Tuple[Dict[str, str], dict]] = {}
+        self._timer: Optional[threading.Timer] = None
+
+    def request_save(self, name: str, data: dict, meta: dict = None) -> List[str]:
+        """
+        Queue data to be saved under name, with meta as its header/index
+        entry. meta isn't part of the dirty check, so e.g. playtime ticking up
+        alone never causes a write.
+
+        Returns the names of the fields that changed since the last write
+        (empty list if the save was a no-op).
+        """
+        fields = encode_fields(data)
+        with self._lock:
+            if name in self._pending:
+                previous = self._pending[name][0]
+            else:
+                previous = self._written.get(name, {})
+            dirty = [k for k, v in fields.items() if previous.get(k) != v]
+            dirty += [k for k in previous if k not in fields]
+            if not dirty:
+                return []
+
+            self._pending[name] = (fields, meta or {})
+            if self.debounce <= 0:
+                self._write_pending()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.debounce, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        return dirty
+
+    def mark_written(self, name: str, data: dict) -> None:
+        """Record data as already stored (e.g. right after loading it)."""
+        with self._lock:
+            self._written[name] = encode_fields(data)
+
+    def delete(self, name: str) -> None:
+        """Delete a save, including anything still queued for it."""
+        with self._lock:
+            self._pending.pop(name, None)
+            self._written.pop(name, None)
+            self.backend.delete(name)
+
+    def rename(self, old: str, new: str) -> None:
+        """Move a save to a new name, writing anything queued for it first."""
+        with self._lock:
+            self._write_pending()
+            self.backend.rename(old, new)
+            if old in self._written:
+                self._written[new] = self._written.pop(old)
+
+    def flush(self) -> None:
+        """Write everything queued right now, on the calling thread."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._write_pending()
+            self.backend.flush()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        # Caller must hold self._lock
+        if not self._pending:
+            return
+        with self.backend.batch():
+            while self._pending:
+                name, (fields, meta) = self._pending.popitem()
+                self.backend.write(name, fields, stamp(meta), self._written.get(name))
+                self._written[name] = fields
+
+
+_manager: Optional[SaveManager] = None
+
+
+def get_save_manager() -> SaveManager:
+    """Shared manager for the running game. Flushed automatically at exit."""
+    global _manager
+    if _manager is None:
+        if SAVE_BACKEND == "sqlite":
+            backend = SqliteBackend(SAVE_DB_PATH, compression=SAVE_COMPRESSION)
+        else:
+            backend = JsonBackend(
+                use_journal=JOURNAL_SAVES,
+                binary=SAVE_FORMAT == "binary",
+                compression=SAVE_COMPRESSION,
+            )
+        _manager = SaveManager(backend)
+        atexit.register(_manager.flush)
+    return _manager
@@ -0,0 +1,80 @@
+"""
+core/persistence/migrations.py - Upgrade old save data to the current shape.
+
+Every save carries a "save_version" field (missing means 0, i.e. written
+before versioning). migrate() runs the registered step for each version
+between the save's and SAVE_VERSION, in order. To change the save format:
+
+  1. Bump SAVE_VERSION.
+  2. Register a step that upgrades data from the previous version:
+
+        @migration(1)
+        def _rename_gold(data):
+            data["coins"] = data.pop("gold", 0)
+
+Steps get a shallow copy of the save, so replace nested lists/dicts rather
+than mutating them. Fields the game no longer has, and fields the save is
+missing, are handled by GameState.from_dict, not by migrations.
+"""
+
+from typing import Callable, Dict
+
+SAVE_VERSION = 1
+VERSION_KEY = "save_version"
+
+_MIGRATIONS: Dict[int, Callable[[dict], None]] = {}
+
+
+def migration(from_version: int):
+    """Register a step that upgrades data from from_version to the next."""
+
+    def register(step: Callable[[dict], None]) -> Callable[[dict], None]:
+        _MIGRATIONS[from_version] = step
+        return step
+
+    return register
+
+
+def save_version(data: dict) -> int:
+    return data.get(VERSION_KEY, 0)
+
+
+def needs_migration(data: dict) -> bool:
+    return save_version(data) != SAVE_VERSION
+
+
+def migrate(data: dict) -> dict:
+    """Return data upgraded to SAVE_VERSION. The input is left untouched."""
+    version = save_version(data)
+    if version > SAVE_VERSION:
+        raise ValueError(f"Save is from a newer version of the game (v{version})")
+
+    data = dict(data)
+    while version < SAVE_VERSION:
+        _MIGRATIONS[version](data)
+        version += 1
+    data[VERSION_KEY] = version
+    return data
+
+
+# region Steps
+
+
+@migration(0)
+def _unversioned(data: dict) -> None:
+    from data.items import ITEMS
+
+    # Inventory entries only need a name and count; type and value come from
+    # ITEMS. Items that no longer exist are dropped.
+    data["inventory"] = [
+        {"name": entry["name"], "count": entry.get("count", 1)}
+        for entry in data.get("inventory", [])
+        if entry.get("name") in ITEMS
+    ]
+    # Only quest dicts can be restored; drop anything else once, here
+    data["active_quests"] = [
+        q for q in data.get("active_quests", []) if isinstance(q, dict)
+    ]
+
+
+# endregion
@@ -1,8 +1,13 @@
-import json
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Container, Optional, List
+from core.checkpoint import Checkpoint
+from core.effects import ActiveEffects
 from core.inventory import Inventory
 from core.display import print_color
+from core.persistence.manager import get_save_manager
+from core.persistence.migrations import SAVE_VERSION, migrate
+from data.journal import Journal
 
 
 class GameState:
@@ -33,77 +38,250 @@ class GameState:
         self.equipped_rod: Optional[str] = None
         self.active_quests: List = []
         self.completed_quests: List[str] = []
-        self.active_effects: list = []
-        self.journal_entries: List[str] = []
+        self.active_effects: ActiveEffects = ActiveEffects()
+        self.journal_entries: Journal = Journal()
+        self.celeste_declined: bool = False
+        self.rat_quest_triggered: bool = False
+        self.save_version: int = SAVE_VERSION
+        # Playtime lives in the save header, not the state fields, so it
+        # ticking up never counts as a change on its own
+        self._playtime: float = 0.0
+        self._session_start: float = time.monotonic()
+        self._last_checkpoint: Optional[Checkpoint] = None
 
-    def save(self) -> None:
-        saves_dir = Path("saves")
-        saves_dir.mkdir(exist_ok=True)
-        save_path = saves_dir / f"{self.name}.json"
-        save_data = self.__dict__.copy()
+    @property
+    def playtime(self) -> float:
+        """Total seconds played, including this session."""
+        return self._playtime + time.monotonic() - self._session_start
+
+    def save_meta(self) -> dict:
+        """Summary written to the save header and saves/index.json."""
+        return {
+            "name": self.name,
+            "class": self.player_class.name if self.player_class else None,
+            "level": self.level,
+            "location": self.location,
+            "gold": self.gold,
+            "playtime": int(self.playtime),
+        }
+
+    def __getattr__(self, name: str):
+        # Only called when normal lookup fails: hydrate a field that a lazy
+        # read() left in its saved form.
+        lazy = self.__dict__.get("_lazy")
+        if lazy and name in lazy:
+            value = _HYDRATORS[name](lazy.pop(name))
+            setattr(self, name, value)
+            return value
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
 
-        if isinstance(self.player_class, PlayerClass):
+    def to_dict(self, skip: Container[str] = ()) -> dict:
+        """Convert to a JSON-ready dict for saving, leaving out skip."""
+        save_data = {
+            k: v
+            for k, v in self.__dict__.items()
+            if not k.startswith("_") and k not in skip
+        }
+        # Fields never touched since a lazy read are still in saved form
+        for k, v in self.__dict__.get("_lazy", {}).items():
+            if k not in skip:
+                save_data[k] = v
+
+        if isinstance(save_data.get("player_class"), PlayerClass):
             save_data["player_class"] = self.player_class.name
 
         # Convert inventory to dict
-        save_data["inventory"] = self.inventory.to_dict()
+        if isinstance(save_data.get("inventory"), Inventory):
+            save_data["inventory"] = self.inventory.to_dict()
 
         # Convert quests to dicts
-        save_data["active_quests"] = [q.to_dict() for q in self.active_quests]
+        if "active_quests" in save_data:
+            save_data["active_quests"] = [
+                q.to_dict() if not isinstance(q, dict) else q
+                for q in save_data["active_quests"]
+            ]
+
+        if isinstance(save_data.get("active_effects"), ActiveEffects):
+            save_data["active_effects"] = self.active_effects.to_list()
+        if isinstance(save_data.get("journal_entries"), Journal):
+            save_data["journal_entries"] = self.journal_entries.to_dict()
+        return save_data
 
-        save_data["active_effects"] = list(self.active_effects)
+    def _versions(self) -> dict:
+        """Change stamps of the hydrated containers (see core/checkpoint.py)."""
+        fields = self.__dict__
+        versions = {}
+        for key in ("inventory", "journal_entries", "active_effects"):
+            version = getattr(fields.get(key), "version", None)
+            if version is not None:
+                versions[key] = version
+        quests = fields.get("active_quests")
+        if isinstance(quests, list):
+            stamps = tuple(getattr(q, "version", None) for q in quests)
+            if None not in stamps:
+                versions["active_quests"] = stamps
+        return versions
 
-        with open(save_path, "w", encoding="utf-8") as f:
-            json.dump(save_data, f, indent=2)
-        print_color(f"Game saved to {save_path}", 50, 255, 50)
+    def checkpoint(self) -> Checkpoint:
+        """
+        Snapshot the state in memory (before a fight, a quest branch, a
+        minigame...) so restore() can roll back to it without touching the
+        disk. See core/checkpoint.py.
+        """
+        previous = self._last_checkpoint
+        versions = self._versions()
+        unchanged = previous.unchanged(versions) if previous else ()
+        self._last_checkpoint = Checkpoint.capture(
+            self.to_dict(skip=unchanged), previous, versions
+        )
+        return self._last_checkpoint
+
+    def restore(self, checkpoint: Checkpoint) -> None:
+        """Put every saved field back as it was when checkpoint was taken."""
+        # Everything comes back hydrated, so drop any lazily-held fields
+        self.__dict__.pop("_lazy", None)
+        for key, value in checkpoint.thaw().items():
+            setattr(self, key, value)
+
+        if isinstance(self.player_class, str):
+            self.player_class = CLASS_MAP.get(self.player_class, None)
+        for key, hydrate in _HYDRATORS.items():
+            setattr(self, key, hydrate(getattr(self, key)))
+
+    def save(self) -> None:
+        """
+        Queue a save. Only fields that changed since the last write are
+        considered dirty; if none are, nothing is written. Actual writes are
+        coalesced in the background (see core/persistence/manager.py).
+        """
+        if get_save_manager().request_save(
+            self.name, self.to_dict(), self.save_meta()
+        ):
+            print_color(f"Game saved as {self.name}", 50, 255, 50)
+
+    def flush(self) -> None:
+        """Write any queued save immediately."""
+        get_save_manager().flush()
+
+    @staticmethod
+    def save_name(file_path: str) -> str:
+        """Accepts "Name", "Name.json", "Name.sav" or "saves/Name.json"."""
+        path = Path(file_path.replace("\\", "/"))
+        return path.stem if path.suffix in (".json", ".sav") else path.name
+
+    @staticmethod
+    def read(file_path: str, lazy: bool = False) -> "GameState":
+        """
+        Load a save without writing anything, not even to repair a damaged
+        file. With lazy=True the inventory, quests and journal stay in their
+        saved form until first accessed, which keeps bulk scans cheap.
+        """
+        name = GameState.save_name(file_path)
+        data, meta, _ = get_save_manager().backend.read(name)
+        return GameState.from_dict(data, lazy=lazy, playtime=meta.get("playtime", 0))
 
     @staticmethod
     def load(file_path: str) -> "GameState":
-        # Add saves/ prefix if not already there
-        if not file_path.startswith("saves/") and not file_path.startswith("saves\\"):
-            file_path = f"saves/{file_path}"
+        """Load a save to play it. JSON and binary saves are told apart by content."""
+        name = GameState.save_name(file_path)
+        manager = get_save_manager()
 
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError("Save file not found")
+        data, meta, used_backup = manager.backend.read(name, repair=True)
+        if used_backup:
+            print_color(
+                f"{name} was damaged, restored from the previous save.", 255, 200, 50
+            )
+        else:
+            # Otherwise let the next save() repair the damaged primary
+            manager.mark_written(name, data)
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        return GameState.from_dict(data, playtime=meta.get("playtime", 0))
 
+    @staticmethod
+    def from_dict(data: dict, lazy: bool = False, playtime: float = 0) -> "GameState":
+        """
+        Build a state from save data, upgrading it to the current save
+        version first (see core/persistence/migrations.py). Fields missing
+        from the save keep their defaults; fields the game no longer has
+        are dropped.
+        """
+        data = migrate(data)
         state = GameState()
+        state._playtime = playtime
 
-        # Copy all properties from JSON to the new state object
         for key, value in data.items():
+            if key not in state.__dict__ or key.startswith("_"):
+                continue
+            if lazy and key in _HYDRATORS:
+                continue
             setattr(state, key, value)
 
         # Convert player_class string back to PlayerClass object
         if isinstance(state.player_class, str):
-            class_map = {
-                "Fighter": FIGHTER,
-                "Warlock": WARLOCK,
-                "Rogue": ROGUE,
-                "Paladin": PALADIN,
-                "Cleric": CLERIC,
-            }
-            state.player_class = class_map.get(state.player_class, None)
-
-        if isinstance(state.inventory, list):
-            state.inventory = Inventory.from_dict(state.inventory)
-
-        # Load quests
-        if isinstance(state.active_quests, list) and state.active_quests:
-            from quests.quests import Quest
-
-            loaded_quests = []
-            for quest_data in state.active_quests:
-                if isinstance(quest_data, dict):
-                    loaded_quests.append(Quest.from_dict(quest_data))
-            state.active_quests = loaded_quests
-
-        state.save()
+            state.player_class = CLASS_MAP.get(state.player_class, None)
+
+        if lazy:
+            state._lazy = {}
+            for key in _HYDRATORS:
+                if key in data:
+                    # Drop the default so __getattr__ gets a chance to hydrate
+                    delattr(state, key)
+                    state._lazy[key] = data[key]
+        else:
+            for key, hydrate in _HYDRATORS.items():
+                setattr(state, key, hydrate(getattr(state, key)))
+
         return state
 
 
+def _hydrate_inventory(raw) -> Inventory:
+    if isinstance(raw, list):
+        return Inventory.from_dict(raw)
+    return raw
+
+
+def _hydrate_quests(raw) -> list:
+    if not raw:
+        return raw
+    from quests.quests import Quest
+
+    return [Quest.from_dict(q) for q in raw if isinstance(q, dict)]
+
+
+def _hydrate_effects(raw) -> ActiveEffects:
+    if isinstance(raw, ActiveEffects):
+        return raw
+    return ActiveEffects(raw)
+
+
+def _hydrate_journal(raw) -> Journal:
+    if isinstance(raw, Journal):
+        return raw
+    return Journal.from_dict(raw)
+
+
+# Fields that lazy reads leave in saved form until first access
+_HYDRATORS = {
+    "inventory": _hydrate_inventory,
+    "active_quests": _hydrate_quests,
+    "journal_entries": _hydrate_journal,
+    "active_effects": _hydrate_effects,
+}
+
+
+def iter_saves(lazy: bool = True):
+    """Yield (name, state) for every save, read-only."""
+    for name in get_save_manager().backend.names():
+        yield name, GameState.read(name, lazy=lazy)
+
+
+def list_saves() -> List[dict]:
+    """Save summaries (see save_meta), most recent first."""
+    return get_save_manager().backend.list()
+
+
 class PlayerClass:
     def __init__(
         self,
@@ -183,4 +361,12 @@ CLERIC = PlayerClass(
     mana_mod=1.4,
     stamina_mod=0.0,
 )
+
+CLASS_MAP = {
+    "Fighter": FIGHTER,
+    "Warlock": WARLOCK,
+    "Rogue": ROGUE,
+    "Paladin": PALADIN,
+    "Cleric": CLERIC,
+}
 # endregion
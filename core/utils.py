@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, List
 import select as _select
 
 from core.state import GameState
-from data.journal import CATEGORY_LABELS, CATEGORY_ORDER, JOURNAL_ENTRIES
+from data.journal import CATEGORY_LABELS, JOURNAL_ENTRIES, search_journal
 from core.display import press_any_key, print_color, write_slow, flush_input, clear
 
 
@@ -24,7 +24,7 @@ def menu_choice(options: List[str], state=None) -> int:
 
     def _handle_hotkey(key, state):
         """Handle i/q hotkeys. Returns True if handled (location_router was called)."""
-        if key.lower() == "i" and state is not None and state.inventory.items:
+        if key.lower() == "i" and state is not None and state.inventory:
             from core.inventory import show_inventory_menu
 
             show_inventory_menu(state)
@@ -47,7 +47,7 @@ def menu_choice(options: List[str], state=None) -> int:
 
     hints = []
     if state is not None:
-        if state.inventory.items:
+        if state.inventory:
             hints.append("'i' for Inventory")
         if state.active_quests or state.completed_quests:
             hints.append("'q' for Quests")
@@ -221,50 +221,58 @@ def quick_time_event_countdown(duration: float) -> bool:
     return success
 
 
-def add_xp(state, amount: int) -> None:
+def gain_xp(state, amount: int) -> int:
     """
-    Add XP to the player, handle level-ups, and announce newly unlocked skills.
-    Call this any time XP is earned (combat, quests, etc).
+    Add XP and apply any level-ups, without announcing anything. Returns the
+    level the player was at before, for announce_xp.
     """
-    from data.skills import SPELLS, TECHNIQUES
-
     state.xp += amount
-    print_color(f"+{amount} XP", 100, 200, 255)
-
+    old_level = state.level
     while state.xp >= state.next_level:
         state.xp -= state.next_level
         state.level += 1
         state.next_level = int(state.next_level * 1.5)  # Scale XP requirement
+    return old_level
 
+
+def announce_xp(state, amount: int, old_level: int) -> None:
+    """Print the XP gain, any level-up and the skills it unlocked."""
+    from core.combat import get_skills_unlocked_between
+
+    print_color(f"+{amount} XP", 100, 200, 255)
+
+    if state.level > old_level:
         print_color(f"LEVEL UP! You are now level {state.level}!", 255, 255, 50)
 
-        # Check for newly unlocked skills
+        # Everything unlocked on the way, however many levels that was
         if state.player_class:
-            all_skills = {**SPELLS, **TECHNIQUES}
-            for skill_name, data in all_skills.items():
-                if (
-                    data["class"] == state.player_class.name
-                    and data.get("unlock_level") == state.level
-                ):
-                    # Pick color based on resource type
-                    if "mana_cost" in data:
-                        r, g, b = 180, 100, 255  # Purple for spells
-                    else:
-                        r, g, b = 255, 140, 0  # Orange for techniques
-
-                    cost_type = "MP" if "mana_cost" in data else "SP"
-                    cost_val = data.get("mana_cost", data.get("stamina_cost", 0))
-
-                    print_color(
-                        f"New skill unlocked: {skill_name} [{cost_val} {cost_type}] - {data['description']}",
-                        r,
-                        g,
-                        b,
-                    )
-                    print_color(
-                        f"  Use in combat via the Skills menu.", r - 40, g, b - 40
-                    )
+            for skill_name, data in get_skills_unlocked_between(
+                state.player_class.name, old_level, state.level
+            ):
+                # Pick color based on resource type
+                if "mana_cost" in data:
+                    r, g, b = 180, 100, 255  # Purple for spells
+                else:
+                    r, g, b = 255, 140, 0  # Orange for techniques
+
+                cost_type = "MP" if "mana_cost" in data else "SP"
+                cost_val = data.get("mana_cost", data.get("stamina_cost", 0))
+
+                print_color(
+                    f"New skill unlocked: {skill_name} [{cost_val} {cost_type}] - {data['description']}",
+                    r,
+                    g,
+                    b,
+                )
+                print_color(f"  Use in combat via the Skills menu.", r - 40, g, b - 40)
+
 
+def add_xp(state, amount: int) -> None:
+    """
+    Add XP to the player, handle level-ups, and announce newly unlocked skills.
+    Call this any time XP is earned (combat, quests, etc).
+    """
+    announce_xp(state, amount, gain_xp(state, amount))
     state.save()
 
 
@@ -407,38 +415,22 @@ def show_journal(state: GameState) -> None:
             press_any_key()
             return
 
-        # Collect unlocked entries grouped by subject
-        subjects = {}
-        for key in state.journal_entries:
-            entry = JOURNAL_ENTRIES.get(key)
-            if not entry:
-                continue
-            subj = entry.get("subject", key)
-            if subj not in subjects:
-                subjects[subj] = {"category": entry["category"], "entries": []}
-            subjects[subj]["entries"].append((key, entry))
-
-        for subj in subjects:
-            subjects[subj]["entries"].sort(key=lambda x: x[1].get("order", 0))
-
         # Only show categories that have unlocked entries
-        active_cats = [
-            c
-            for c in CATEGORY_ORDER
-            if any(d["category"] == c for d in subjects.values())
-        ]
+        active_cats = state.journal_entries.categories()
 
-        choice = menu_choice([CATEGORY_LABELS[c] for c in active_cats] + ["Close"])
-        if choice == len(active_cats) + 1:
+        choice = menu_choice(
+            [CATEGORY_LABELS[c] for c in active_cats] + ["Search", "Close"]
+        )
+        if choice == len(active_cats) + 2:
             return
+        if choice == len(active_cats) + 1:
+            _search_journal(state)
+            continue
 
         selected_cat = active_cats[choice - 1]
 
         # Drill into category
-        cat_subjects = sorted(
-            [(s, d) for s, d in subjects.items() if d["category"] == selected_cat],
-            key=lambda x: x[0],
-        )
+        cat_subjects = state.journal_entries.subjects(selected_cat)
 
         while True:
             clear()
@@ -446,13 +438,47 @@ def show_journal(state: GameState) -> None:
             print()
 
             choice2 = menu_choice(
-                [d["entries"][0][1]["title"] for _, d in cat_subjects] + ["Back"]
+                [entries[0][1]["title"] for _, entries in cat_subjects] + ["Back"]
             )
             if choice2 == len(cat_subjects) + 1:
                 break
 
-            _, data = cat_subjects[choice2 - 1]
-            _show_subject_entries(state, data["entries"])
+            _, entries = cat_subjects[choice2 - 1]
+            _show_subject_entries(state, entries)
+
+
+def _search_journal(state: GameState) -> None:
+    clear()
+    print_color("=== Search Journal ===", 255, 200, 100)
+    print()
+    query = input("Search for: ").strip()
+    if not query:
+        return
+
+    keys = search_journal(query, state.journal_entries)
+    while True:
+        clear()
+        print_color(f"=== Results for '{query}' ===", 255, 200, 100)
+        print()
+        if not keys:
+            print("Nothing in your journal matches that.")
+            print()
+            press_any_key()
+            return
+
+        choice = menu_choice([JOURNAL_ENTRIES[k]["title"] for k in keys] + ["Back"])
+        if choice == len(keys) + 1:
+            return
+        _show_entry(JOURNAL_ENTRIES[keys[choice - 1]])
+
+
+def _show_entry(entry: dict) -> None:
+    clear()
+    print_color(f"=== {entry['title']} ===", 255, 200, 100)
+    print()
+    print(entry["text"])
+    print()
+    press_any_key()
 
 
 def _show_subject_entries(state, entries):
@@ -467,13 +493,8 @@ def _show_subject_entries(state, entries):
         if choice == len(entries) + 1:
             return
 
-        key, entry = entries[choice - 1]
-        clear()
-        print_color(f"=== {entry['title']} ===", 255, 200, 100)
-        print()
-        print(entry["text"])
-        print()
-        press_any_key()
+        _, entry = entries[choice - 1]
+        _show_entry(entry)
 
 
 def location_router(state: GameState) -> None:
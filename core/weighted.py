@@ -0,0 +1,62 @@
+"""
+core/weighted.py - Weighted random choice in O(1) per roll.
+
+WeightedTable uses Vose's alias method: building the table is O(n), after
+which every sample is one random index plus one coin flip, however many
+outcomes there are. Build a table once per distribution (per bait, say)
+and keep it. Independent events, like an enemy's separate item drops,
+are better rolled one by one: a table of their combinations has 2^n
+outcomes.
+
+Every sample takes an optional rng, anything with a .random() method, so
+simulations can pass their own seeded random.Random and get the same rolls
+every run. Without one, the global random module is used.
+"""
+
+import random
+from typing import Generic, List, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class WeightedTable(Generic[T]):
+    __slots__ = ("outcomes", "_prob", "_alias")
+
+    def __init__(self, weighted: Sequence[Tuple[T, float]]):
+        """weighted is (outcome, weight) pairs; weights need not sum to 1."""
+        weighted = [(o, w) for o, w in weighted if w > 0]
+        if not weighted:
+            raise ValueError("WeightedTable needs at least one positive weight")
+
+        n = len(weighted)
+        total = sum(w for _, w in weighted)
+        self.outcomes: List[T] = [o for o, _ in weighted]
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+
+        # Scale so the average column is 1, then pair each short column with
+        # a tall one that tops it up
+        scaled = [w * n / total for _, w in weighted]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1 up to float error
+        for i in small + large:
+            self._prob[i] = 1.0
+
+    def __len__(self) -> int:
+        return len(self.outcomes)
+
+    def sample(self, rng=random) -> T:
+        # One draw picks the column and, from its fractional part, the coin
+        u = rng.random() * len(self._prob)
+        i = min(int(u), len(self._prob) - 1)
+        return self.outcomes[i if u - i < self._prob[i] else self._alias[i]]
+
+    def sample_many(self, k: int, rng=random) -> List[T]:
+        return [self.sample(rng) for _ in range(k)]
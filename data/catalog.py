@@ -0,0 +1,88 @@
+# catalog.py - Lookup tables over ITEMS, built once at import.
+#
+# ITEMS stays the source of truth; these are the questions the game keeps
+# asking of it (what's a fish, what does this shop buy, which fish like this
+# bait, what does the inventory show for this item) answered ahead of time
+# instead of by scanning every item.
+
+from typing import Dict, FrozenSet, Tuple
+
+from data.items import ITEMS
+
+
+def _build_by_type() -> Dict[str, Tuple[str, ...]]:
+    by_type: Dict[str, list] = {}
+    for name, data in ITEMS.items():
+        by_type.setdefault(data["type"], []).append(name)
+    return {t: tuple(names) for t, names in by_type.items()}
+
+
+def _build_sellable_to() -> Dict[str, FrozenSet[str]]:
+    vendors: Dict[str, set] = {}
+    for name, data in ITEMS.items():
+        for vendor in data.get("sellable_to", []):
+            vendors.setdefault(vendor, set()).add(name)
+    return {v: frozenset(names) for v, names in vendors.items()}
+
+
+def _build_fish_by_bait() -> Dict[str, FrozenSet[str]]:
+    # Affinity is listed on the fish ("likes Worm"), inverted here to
+    # "Worm attracts these fish"
+    baits: Dict[str, set] = {}
+    for name in BY_TYPE.get("fish", ()):
+        for bait in ITEMS[name].get("affinity", []):
+            baits.setdefault(bait, set()).add(name)
+    return {b: frozenset(names) for b, names in baits.items()}
+
+
+def _build_stat_lines() -> Dict[str, str]:
+    lines = {}
+    for name in BY_TYPE.get("weapon", ()):
+        if "damage" in ITEMS[name]:
+            lines[name] = f"Damage: {ITEMS[name]['damage']}"
+    for name in BY_TYPE.get("armor", ()):
+        if "defense" in ITEMS[name]:
+            lines[name] = f"Defense: {ITEMS[name]['defense']}"
+    return lines
+
+
+# Item type -> item names, in ITEMS order
+BY_TYPE = _build_by_type()
+
+# Shop type -> names of the items it will buy
+SELLABLE_TO = _build_sellable_to()
+
+# Every fish, and the fish each bait attracts
+FISH = BY_TYPE.get("fish", ())
+FISH_BY_BAIT = _build_fish_by_bait()
+
+# Tools by what they're for
+TOOLS_BY_CAPABILITY: Dict[str, FrozenSet[str]] = {
+    "fishing": frozenset(
+        name for name in BY_TYPE.get("tool", ()) if "rod_width" in ITEMS[name]
+    ),
+}
+RODS = TOOLS_BY_CAPABILITY["fishing"]
+
+# Weapon/armor -> the stat line the inventory menu shows under it
+STAT_LINES = _build_stat_lines()
+
+# Potion/food -> what consuming it restores ({"health": 25, ...})
+CONSUMABLE_EFFECTS: Dict[str, dict] = {
+    name: ITEMS[name].get("effect", {})
+    for item_type in ("potion", "food")
+    for name in BY_TYPE.get(item_type, ())
+}
+
+
+def items_of_type(item_type: str) -> Tuple[str, ...]:
+    return BY_TYPE.get(item_type, ())
+
+
+def sells_to(name: str, shop_type: str) -> bool:
+    """Whether a shop of shop_type will buy this item."""
+    return name in SELLABLE_TO.get(shop_type, ())
+
+
+def sell_price(name: str) -> int:
+    return ITEMS[name]["value"] // 2
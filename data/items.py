@@ -1,460 +1,6 @@
-ITEMS = {
-    # region Potions
-    "Health Potion": {
-        "type": "potion",
-        "value": 15,
-        "description": "Restores 25 health",
-        "effect": {"health": 25},
-        "sellable_to": [],
-    },
-    "Mana Potion": {
-        "type": "potion",
-        "value": 18,
-        "description": "Restores 30 mana",
-        "effect": {"mana": 30},
-        "sellable_to": [],
-    },
-    # region Weapons - Daggers
-    "Rusty Dagger": {
-        "type": "weapon",
-        "value": 10,
-        "description": "A dull, worn blade",
-        "damage": 3,
-        "sellable_to": ["blacksmith"],
-    },
-    "Bronze Dagger": {
-        "type": "weapon",
-        "value": 25,
-        "description": "A basic bronze knife",
-        "damage": 5,
-        "sellable_to": ["blacksmith"],
-    },
-    "Iron Dagger": {
-        "type": "weapon",
-        "value": 45,
-        "description": "Sharp and reliable",
-        "damage": 8,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Weapons - Swords
-    "Rusty Sword": {
-        "type": "weapon",
-        "value": 20,
-        "description": "Seen better days",
-        "damage": 6,
-        "sellable_to": ["blacksmith"],
-    },
-    "Iron Sword": {
-        "type": "weapon",
-        "value": 50,
-        "description": "A sturdy iron blade",
-        "damage": 10,
-        "sellable_to": ["blacksmith"],
-    },
-    "Steel Sword": {
-        "type": "weapon",
-        "value": 100,
-        "description": "Well-crafted and balanced",
-        "damage": 15,
-        "sellable_to": ["blacksmith"],
-    },
-    "Longsword": {
-        "type": "weapon",
-        "value": 180,
-        "description": "A blade for true warriors",
-        "damage": 22,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Weapons - Axes
-    "Hatchet": {
-        "type": "weapon",
-        "value": 30,
-        "description": "Small but effective",
-        "damage": 7,
-        "sellable_to": ["blacksmith"],
-    },
-    "Battle Axe": {
-        "type": "weapon",
-        "value": 120,
-        "description": "Heavy and devastating",
-        "damage": 18,
-        "sellable_to": ["blacksmith"],
-    },
-    "Great Axe": {
-        "type": "weapon",
-        "value": 200,
-        "description": "Massive two-handed destroyer",
-        "damage": 28,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Weapons - Blunt
-    "Wooden Club": {
-        "type": "weapon",
-        "value": 8,
-        "description": "Better than fists, barely",
-        "damage": 4,
-        "sellable_to": ["blacksmith"],
-    },
-    "Mace": {
-        "type": "weapon",
-        "value": 85,
-        "description": "Crushes armor effectively",
-        "damage": 14,
-        "sellable_to": ["blacksmith"],
-    },
-    "Warhammer": {
-        "type": "weapon",
-        "value": 160,
-        "description": "Pure devastating force",
-        "damage": 25,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Weapons - Spears
-    "Spear": {
-        "type": "weapon",
-        "value": 40,
-        "description": "Keep enemies at distance",
-        "damage": 9,
-        "sellable_to": ["blacksmith"],
-    },
-    "Pike": {
-        "type": "weapon",
-        "value": 90,
-        "description": "Long reach, deadly thrust",
-        "damage": 16,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Weapons - Special/Unique
-    "Rapier": {
-        "type": "weapon",
-        "value": 110,
-        "description": "Fast and precise",
-        "damage": 12,
-        "sellable_to": ["blacksmith"],
-    },
-    "Scimitar": {
-        "type": "weapon",
-        "value": 95,
-        "description": "Curved blade from distant lands",
-        "damage": 13,
-        "sellable_to": ["blacksmith"],
-    },
-    "Comically Large Spoon": {
-        "type": "weapon",
-        "value": 1000,
-        "description": "A comically large, flaming, golden spoon",
-        "damage": (-100, 100),
-        "sellable_to": [],
-    },
-    "Broken Broomstick": {
-        "type": "weapon",
-        "value": 0,
-        "description": "Roslin's old broom. Better than nothing",
-        "damage": 2,
-        "sellable_to": [],
-    },
-    # region Armor - Light
-    "Tattered Cloth": {
-        "type": "armor",
-        "value": 5,
-        "description": "Barely qualifies as armor",
-        "defense": 1,
-        "sellable_to": ["blacksmith"],
-    },
-    "Leather Armor": {
-        "type": "armor",
-        "value": 30,
-        "description": "Basic protection",
-        "defense": 5,
-        "sellable_to": ["blacksmith"],
-    },
-    "Studded Leather": {
-        "type": "armor",
-        "value": 60,
-        "description": "Reinforced with metal studs",
-        "defense": 8,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Armor - Medium
-    "Chainmail": {
-        "type": "armor",
-        "value": 100,
-        "description": "Interlocking metal rings",
-        "defense": 12,
-        "sellable_to": ["blacksmith"],
-    },
-    "Scale Mail": {
-        "type": "armor",
-        "value": 140,
-        "description": "Overlapping metal scales",
-        "defense": 15,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Armor - Heavy
-    "Plate Armor": {
-        "type": "armor",
-        "value": 250,
-        "description": "Full body protection",
-        "defense": 25,
-        "sellable_to": ["blacksmith"],
-    },
-    "Knight's Plate": {
-        "type": "armor",
-        "value": 400,
-        "description": "Masterwork full plate",
-        "defense": 35,
-        "sellable_to": ["blacksmith"],
-    },
-    # region Armor - Special
-    "Mystic Robe": {
-        "type": "armor",
-        "value": 180,
-        "description": "Enchanted fabric, light yet protective",
-        "defense": 10,
-        "sellable_to": [],
-    },
-    "Dragon Scale": {
-        "type": "armor",
-        "value": 800,
-        "description": "Scales from an ancient wyrm",
-        "defense": 50,
-        "sellable_to": [],
-    },
-    # region Tools
-    "Rope": {
-        "type": "tool",
-        "value": 8,
-        "description": "50 feet of sturdy rope",
-        "sellable_to": [],
-    },
-    # region Food
-    "Bread": {
-        "type": "food",
-        "value": 5,
-        "description": "A loaf of fresh bread",
-        "effect": {"health": 5},
-        "sellable_to": [],
-    },
-    "Kimaer Beer": {
-        "type": "potion",
-        "value": 12,
-        "description": "Beer from Kimaer",
-        "effect": {},
-        "sellable_to": [],
-    },
-    "Kimaer Wine": {
-        "type": "potion",
-        "value": 20,
-        "description": "Wine from Kimaer",
-        "effect": {},
-        "sellable_to": [],
-    },
-    # region Quest Items
-    "Ancient Scroll": {
-        "type": "quest",
-        "value": 0,
-        "description": "A mysterious scroll with strange writing",
-        "sellable_to": [],
-    },
-    # region Enemy Drops
-    "Rat Tail": {
-        "type": "ingredient",
-        "value": 1,
-        "description": "The tail from a meager creature",
-        "sellable_to": ["alchemy"],
-    },
-    "Goblin Ear": {
-        "type": "ingredient",
-        "value": 1,
-        "description": "An ear from a Wildkin goblin",
-        "sellable_to": ["alchemy"],
-    },
-    "Wolf Pelt": {
-        "type": "ingredient",
-        "value": 5,
-        "description": "The fur of a Wildkin",
-        "sellable_to": ["alchemy"],
-    },
-    "Bone": {
-        "type": "ingredient",
-        "value": 3,
-        "description": "Full of calcium, great for the Lactari",
-        "sellable_to": ["alchemy"],
-    },
-    # region Misc.
-    "Journal": {
-        "type": "journal",
-        "value": 0,
-        "description": "Your journal.",
-        "sellable_to": [],
-    },
-    "Ruby Fragment": {
-        "type": "ingredient",
-        "value": 150,
-        "description": "A fragment of a ruby",
-        "sellable_to": [],
-    },
-    "Topaz Fragment": {
-        "type": "ingredient",
-        "value": 100,
-        "description": "A fragment of a topaz",
-        "sellable_to": [],
-    },
-    "Emerald Fragment": {
-        "type": "ingredient",
-        "value": 135,
-        "description": "A fragment of an emerald",
-        "sellable_to": [],
-    },
-    "Diamond Fragment": {
-        "type": "ingredient",
-        "value": 200,
-        "description": "A fragment of a diamond",
-        "sellable_to": [],
-    },
-    "Sapphire Fragment": {
-        "type": "ingredient",
-        "value": 135,
-        "description": "A fragment of a sapphire",
-        "sellable_to": [],
-    },
-    "Ruby": {
-        "type": "ingredient",
-        "value": 1500,
-        "description": "A beautiful red",
-        "sellable_to": [],
-    },
-    "Topaz": {
-        "type": "ingredient",
-        "value": 1000,
-        "description": "A magnificent orange stone",
-        "sellable_to": [],
-    },
-    "Emerald": {
-        "type": "ingredient",
-        "value": 1350,
-        "description": "A gorgeous square cut of green crystal",
-        "sellable_to": [],
-    },
-    "Diamond": {
-        "type": "ingredient",
-        "value": 2000,
-        "description": "A lump of carbon",
-        "sellable_to": [],
-    },
-    "Sapphire": {
-        "type": "ingredient",
-        "value": 1350,
-        "description": "A remarkable blue gem",
-        "sellable_to": [],
-    },
-    # region Bait
-    "Worm": {
-        "type": "bait",
-        "value": 1,
-        "description": "A wriggly worm, perfect for fishing",
-        "sellable_to": [],
-    },
-    "Bright Bug": {
-        "type": "bait",
-        "value": 10,
-        "description": "A glowing insect, the fish will certainly bite",
-        "sellable_to": [],
-    },
-    "Stone Fly": {
-        "type": "bait",
-        "value": 50,
-        "description": "A rare insect that lives in mountains and caves. I'll name it Maurice",
-        "sellable_to": [],
-    },
-    # region Rods
-    "Fishing Rod": {
-        "type": "tool",
-        "value": 25,
-        "description": "Used for fishing",
-        "sellable_to": [],
-        "rod_width": 5,
-        "drain_ratio": 2.0,  # drain:gain — 2 units drained per 1 gained
-    },
-    # region Fish
-    "Common Perch": {
-        "type": "fish",
-        "value": 3,
-        "description": "A small, unremarkable fish. Still edible.",
-        "sellable_to": [],
-        "difficulty": 0.13,
-        "affinity": ["Worm"],
-    },
-    "Mudskipper": {
-        "type": "fish",
-        "value": 5,
-        "description": "Ugly little thing. Tastes better than it looks.",
-        "sellable_to": [],
-        "difficulty": 0.2,
-        "affinity": ["Worm"],
-    },
-    "Silver Darter": {
-        "type": "fish",
-        "value": 12,
-        "description": "Quick and shiny. Popular at market.",
-        "sellable_to": [],
-        "difficulty": 0.3,
-        "affinity": ["Worm", "Bright Bug"],
-    },
-    "Glowfin": {
-        "type": "fish",
-        "value": 20,
-        "description": "Faintly luminescent fins. Celeste would probably want this.",
-        "sellable_to": [],
-        "difficulty": 0.45,
-        "affinity": ["Bright Bug"],
-    },
-    "Ironscale Carp": {
-        "type": "fish",
-        "value": 18,
-        "description": "Heavy and armored. A fight to land.",
-        "sellable_to": [],
-        "difficulty": 0.5,
-        "affinity": ["Worm", "Stone Fly"],
-    },
-    "Deepwater Eel": {
-        "type": "fish",
-        "value": 30,
-        "description": "Long, dark, unnerving. Delicious smoked.",
-        "sellable_to": [],
-        "difficulty": 0.6,
-        "affinity": ["Bright Bug"],
-    },
-    "Thornback": {
-        "type": "fish",
-        "value": 40,
-        "description": "Handle with care. Spines will draw blood.",
-        "sellable_to": [],
-        "difficulty": 0.7,
-        "affinity": ["Stone Fly"],
-    },
-    "Gilded Trout": {
-        "type": "fish",
-        "value": 65,
-        "description": "Gold-flecked scales. Rare and beautiful.",
-        "sellable_to": [],
-        "difficulty": 0.8,
-        "affinity": ["Bright Bug", "Stone Fly"],
-    },
-    "Abyssal Lurker": {
-        "type": "fish",
-        "value": 90,
-        "description": "Nobody's sure what it eats down there.",
-        "sellable_to": [],
-        "difficulty": 0.9,
-        "affinity": ["Stone Fly"],
-    },
-    "Leviathan Fry": {
-        "type": "fish",
-        "value": 150,
-        "description": "A juvenile of something much, much larger. Best not to think about it.",
-        "sellable_to": [],
-        "difficulty": 1.0,
-        "affinity": ["Stone Fly"],
-    },
-}
+# items.py
+# Item definitions live in data/content/items.json; see data/loader.py.
+
+from data.loader import load_content
+
+ITEMS = load_content("items")
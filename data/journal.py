@@ -1,127 +1,14 @@
+import math
+import re
 import time
+from bisect import bisect_left, insort
+from typing import Container, Dict, Iterable, Iterator, List, Tuple
 
-JOURNAL_ENTRIES = {
-    # === CHARACTERS ===
-    # Roslin
-    "roslin": {
-        "title": "Roslin",
-        "category": "character",
-        "subject": "roslin",
-        "order": 1,
-        "text": "A Wood Elf shopkeeper in Kimaer. Warm, mischievous, and somehow already knows your name before you've said it twice.",
-    },
-    "roslin_store": {
-        "title": "Roslin - Her Shop",
-        "category": "character",
-        "subject": "roslin",
-        "order": 2,
-        "text": (
-            "Roslin's General Store smells of sandalwood and rain-soaked bark. "
-            "She stocks the basics, but her inventory seems to shift depending on what you need."
-        ),
-    },
-    "roslin_town": {
-        "title": "Roslin - On Kimaer",
-        "category": "character",
-        "subject": "roslin",
-        "order": 3,
-        "text": "Roslin has strong opinions about Kimaer. She's protective of it in the way someone is when they've chosen a place rather than been born into it.",
-    },
-    # Celeste
-    "celeste": {
-        "title": "Celeste",
-        "category": "character",
-        "subject": "celeste",
-        "order": 1,
-        "text": "A Dhampir alchemist. Precise, tidy, and polite in the way that makes you feel like she's deciding whether you're worth her time.",
-    },
-    "celeste_shop": {
-        "title": "Celeste - Her Shop",
-        "category": "character",
-        "subject": "celeste",
-        "order": 2,
-        "text": "Celeste sells tonics, reagents, and 'certain compounds that should not be sold.' She does not elaborate.",
-    },
-    "celeste_rats": {
-        "title": "Celeste - Rats",
-        "category": "character",
-        "subject": "celeste",
-        "order": 3,
-        "text": "It seems Celeste doesn't like rats.",
-    },
-    # Wilson
-    "wilson": {
-        "title": "Wilson",
-        "category": "character",
-        "subject": "wilson",
-        "order": 1,
-        "text": "A Human barkeep. Broad-shouldered, tired, and already done with you before you've opened your mouth. It's his bar. He runs it.",
-    },
-    "wilson_tavern": {
-        "title": "Wilson - His Tavern",
-        "category": "character",
-        "subject": "wilson",
-        "order": 2,
-        "text": "Wilson's Bar serves ale, food when the cook shows up, and peace when it can get it. Wilson keeps order mostly by being larger than the problem.",
-    },
-    "wilson_gnome": {
-        "title": "Wilson - Neighbors",
-        "category": "character",
-        "subject": "wilson",
-        "order": 3,
-        "text": "Wilson seems to have a distaste for the gnome.",
-    },
-    # Silas
-    "silas": {
-        "title": "Silas",
-        "category": "character",
-        "subject": "silas",
-        "order": 1,
-        "text": "A Drow bouncer in an alley in Kimaer. Scarred knuckles, scarlet eyes, and a one-word vocabulary: 'Leave.'",
-    },
-    # Benji
-    "benji": {
-        "title": "Benji",
-        "category": "character",
-        "subject": "benji",
-        "order": 1,
-        "text": "A Gnome of unclear occupation sitting near the fountain. Either a prophet or completely unhinged. Possibly both.",
-    },
-    # === LOCATIONS ===
-    "kimaer": {
-        "title": "Kimaer",
-        "category": "location",
-        "subject": "kimaer",
-        "order": 1,
-        "text": (
-            "A small town. Home to a general store, an alchemy shop, and Wilson's Bar. "
-        ),
-    },
-    "gulf_of_burhkeria": {
-        "title": "Gulf of Burhkeria",
-        "category": "location",
-        "subject": "gulf_of_burhkeria",
-        "order": 1,
-        "text": ("A gulf. "),
-    },
-    "lunara": {
-        "title": "Lunara",
-        "category": "location",
-        "subject": "lunara",
-        "order": 1,
-        "text": "A settlement near the lake to the northwest of Kimaer.",
-    },
-    # === ENEMIES ===
-    "giant_rat": {
-        "title": "Giant Rat",
-        "category": "enemy",
-        "subject": "giant_rat",
-        "order": 1,
-        "text": "A cancerous rodent. Deserves nothing but death.",
-    },
-    # === LORE ===
-    # Add as needed
-}
+from core.checkpoint import next_version
+from data.loader import load_content
+
+# Entries live in data/content/journal.json; see data/loader.py
+JOURNAL_ENTRIES = load_content("journal")
 
 CATEGORY_LABELS = {
     "character": "Characters",
@@ -133,6 +20,150 @@ CATEGORY_LABELS = {
 CATEGORY_ORDER = ["character", "location", "enemy", "lore"]
 
 
+# (key, entry) pairs for one subject, in reading order
+SubjectEntries = List[Tuple[str, dict]]
+
+
+class Journal:
+    """
+    The keys of every unlocked entry, plus an index of them by category and
+    subject that is kept up to date as entries unlock, so the journal menus
+    never have to regroup or sort anything.
+    """
+
+    def __init__(self, keys: Iterable[str] = ()):
+        # Unlock order, as saved
+        self._keys: List[str] = []
+        self._unlocked = set()
+        # Category -> subject -> entries sorted by "order"
+        self._index: Dict[str, Dict[str, SubjectEntries]] = {}
+        # Category -> subjects, alphabetical
+        self._subjects: Dict[str, List[str]] = {}
+        # Bumped on every unlock (see core/checkpoint.py)
+        self.version = next_version()
+        for key in keys:
+            self.unlock(key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._unlocked
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def unlock(self, key: str) -> bool:
+        """Add an entry. False if it was already unlocked."""
+        if key in self._unlocked:
+            return False
+        self._unlocked.add(key)
+        self._keys.append(key)
+        self.version = next_version()
+
+        # Keys with no entry (removed content) are kept for the save only
+        entry = JOURNAL_ENTRIES.get(key)
+        if entry is None:
+            return True
+        category = entry["category"]
+        subject = entry.get("subject", key)
+        subjects = self._index.setdefault(category, {})
+        if subject not in subjects:
+            subjects[subject] = []
+            insort(self._subjects.setdefault(category, []), subject)
+        insort(subjects[subject], (key, entry), key=lambda e: e[1].get("order", 0))
+        return True
+
+    def categories(self) -> List[str]:
+        """Categories with at least one unlocked entry, in CATEGORY_ORDER."""
+        return [c for c in CATEGORY_ORDER if c in self._index]
+
+    def subjects(self, category: str) -> List[Tuple[str, SubjectEntries]]:
+        """(subject, entries) for a category, by subject."""
+        by_subject = self._index.get(category, {})
+        return [(s, by_subject[s]) for s in self._subjects.get(category, [])]
+
+    def to_dict(self) -> List[str]:
+        return list(self._keys)
+
+    @classmethod
+    def from_dict(cls, data: Iterable[str]) -> "Journal":
+        return cls(data)
+
+
+# region Search
+
+# A word in a title counts this many times over one in the text
+TITLE_WEIGHT = 3
+# A query word that is only a prefix of the matched word ("cel" ->
+# "celeste") scores this fraction of an exact match
+PREFIX_WEIGHT = 0.5
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def _words(text: str) -> List[str]:
+    return [w.strip("'") for w in _WORD.findall(text.lower()) if w.strip("'")]
+
+
+def _build_search_index() -> Tuple[Dict[str, Dict[str, float]], List[str]]:
+    # word -> entry key -> weighted count
+    postings: Dict[str, Dict[str, float]] = {}
+    for key, entry in JOURNAL_ENTRIES.items():
+        for word in _words(entry["title"]):
+            counts = postings.setdefault(word, {})
+            counts[key] = counts.get(key, 0) + TITLE_WEIGHT
+        for word in _words(entry["text"]):
+            counts = postings.setdefault(word, {})
+            counts[key] = counts.get(key, 0) + 1
+    return postings, sorted(postings)
+
+
+# Built once at import; journal text never changes while the game runs
+_POSTINGS, _VOCABULARY = _build_search_index()
+
+
+def _expand(word: str) -> Iterator[str]:
+    """Every indexed word starting with word, found by bisecting."""
+    i = bisect_left(_VOCABULARY, word)
+    while i < len(_VOCABULARY) and _VOCABULARY[i].startswith(word):
+        yield _VOCABULARY[i]
+        i += 1
+
+
+def search_journal(query: str, unlocked: Container[str]) -> List[str]:
+    """
+    Keys of the unlocked entries matching every word of query, best match
+    first. Each query word also matches longer words it is a prefix of.
+    Rarer words count for more.
+    """
+    total = len(JOURNAL_ENTRIES)
+    scores: Dict[str, float] = {}
+    for n, word in enumerate(dict.fromkeys(_words(query))):
+        word_scores: Dict[str, float] = {}
+        for match in _expand(word):
+            counts = _POSTINGS[match]
+            weight = math.log(1 + total / len(counts))
+            if match != word:
+                weight *= PREFIX_WEIGHT
+            for key, count in counts.items():
+                if key in unlocked:
+                    word_scores[key] = word_scores.get(key, 0) + count * weight
+        # Every word has to match, so each word can only narrow the results
+        if n == 0:
+            scores = word_scores
+        else:
+            scores = {
+                k: v + word_scores[k] for k, v in scores.items() if k in word_scores
+            }
+        if not scores:
+            return []
+    return sorted(scores, key=lambda k: (-scores[k], JOURNAL_ENTRIES[k]["title"]))
+
+
+# endregion
+
+
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -141,6 +172,5 @@ if TYPE_CHECKING:
 
 def unlock_journal_entry(state: "GameState", key: str) -> None:
     """Call this whenever the player meets someone / visits somewhere for the first time."""
-    if key in JOURNAL_ENTRIES and key not in state.journal_entries:
-        state.journal_entries.append(key)
+    if key in JOURNAL_ENTRIES and state.journal_entries.unlock(key):
         time.sleep(1)
@@ -0,0 +1,262 @@
+# loader.py - Loads game content from data/content/*.json.
+#
+# Each file is parsed, checked against the rules below and lightly converted
+# (pairs like gold_drop come back as tuples, which the game code expects)
+# once. The result is pickled to data/content/.cache/, keyed on the file's
+# mtime, size and hash, so later startups load the pickle and skip parsing
+# and validation. Editing a content file invalidates its cache; so does
+# bumping LOADER_VERSION, which should happen whenever the rules or
+# conversions here change.
+#
+# Keys starting with "_" in an entry (e.g. "_notes") are for whoever edits
+# the file and are dropped on load.
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List
+
+CONTENT_DIR = Path(__file__).parent / "content"
+CACHE_DIR = CONTENT_DIR / ".cache"
+LOADER_VERSION = 1
+
+Number = (int, float)
+
+
+class ContentError(ValueError):
+    """A content file broke one or more rules. Lists every problem found."""
+
+    def __init__(self, name: str, problems: List[str]):
+        self.problems = problems
+        super().__init__(f"{name}.json:\n  " + "\n  ".join(problems))
+
+
+# region Rules
+
+# Files whose entries name items; their caches are also keyed on items.json
+DEPENDS = {
+    "items": (),
+    "enemies": ("items",),
+    "skills": (),
+    "journal": (),
+    "quests": ("items",),
+}
+
+# Per file: field -> (allowed types, required)
+FIELDS: Dict[str, Dict[str, tuple]] = {
+    "items": {
+        "type": (str, True),
+        "value": (int, True),
+        "description": (str, True),
+        "sellable_to": (list, True),
+        "damage": ((int, list), False),
+        "defense": (int, False),
+        "effect": (dict, False),
+        "difficulty": (Number, False),
+        "affinity": (list, False),
+        "rod_width": (int, False),
+        "drain_ratio": (Number, False),
+    },
+    "enemies": {
+        "health": (int, True),
+        "damage": (int, True),
+        "defense": (int, True),
+        "gold_drop": (list, True),
+        "item_drops": (list, True),
+        "description": (str, False),
+        "difficulty": (Number, False),
+        "exp_drop": (list, False),
+    },
+    "skill": {
+        "class": (str, True),
+        "damage": (int, False),
+        "target": (str, True),
+        "description": (str, True),
+        "sequence": (list, True),
+        "sequence_time": (Number, True),
+        "unlock_level": (int, True),
+        "mana_cost": (int, False),
+        "stamina_cost": (int, False),
+        "heal": (int, False),
+        "effect": (dict, False),
+    },
+    "journal": {
+        "title": (str, True),
+        "category": (str, True),
+        "subject": (str, True),
+        "order": (int, True),
+        "text": (str, True),
+    },
+    "quests": {
+        "name": (str, True),
+        "description": (str, True),
+        "stages": (list, True),
+        "rewards": (dict, True),
+    },
+}
+
+
+def _check_entries(kind: str, entries: Any, problems: List[str], where: str = ""):
+    if not isinstance(entries, dict):
+        problems.append(f"{where or 'top level'}: expected an object")
+        return
+    fields = FIELDS[kind]
+    for key, entry in entries.items():
+        label = f"{where}{key}"
+        if not isinstance(entry, dict):
+            problems.append(f"{label}: expected an object")
+            continue
+        for name in list(entry):
+            if name.startswith("_"):
+                del entry[name]
+        for name, (types, required) in fields.items():
+            if name not in entry:
+                if required:
+                    problems.append(f"{label}: missing {name}")
+            elif not isinstance(entry[name], types) or isinstance(entry[name], bool):
+                problems.append(f"{label}: {name} has the wrong type")
+        for name in entry:
+            if name not in fields:
+                problems.append(f"{label}: unknown field {name}")
+
+
+def _pair(value: Any) -> bool:
+    return isinstance(value, list) and len(value) == 2
+
+
+def _convert_items(items: dict, problems: List[str]) -> dict:
+    for name, item in items.items():
+        if isinstance(item.get("damage"), list):
+            if not _pair(item["damage"]):
+                problems.append(f"{name}: damage range needs [min, max]")
+            item["damage"] = tuple(item["damage"])
+    return items
+
+
+def _convert_enemies(enemies: dict, problems: List[str]) -> dict:
+    for name, enemy in enemies.items():
+        for field in ("gold_drop", "exp_drop"):
+            if field in enemy:
+                if not _pair(enemy[field]):
+                    problems.append(f"{name}: {field} needs [min, max]")
+                enemy[field] = tuple(enemy[field])
+        drops = []
+        for drop in enemy.get("item_drops", []):
+            if not _pair(drop) or not isinstance(drop[1], Number):
+                problems.append(f"{name}: item_drops entries need [item, chance]")
+                continue
+            drops.append(tuple(drop))
+        enemy["item_drops"] = drops
+    return enemies
+
+
+def _check_references(name: str, data: dict, problems: List[str]) -> None:
+    items = data if name == "items" else load_content("items")
+    if name == "items":
+        for item_name, item in items.items():
+            for bait in item.get("affinity", []):
+                if bait not in items:
+                    problems.append(f"{item_name}: affinity bait {bait} is not an item")
+    elif name == "enemies":
+        for enemy_name, enemy in data.items():
+            for drop, _ in enemy["item_drops"]:
+                if drop not in items:
+                    problems.append(f"{enemy_name}: drop {drop} is not an item")
+    elif name == "quests":
+        for quest_id, quest in data.items():
+            for reward in quest["rewards"].get("items", []):
+                if reward not in items:
+                    problems.append(f"{quest_id}: reward {reward} is not an item")
+
+
+def _validate(name: str, data: Any) -> Any:
+    problems: List[str] = []
+    if name == "skills":
+        if not isinstance(data, dict) or set(data) != {"spells", "techniques"}:
+            raise ContentError(name, ["expected spells and techniques sections"])
+        for section in ("spells", "techniques"):
+            _check_entries("skill", data[section], problems, f"{section}.")
+    else:
+        _check_entries(name, data, problems)
+
+    if not problems:
+        if name == "items":
+            data = _convert_items(data, problems)
+        elif name == "enemies":
+            data = _convert_enemies(data, problems)
+    if not problems:
+        _check_references(name, data, problems)
+    if problems:
+        raise ContentError(name, problems)
+    return data
+
+
+# endregion
+
+# region Cache
+
+
+def _file_hash(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _read_cache(cache_path: Path) -> Any:
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def _write_cache(cache_path: Path, cached: dict) -> None:
+    # A read-only install just means every startup parses; not an error
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        tmp = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(cached, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+
+
+# endregion
+
+
+def load_content(name: str) -> Any:
+    """
+    Content from data/content/<name>.json, from the compiled cache when the
+    file hasn't changed. Raises ContentError if the file breaks the rules.
+    """
+    path = CONTENT_DIR / f"{name}.json"
+    cache_path = CACHE_DIR / f"{name}.pickle"
+    stat = path.stat()
+    key = {
+        "version": LOADER_VERSION,
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "depends": [_file_hash(CONTENT_DIR / f"{d}.json") for d in DEPENDS[name]],
+    }
+
+    cached = _read_cache(cache_path)
+    if (
+        isinstance(cached, dict)
+        and cached.get("version") == LOADER_VERSION
+        and cached.get("depends") == key["depends"]
+    ):
+        if cached["mtime"] == key["mtime"] and cached["size"] == key["size"]:
+            return cached["data"]
+        # Touched but maybe not changed (checkout, copy): compare contents
+        digest = _file_hash(path)
+        if cached.get("hash") == digest:
+            _write_cache(cache_path, dict(cached, **key))
+            return cached["data"]
+    else:
+        digest = _file_hash(path)
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = _validate(name, json.load(f))
+    _write_cache(cache_path, dict(key, hash=digest, data=data))
+    return data
@@ -1,172 +1,9 @@
 # skills.py
 # Spell and technique definitions only. All logic lives in combat.py.
+# The definitions themselves live in data/content/skills.json.
 
-SPELLS = {
-    "Shadow Bolt": {
-        "class": "Warlock",
-        "mana_cost": 15,
-        "damage": 20,
-        "target": "single",
-        "description": "Hurl a bolt of dark energy",
-        "sequence": ["w", "a", "s", "d"],
-        "sequence_time": 2.0,
-        "unlock_level": 1,
-    },
-    "Drain Life": {
-        "class": "Warlock",
-        "mana_cost": 20,
-        "damage": 15,
-        "heal": 10,
-        "target": "single",
-        "description": "Siphon life from your enemy",
-        "sequence": ["s", "s", "w", "w"],
-        "sequence_time": 2.5,
-        "unlock_level": 5,
-    },
-    "Dark Pact": {
-        "class": "Warlock",
-        "mana_cost": 25,
-        "damage": 0,
-        "effect": {"damage_buff": 1.5, "duration": 3},
-        "target": "self",
-        "description": "Sacrifice vitality for power",
-        "sequence": ["a", "d", "a", "d", "w"],
-        "sequence_time": 3.0,
-        "unlock_level": 10,
-    },
-    "Holy Strike": {
-        "class": "Paladin",
-        "mana_cost": 12,
-        "damage": 18,
-        "target": "single",
-        "description": "Strike with divine fury",
-        "sequence": ["w", "w", "d"],
-        "sequence_time": 2.0,
-        "unlock_level": 1,
-    },
-    "Lay on Hands": {
-        "class": "Paladin",
-        "mana_cost": 20,
-        "heal": 30,
-        "target": "self",
-        "description": "Channel divine healing",
-        "sequence": ["w", "s", "w"],
-        "sequence_time": 2.5,
-        "unlock_level": 5,
-    },
-    "Heal": {
-        "class": "Cleric",
-        "mana_cost": 15,
-        "heal": 35,
-        "target": "self",
-        "description": "Restore health with divine light",
-        "sequence": ["w", "w"],
-        "sequence_time": 1.5,
-        "unlock_level": 1,
-    },
-    "Smite": {
-        "class": "Cleric",
-        "mana_cost": 18,
-        "damage": 22,
-        "target": "single",
-        "description": "Divine wrath against evil",
-        "sequence": ["w", "d", "s"],
-        "sequence_time": 2.0,
-        "unlock_level": 5,
-    },
-    "Divine Shield": {
-        "class": "Cleric",
-        "mana_cost": 25,
-        "effect": {"defense_buff": 10, "duration": 3},
-        "target": "self",
-        "description": "Protect yourself with holy light",
-        "sequence": ["a", "w", "d", "s"],
-        "sequence_time": 2.5,
-        "unlock_level": 10,
-    },
-}
+from data.loader import load_content
 
-TECHNIQUES = {
-    "Power Strike": {
-        "class": "Fighter",
-        "stamina_cost": 15,
-        "damage": 25,
-        "target": "single",
-        "description": "A devastating heavy blow",
-        "sequence": ["w", "w", "d"],
-        "sequence_time": 2.0,
-        "unlock_level": 1,
-    },
-    "Whirlwind": {
-        "class": "Fighter",
-        "stamina_cost": 25,
-        "damage": 18,
-        "target": "enemies",
-        "description": "Spin with blade extended",
-        "sequence": ["a", "s", "d", "w"],
-        "sequence_time": 2.5,
-        "unlock_level": 5,
-    },
-    "Battle Cry": {
-        "class": "Fighter",
-        "stamina_cost": 20,
-        "effect": {"damage_buff": 1.3, "duration": 3},
-        "target": "self",
-        "description": "Roar to bolster your strength",
-        "sequence": ["w", "a", "w", "d"],
-        "sequence_time": 2.0,
-        "unlock_level": 10,
-    },
-    "Smoke Bomb": {
-        "class": "Rogue",
-        "stamina_cost": 15,
-        "effect": {"dodge_chance": 0.5, "duration": 2},
-        "target": "self",
-        "description": "Vanish into smoke",
-        "sequence": ["a", "d", "s"],
-        "sequence_time": 2.0,
-        "unlock_level": 1,
-    },
-    "Backstab": {
-        "class": "Rogue",
-        "stamina_cost": 18,
-        "damage": 30,
-        "target": "single",
-        "description": "Strike from the shadows",
-        "sequence": ["s", "d", "w"],
-        "sequence_time": 2.5,
-        "unlock_level": 5,
-    },
-    "Poison Blade": {
-        "class": "Rogue",
-        "stamina_cost": 20,
-        "damage": 15,
-        "effect": {"poison": 5, "duration": 3},
-        "target": "single",
-        "description": "Coat blade with venom",
-        "sequence": ["s", "w", "d", "s"],
-        "sequence_time": 2.5,
-        "unlock_level": 10,
-    },
-    "Shield Bash": {
-        "class": "Paladin",
-        "stamina_cost": 12,
-        "damage": 15,
-        "effect": {"stun": 1, "duration": 1},
-        "target": "single",
-        "description": "Bash with your shield",
-        "sequence": ["d", "w"],
-        "sequence_time": 1.5,
-        "unlock_level": 5,
-    },
-    "Righteous Fury": {
-        "class": "Paladin",
-        "stamina_cost": 20,
-        "damage": 20,
-        "target": "single",
-        "description": "Channel anger into a strike",
-        "sequence": ["w", "d", "w"],
-        "sequence_time": 2.0,
-        "unlock_level": 10,
-    },
-}
+_skills = load_content("skills")
+SPELLS = _skills["spells"]
+TECHNIQUES = _skills["techniques"]
@@ -6,6 +6,7 @@ venture.py - A simple text-based adventure game.
 import json
 import time
 import sys
+from typing import Optional
 from core.display import (
     press_any_key,
     set_terminal_title,
@@ -14,7 +15,7 @@ from core.display import (
     write_slow,
 )
 from core.utils import location_router, menu_choice
-from core.state import GameState
+from core.state import GameState, list_saves
 from core.audio.music_player import play_music, stop_music, play_sfx
 
 # endregion
@@ -52,7 +53,7 @@ def show_main_menu() -> None:
         show_credits()
     elif choice == 4:
         write_slow("...", 50, 200, 100, 100)
-        sys.exit()
+        sys.exit()  # queued saves are flushed at exit
 
 
 def show_credits() -> None:
@@ -79,10 +80,61 @@ def start_new_game() -> None:
     start_clearing(state)
 
 
+SAVES_PER_PAGE = 6  # keeps the menu within single-keypress range
+
+
+def _format_playtime(seconds: int) -> str:
+    hours, minutes = divmod(int(seconds) // 60, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+def choose_save() -> Optional[str]:
+    """Pick a save from the index. Returns its file name, or None to go back."""
+    saves = list_saves()
+    page = 0
+
+    while True:
+        clear()
+        print_color("=== Load Game ===", 255, 200, 50)
+        print()
+
+        if not saves:
+            print("No saved games found.")
+            print()
+            press_any_key()
+            return None
+
+        start = page * SAVES_PER_PAGE
+        shown = saves[start : start + SAVES_PER_PAGE]
+        options = [
+            f"{s['name']} - Level {s['level']} {s['class'] or 'Adventurer'}"
+            f" | {s['location']} | {s['gold']} gold"
+            f" | {_format_playtime(s.get('playtime', 0))}"
+            for s in shown
+        ]
+        has_next = start + SAVES_PER_PAGE < len(saves)
+        if has_next:
+            options.append("Next page")
+        if page > 0:
+            options.append("Previous page")
+        options.append("Back")
+
+        index = menu_choice(options) - 1
+        if index < len(shown):
+            return shown[index]["key"]
+        if options[index] == "Next page":
+            page += 1
+        elif options[index] == "Previous page":
+            page -= 1
+        else:
+            return None
+
+
 def load_game() -> None:
-    file_name = input(
-        "Which save file would you like to load? (CharacterName.json): "
-    ).strip()
+    file_name = choose_save()
+    if file_name is None:
+        show_main_menu()
+        return
 
     try:
         print_color(f"Loading game from {file_name}...", 50, 50, 255)
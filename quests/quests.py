@@ -1,6 +1,9 @@
 from typing import Optional, Callable, List
+from core.checkpoint import next_version
 from core.display import clear, press_any_key, print_color
-from core.utils import add_xp
+from core.inventory import Transaction
+from core.utils import announce_xp, gain_xp
+from data.loader import load_content
 
 
 class Quest:
@@ -29,12 +32,15 @@ class Quest:
         self.current_stage = 0
         self.completed = False
         self.rewards = rewards
+        # Bumped on every change (see core/checkpoint.py)
+        self.version = next_version()
 
     def advance_stage(self) -> bool:
         """
         Advance to next stage. Returns True if quest completed.
         """
         self.current_stage += 1
+        self.version = next_version()
         if self.current_stage >= len(self.stages):
             self.completed = True
             return True
@@ -74,46 +80,7 @@ class Quest:
 
 
 # Quest database
-QUESTS = {
-    "celeste_rats": {
-        "name": "A Scream in the Night",
-        "description": "Celeste needs help dealing with a rat infestation in her shop.",
-        "stages": [
-            "Talk to Celeste about the scream",
-            "Get a weapon from Roslin",
-            "Defeat the rats in the Alchemy Shop",
-            "Return to Celeste",
-        ],
-        "rewards": {
-            "gold": 25,
-            "items": ["Health Potion"],
-            "exp": 50,
-        },
-    },
-    "roslin_fishing": {
-        "name": "Catching Feelings",
-        "description": "Roslin thinks you should get some fish for Celeste after the rat problem.",
-        "stages": [
-            "Talk to Roslin",  # Done manually via forced cutscene post-rat_quest
-            "Buy fishing supplies from Roslin",  # But I don't want to.....
-            "Open the map and travel to the Gulf of Burhkeria",
-            "Cast your line",  # Triton or merfolk-adjacent stops you
-            "Return to Roslin",  # Tell Roslin you can't fish, unlocks lake
-            "Open the map and travel to the Lake",
-            "Catch three fish",
-            "Return to Roslin",
-            "Give the fish to Celeste",
-        ],
-        "rewards": {
-            "exp": 75,
-            "gold": 50,
-            # And also relationship progress with Celeste, maybe some plot,
-            # but definitely her becoming increasingly flustered, eg:
-            # "I couldn't possibly... ... you've already done so much..."
-            # "I insist, I'll give you some gold for them, I can't accept more of your generosity..."
-        },
-    },
-}
+QUESTS = load_content("quests")
 
 
 def create_quest(quest_id: str) -> Quest:
@@ -188,19 +155,24 @@ def apply_quest_rewards(state, quest: Quest) -> None:
 
     rewards = quest.rewards
 
-    if rewards.get("gold", 0) > 0:
-        state.gold += rewards["gold"]
-        print_color(f"Gained {rewards['gold']} gold!", 255, 200, 50)
-
-    if rewards.get("items"):
-        for item_name in rewards["items"]:
-            state.inventory.add_item(item_name, 1)
+    reward = Transaction(state).add_gold(rewards.get("gold", 0))
+    for item_name in rewards.get("items", []):
+        reward.add_item(item_name, 1)
+    # Saved once below, together with the XP
+    if reward.commit(save=False):
+        if rewards.get("gold", 0) > 0:
+            print_color(f"Gained {rewards['gold']} gold!", 255, 200, 50)
+        for item_name in rewards.get("items", []):
             print_color(f"Received: {item_name}", 200, 255, 200)
+    else:
+        for problem in reward.problems:
+            print_color(problem, 255, 50, 50)
 
     if rewards.get("exp", 0) > 0:
         print_color(f"Gained {rewards['exp']} experience!", 100, 200, 255)
-        add_xp(state, rewards["exp"])
+        announce_xp(state, rewards["exp"], gain_xp(state, rewards["exp"]))
 
+    state.save()
     print()
 
 
@@ -0,0 +1,143 @@
+"""
+tools/bench_saves.py - Compare save formats on size and encode/decode CPU time.
+
+Usage (from the Venture directory):
+    python -m tools.bench_saves [--quests N] [--entries N] [--rounds N]
+
+Builds one synthetic late-game save (every known item, every quest and
+journal entry, plus padding quests/entries so larger saves can be tried) and
+times it through:
+  json (indent=2)  the original pretty-printed save format, with item_type
+                   and value still stored on every inventory entry
+  json (compact)   what the JSON backend writes today, header included
+  binary           the .sav format from core/persistence/codec.py
+  json + zlib/lzma the compressed .jsonz format from compression.py
+"""
+
+import argparse
+import io
+import json
+import time
+
+from core.persistence import codec, compression
+from core.persistence.encoding import encode_fields, join_fields
+from core.persistence.index import with_header
+from core.state import GameState
+from data.items import ITEMS
+from data.journal import JOURNAL_ENTRIES
+from quests.quests import QUESTS
+
+
+def build_state(extra_quests: int, extra_entries: int) -> GameState:
+    state = GameState()
+    state.name = "Bench"
+    state.level = 30
+    state.gold = 123456
+    for name in ITEMS:
+        state.inventory.add_item(name, 7)
+
+    quest_ids = list(QUESTS) + [f"bench_quest_{i}" for i in range(extra_quests)]
+    state.active_quests = [
+        {"quest_id": q, "current_stage": i % 4, "completed": False}
+        for i, q in enumerate(quest_ids)
+    ]
+    state.completed_quests = quest_ids[::2]
+    state.journal_entries = list(JOURNAL_ENTRIES) + [
+        f"bench_entry_{i}" for i in range(extra_entries)
+    ]
+    state.locations_visited = {
+        "Kimaer": True,
+        "wilson_bar": True,
+        "Gulf of Burhkeria": True,
+    }
+    return state
+
+
+def legacy_dict(data: dict) -> dict:
+    """
+    The same save as the original format stored it: every inventory entry
+    carried its item_type and value alongside its name and count.
+    """
+    legacy = dict(data)
+    legacy["inventory"] = [
+        {
+            "name": entry["name"],
+            "item_type": ITEMS.get(entry["name"], {}).get("type", "misc"),
+            "count": entry["count"],
+            "value": ITEMS.get(entry["name"], {}).get("value", 0),
+        }
+        for entry in data["inventory"]
+    ]
+    return legacy
+
+
+def time_it(fn, rounds: int) -> float:
+    """Average CPU time per call in milliseconds."""
+    start = time.process_time()
+    for _ in range(rounds):
+        fn()
+    return (time.process_time() - start) / rounds * 1000
+
+
+def compressed(data: dict, meta: dict, algorithm: str):
+    def encode() -> bytes:
+        pieces = compression.iter_save_lines(encode_fields(data), meta)
+        return b"".join(compression.compress(pieces, algorithm))
+
+    def decode(raw: bytes) -> dict:
+        return compression.decode_stream(io.BytesIO(raw))
+
+    return encode, decode
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quests", type=int, default=200, help="padding quests")
+    parser.add_argument("--entries", type=int, default=500, help="padding entries")
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    state = build_state(args.quests, args.entries)
+    data = state.to_dict()
+    meta = dict(state.save_meta(), mtime=time.time())
+    legacy = legacy_dict(data)
+
+    formats = {
+        "json (indent=2)": (
+            lambda: json.dumps(legacy, indent=2).encode("utf-8"),
+            lambda raw: json.loads(raw.decode("utf-8")),
+        ),
+        "json (compact)": (
+            lambda: with_header(join_fields(encode_fields(data)), meta).encode("utf-8"),
+            codec.decode_save,
+        ),
+        "binary": (lambda: codec.encode_binary(data, meta), codec.decode_save),
+        "json + zlib": compressed(data, meta, "zlib"),
+        "json + lzma": compressed(data, meta, "lzma"),
+    }
+
+    print(f"{'format':<18}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}  (CPU)")
+    baseline = None
+    for label, (encode, decode) in formats.items():
+        raw = encode()
+        size = len(raw)
+        baseline = baseline or size
+        enc = time_it(encode, args.rounds)
+        dec = time_it(lambda: decode(raw), args.rounds)
+        print(
+            f"{label:<18}{size:>10}{enc:>12.3f}{dec:>12.3f}"
+            f"   ({size / baseline:.0%} of original size)"
+        )
+
+    # Sanity check: every round trip gives back the same save
+    for label, (encode, decode) in formats.items():
+        decoded = decode(encode())
+        decoded.pop("_meta", None)
+        expected = legacy if label == "json (indent=2)" else data
+        assert json.dumps(decoded, sort_keys=True) == json.dumps(
+            expected, sort_keys=True
+        ), label
+
+
+if __name__ == "__main__":
+    main()
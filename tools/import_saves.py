@@ -0,0 +1,37 @@
+"""
+tools/import_saves.py - Import JSON saves into the SQLite save store.
+
+Usage (from the Venture directory):
+    python -m tools.import_saves [saves_dir] [db_path]
+
+Defaults to saves/ and saves/venture.db. Set SAVE_BACKEND = "sqlite" in
+core/persistence/manager.py afterwards to play from the database.
+"""
+
+import argparse
+import time
+
+from core.persistence.backends import JsonBackend, SqliteBackend, import_json_saves
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("saves_dir", nargs="?", default="saves")
+    parser.add_argument("db_path", nargs="?", default="saves/venture.db")
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="saves per transaction"
+    )
+    args = parser.parse_args()
+
+    source = JsonBackend(args.saves_dir)
+    target = SqliteBackend(args.db_path)
+    start = time.perf_counter()
+    count = import_json_saves(source, target, args.batch_size)
+    elapsed = time.perf_counter() - start
+    target.close()
+
+    print(f"Imported {count} saves into {args.db_path} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+tools/migrate_saves.py - Migrate or validate every save under a directory.
+
+Usage (from the Venture directory):
+    python -m tools.migrate_saves [saves_dir] [--check] [--workers N]
+
+Each save (JSON, binary or compressed, any journal log folded in) is upgraded to the
+current save version and rewritten in place in the same format, keeping the
+previous file as .bak. With --check nothing is written; saves that are out
+of date or fail to load are reported and the exit status is 1.
+
+Saves are spread over a process pool; throughput is printed at the end.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+from core.persistence import codec, compression, journal
+from core.persistence.atomic import (
+    atomic_write_bytes,
+    atomic_write_chunks,
+    atomic_write_text,
+)
+from core.persistence.backends import read_save_file
+from core.persistence.encoding import encode_fields, join_fields
+from core.persistence.index import META_KEY, is_save_file, with_header
+from core.persistence.migrations import needs_migration, save_version
+
+# Per-save outcomes
+CURRENT = "current"
+MIGRATED = "migrated"
+OUTDATED = "outdated"  # --check only
+FAILED = "failed"
+
+
+def find_saves(root: Path) -> List[Path]:
+    return sorted(p for p in root.rglob("*") if p.is_file() and is_save_file(p))
+
+
+def process_save(path: Path, check: bool) -> Tuple[str, str, int]:
+    """Returns (outcome, detail, bytes read). Runs in a worker process."""
+    from core.state import GameState
+
+    try:
+        size = path.stat().st_size
+        with open(path, "rb") as f:
+            head = f.read(16)
+        data = read_save_file(path)
+        meta = data.pop(META_KEY, None)
+        has_log = journal.log_path(path).exists()
+        journal.replay(path, data)
+
+        version = save_version(data)
+        # Loading it is the validation; saving it back drops stale fields
+        state = GameState.from_dict(data)
+    except Exception as e:
+        return FAILED, f"{type(e).__name__}: {e}", 0
+
+    if not needs_migration(data) and not has_log:
+        return CURRENT, "", size
+    if check:
+        return OUTDATED, f"v{version}", size
+
+    if meta is None:
+        meta = dict(state.save_meta(), mtime=path.stat().st_mtime)
+    upgraded = state.to_dict()
+    algorithm = compression.detect(head)
+    if codec.is_binary(head):
+        atomic_write_bytes(path, codec.encode_binary(upgraded, meta))
+    elif algorithm:
+        pieces = compression.iter_save_lines(encode_fields(upgraded), meta)
+        atomic_write_chunks(path, compression.compress(pieces, algorithm))
+    else:
+        body = join_fields(encode_fields(upgraded))
+        atomic_write_text(path, with_header(body, meta))
+    journal.clear_log(path)
+    return MIGRATED, f"v{version}", size
+
+
+def _process(args: Tuple[Path, bool]) -> Tuple[str, str, int]:
+    return process_save(*args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("saves_dir", nargs="?", default="saves")
+    parser.add_argument(
+        "--check", action="store_true", help="validate only, write nothing"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--chunksize", type=int, default=64, help="saves handed to a worker at once"
+    )
+    args = parser.parse_args()
+
+    paths = find_saves(Path(args.saves_dir))
+    counts = {CURRENT: 0, MIGRATED: 0, OUTDATED: 0, FAILED: 0}
+    total_bytes = 0
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = pool.map(
+            _process, [(p, args.check) for p in paths], chunksize=args.chunksize
+        )
+        for path, (outcome, detail, size) in zip(paths, results):
+            counts[outcome] += 1
+            total_bytes += size
+            if outcome in (FAILED, OUTDATED):
+                print(f"{outcome:>8}  {path}  {detail}")
+    elapsed = time.perf_counter() - start
+
+    rate = len(paths) / elapsed if elapsed else 0.0
+    mb_rate = total_bytes / 1e6 / elapsed if elapsed else 0.0
+    print(
+        f"{len(paths)} saves in {elapsed:.2f}s ({rate:.0f} saves/s, {mb_rate:.1f} MB/s)"
+        f" with {args.workers} workers"
+    )
+    print(", ".join(f"{n} {outcome}" for outcome, n in counts.items() if n))
+
+    if counts[FAILED] or counts[OUTDATED]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
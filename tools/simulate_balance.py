@@ -0,0 +1,382 @@
+"""
+tools/simulate_balance.py - Monte Carlo balance sweep over class x level x
+weapon x enemy group.
+
+Usage (from the Venture directory):
+    python -m tools.simulate_balance [--trials N] [--levels 1-20]
+        [--skill PERFECT,BLOCK,MISS] [--group "Goblin x3"] [--out FILE]
+        [--check N]
+
+Every combination is fought --trials times and the results are written as
+CSV, one row per combination: win rate, turns to win, and the player's HP
+left at the end of a win. Needs numpy (pip install numpy); the game itself
+doesn't.
+
+The fights are the CombatEngine rules (core/combat.py) for a player who
+only uses the basic attack, always on the first enemy still standing, and
+never flees. Fights run side by side, one per array lane, so one numpy
+operation plays a step of every fight in a batch; a batch ends when all of
+its fights have.
+
+Each defense QTE is a random draw instead of a keypress. --skill gives the
+chances of perfect/block/miss against a difficulty 1.0 enemy; harder
+enemies move the bar faster, so perfect and block are divided by the
+enemy's difficulty and the rest becomes misses (easier enemies scale them
+up, as far as the total allows). Groups of LARGE_BATTLE_SIZE or more are
+large battles, as in the game: each stack of identical enemies makes one
+draw per turn and its damage is multiplied by the stack's size; on a
+perfect draw its front enemy is countered and the rest are blocked.
+
+--check N replays a sample of combinations through the real CombatEngine N
+times each and prints both results next to each other, to catch this model
+drifting from the rules.
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from core.combat import LARGE_BATTLE_SIZE
+from core.state import CLASS_MAP, GameState
+from data.catalog import items_of_type
+from data.enemies import ENEMIES
+from data.items import ITEMS
+
+UNARMED = "Unarmed"
+
+# (class, level, weapon, group)
+Combo = Tuple[str, int, str, Tuple[str, ...]]
+
+
+# region Setup
+
+
+def parse_group(text: str) -> Tuple[str, ...]:
+    """ "Giant Rat x3" or "Goblin+Wolf" -> the enemy names, one per enemy."""
+    enemies: List[str] = []
+    for part in text.split("+"):
+        name, _, count = part.strip().rpartition(" x")
+        if not name or not count.isdigit():
+            name, count = part.strip(), "1"
+        if name not in ENEMIES:
+            raise ValueError(f"Unknown enemy: {name}")
+        enemies += [name] * int(count)
+    return tuple(enemies)
+
+
+def group_label(group: Tuple[str, ...]) -> str:
+    counts: Dict[str, int] = {}
+    for name in group:
+        counts[name] = counts.get(name, 0) + 1
+    return "+".join(f"{n} x{c}" if c > 1 else n for n, c in counts.items())
+
+
+def parse_levels(text: str) -> List[int]:
+    low, _, high = text.partition("-")
+    return list(range(int(low), int(high or low) + 1))
+
+
+def parse_skill(text: str) -> Tuple[float, float]:
+    """PERFECT,BLOCK,MISS chances -> (perfect, block), normalised."""
+    chances = [float(p) for p in text.split(",")]
+    if len(chances) != 3 or min(chances) < 0 or sum(chances) <= 0:
+        raise ValueError("--skill needs three non-negative chances")
+    total = sum(chances)
+    return chances[0] / total, chances[1] / total
+
+
+def qte_chances(
+    skill: Tuple[float, float], difficulty: float
+) -> Tuple[float, float]:
+    perfect, block = skill
+    scale = 1 / difficulty
+    if perfect + block > 0:
+        scale = min(scale, 1 / (perfect + block))
+    return perfect * scale, block * scale
+
+
+def weapon_range(weapon: str) -> Tuple[int, int]:
+    if weapon == UNARMED:
+        return 0, 0
+    raw = ITEMS[weapon].get("damage", 0)
+    return raw if isinstance(raw, tuple) else (raw, raw)
+
+
+# endregion
+
+
+# region Vectorized fights
+
+
+def simulate_batch(
+    combos: List[Combo],
+    trials: int,
+    skill: Tuple[float, float],
+    armor: int,
+    max_turns: int,
+    rng,
+) -> List[dict]:
+    """Fight every combo trials times at once. One result dict per combo."""
+    n = len(combos) * trials
+    slots = max(len(c[3]) for c in combos)
+
+    def per_lane(values, dtype) -> "np.ndarray":
+        return np.repeat(np.asarray(values, dtype=dtype), trials, axis=0)
+
+    classes = [CLASS_MAP[c[0]] for c in combos]
+    level = per_lane([c[1] for c in combos], np.int64)
+    class_mod = per_lane([pc.damage_mod for pc in classes], np.float64)
+    max_hp = per_lane([int(100 * pc.health_mod) for pc in classes], np.int64)
+    weapon_lo, weapon_hi = (
+        per_lane(col, np.int64) for col in zip(*(weapon_range(c[2]) for c in combos))
+    )
+
+    # Enemy slots; groups smaller than the largest leave theirs empty (0 HP)
+    e_hp = np.zeros((len(combos), slots), np.int64)
+    e_dmg = np.zeros_like(e_hp)
+    e_def = np.zeros_like(e_hp)
+    p_perfect = np.zeros((len(combos), slots), np.float64)
+    p_block = np.zeros_like(p_perfect)
+    # Each slot's stack: the first slot holding the same enemy in a large
+    # battle, the slot itself otherwise
+    stack = np.tile(np.arange(slots), (len(combos), 1))
+    for i, (_, _, _, group) in enumerate(combos):
+        for s, name in enumerate(group):
+            if len(group) >= LARGE_BATTLE_SIZE:
+                stack[i, s] = group.index(name)
+            data = ENEMIES[name]
+            e_hp[i, s] = data["health"]
+            e_dmg[i, s] = data["damage"]
+            e_def[i, s] = data["defense"]
+            p_perfect[i, s], p_block[i, s] = qte_chances(
+                skill, data.get("difficulty", 1.0)
+            )
+    e_hp, e_dmg, e_def, p_perfect, p_block, stack = (
+        np.repeat(a, trials, axis=0)
+        for a in (e_hp, e_dmg, e_def, p_perfect, p_block, stack)
+    )
+
+    hp = max_hp.copy()
+    last_damage = np.full(n, 5, np.int64)
+    turns = np.zeros(n, np.int64)
+    won = np.zeros(n, bool)
+    live = np.arange(n)
+
+    for turn in range(1, max_turns + 1):
+        if not live.size:
+            break
+
+        # Player attacks the first enemy still standing
+        target = (e_hp[live] > 0).argmax(axis=1)
+        weapon = rng.integers(weapon_lo[live], weapon_hi[live] + 1)
+        total = np.trunc((5 + weapon + level[live]) * class_mod[live]).astype(np.int64)
+        last_damage[live] = total
+        e_hp[live, target] -= np.maximum(1, total - e_def[live, target])
+
+        cleared = (e_hp[live] <= 0).all(axis=1)
+        won[live[cleared]] = True
+        turns[live[cleared]] = turn
+        live = live[~cleared]
+
+        # Each stack with someone standing attacks in turn, until the player
+        # goes down; its first living enemy leads and takes any counter
+        for k in range(slots):
+            members = (stack[live] == k) & (e_hp[live] > 0)
+            count = members.sum(axis=1)
+            attacking = (count > 0) & (hp[live] > 0)
+            j, count = live[attacking], count[attacking]
+            s = members[attacking].argmax(axis=1)
+            roll = rng.random(j.size)
+            perfect = roll < p_perfect[j, s]
+            block = ~perfect & (roll < p_perfect[j, s] + p_block[j, s])
+            miss = ~(perfect | block)
+
+            parried, ps = j[perfect], s[perfect]
+            e_hp[parried, ps] -= np.maximum(
+                1, last_damage[parried] // 2 - e_def[parried, ps]
+            )
+            # The rest of a parried stack's attacks are blocked
+            blocks = np.where(block, count, 0) + np.where(perfect, count - 1, 0)
+            hp[j] -= np.maximum(1, e_dmg[j, s] // 2) * blocks
+            hit, hs = j[miss], s[miss]
+            hit_damage = e_dmg[hit, hs]
+            if armor:
+                hit_damage = np.maximum(1, hit_damage - armor)
+            hp[hit] -= hit_damage * count[miss]
+
+        lost = hp[live] <= 0
+        turns[live[lost]] = turn
+        cleared = ~lost & (e_hp[live] <= 0).all(axis=1)
+        won[live[cleared]] = True
+        turns[live[cleared]] = turn
+        live = live[~(lost | cleared)]
+
+    # Anything still going hit the turn limit
+    timed_out = np.zeros(n, bool)
+    timed_out[live] = True
+
+    results = []
+    won, turns, hp, timed_out, max_hp = (
+        a.reshape(len(combos), trials) for a in (won, turns, hp, timed_out, max_hp)
+    )
+    for i, (class_name, lvl, weapon, group) in enumerate(combos):
+        wins = won[i]
+        win_count = int(wins.sum())
+        hp_left = hp[i][wins]
+        results.append(
+            {
+                "class": class_name,
+                "level": lvl,
+                "weapon": weapon,
+                "group": group_label(group),
+                "fights": trials,
+                "win_rate": win_count / trials,
+                "timeout_rate": float(timed_out[i].mean()),
+                "avg_turns_to_win": float(turns[i][wins].mean()) if win_count else "",
+                "avg_hp_left": float(hp_left.mean()) if win_count else "",
+                "avg_hp_left_pct": (
+                    float((hp_left / max_hp[i][0]).mean()) if win_count else ""
+                ),
+            }
+        )
+    return results
+
+
+# endregion
+
+
+# region Engine check
+
+
+def engine_fights(
+    combo: Combo, fights: int, skill: Tuple[float, float], armor: Optional[str], seed
+) -> dict:
+    """The same policy played through CombatEngine itself."""
+    from core.combat import CombatEngine, spawn_wave
+
+    class_name, level, weapon, group = combo
+    rng = random.Random(seed)
+    wins = turns = 0
+    for _ in range(fights):
+        state = GameState()
+        CLASS_MAP[class_name].apply_to_state(state)
+        state.player_class = CLASS_MAP[class_name]
+        state.level = level
+        state.equipped_weapon = None if weapon == UNARMED else weapon
+        state.equipped_armor = armor
+        enemies = [e for name in group for e in spawn_wave(name, 1)]
+
+        def defend(enemy) -> str:
+            perfect, block = qte_chances(skill, enemy.difficulty)
+            roll = rng.random()
+            if roll < perfect:
+                return "perfect"
+            return "block" if roll < perfect + block else "miss"
+
+        engine = CombatEngine(state, enemies, rng=rng)
+        while not engine.over:
+            engine.act({"type": "attack", "target": engine.alive_enemies()[0]})
+            if not engine.over:
+                engine.enemy_phase(defend)
+        if engine.outcome == "won":
+            wins += 1
+            turns += engine.turn
+    return {"win_rate": wins / fights, "avg_turns_to_win": turns / wins if wins else 0}
+
+
+# endregion
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--trials", type=int, default=500, help="fights per combo")
+    parser.add_argument("--levels", default="1-20", help="e.g. 1-20 or 5")
+    parser.add_argument("--class", dest="classes", action="append", default=None)
+    parser.add_argument("--weapon", dest="weapons", action="append", default=None)
+    parser.add_argument(
+        "--group",
+        dest="groups",
+        action="append",
+        default=None,
+        help='e.g. "Giant Rat x3" or "Goblin+Wolf" (default: each enemy x1 and x3)',
+    )
+    parser.add_argument("--skill", default="0.15,0.45,0.40", help="perfect,block,miss")
+    parser.add_argument("--armor", default=None, help="armor item worn in every fight")
+    parser.add_argument("--max-turns", type=int, default=200)
+    parser.add_argument(
+        "--batch", type=int, default=1_000_000, help="fights per numpy batch"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default="balance.csv")
+    parser.add_argument(
+        "--check", type=int, default=0, metavar="N", help="compare with CombatEngine"
+    )
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("simulate_balance needs numpy: python -m pip install numpy")
+
+    skill = parse_skill(args.skill)
+    armor = ITEMS[args.armor]["defense"] if args.armor else 0
+    classes = args.classes or list(CLASS_MAP)
+    weapons = args.weapons or [UNARMED] + list(items_of_type("weapon"))
+    groups = [parse_group(g) for g in args.groups] if args.groups else [
+        (name,) * count for name in ENEMIES for count in (1, 3)
+    ]
+    combos: List[Combo] = [
+        (c, lvl, w, g)
+        for c in classes
+        for lvl in parse_levels(args.levels)
+        for w in weapons
+        for g in groups
+    ]
+
+    rng = np.random.default_rng(args.seed)
+    per_batch = max(1, args.batch // args.trials)
+    rows = []
+    start = time.perf_counter()
+    for i in range(0, len(combos), per_batch):
+        rows += simulate_batch(
+            combos[i : i + per_batch], args.trials, skill, armor, args.max_turns, rng
+        )
+    elapsed = time.perf_counter() - start
+
+    with open(args.out, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    fights = len(combos) * args.trials
+    print(
+        f"{len(combos)} combinations, {fights} fights in {elapsed:.1f}s "
+        f"({fights / elapsed:,.0f} fights/s) -> {args.out}"
+    )
+
+    if args.check:
+        sample = random.Random(args.seed).sample(
+            range(len(combos)), min(5, len(combos))
+        )
+        print(f"\n{'combination':<44}{'win rate':>18}{'turns to win':>18}")
+        print(f"{'':<44}{'numpy / engine':>18}{'numpy / engine':>18}")
+        for i in sample:
+            row = rows[i]
+            check = engine_fights(combos[i], args.check, skill, args.armor, args.seed)
+            label = f"{row['class']} L{row['level']} {row['weapon']} v {row['group']}"
+            sim_turns = row["avg_turns_to_win"] or 0
+            print(
+                f"{label:<44}"
+                f"{row['win_rate']:>9.2f} / {check['win_rate']:<6.2f}"
+                f"{sim_turns:>9.2f} / {check['avg_turns_to_win']:<6.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()